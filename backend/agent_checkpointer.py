@@ -1,7 +1,10 @@
 import logging
+import threading
 
 from langgraph.checkpoint.mongodb import MongoDBSaver
-from db.mdb import MongoDBConnector
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from db.mdb import MongoDBConnector, MongoClientRegistry
+from slim_checkpointer import CheckpointBlobStore, SlimCheckpointSaver
 from config.config_loader import ConfigLoader
 
 # Configure logging
@@ -17,6 +20,10 @@ config = ConfigLoader()
 
 # --- Agent Checkpointer ---
 class AgentCheckpointer(MongoDBConnector):
+    # Savers shared by every run, keyed by (kind, uri, appname, database, collection)
+    _savers = {}
+    _lock = threading.Lock()
+
     def __init__(self, collection_name: str, uri: str=None, database_name: str=None, appname: str=None):
         """
         AgentCheckpointer class to save agent states to MongoDB.
@@ -28,15 +35,101 @@ class AgentCheckpointer(MongoDBConnector):
             appname (str): Application name. Default is None and takes the value from parent class.
         """
         super().__init__(uri, database_name, appname)
-        self.database_name = database_name
         self.checkpoint_collection_name = collection_name
         self.writes_collection_name = collection_name + "_writes"
-        logger.info("AgentCheckpointer initialized")
+        self.blobs_collection_name = collection_name + "_blobs"
+        logger.debug("AgentCheckpointer initialized")
+
+    def _apply_checkpoint_policy(self, saver):
+        """
+        Wrap the saver in a SlimCheckpointSaver when CHECKPOINT_EXCLUDE_FIELDS,
+        CHECKPOINT_EXTERNALIZE_FIELDS or CHECKPOINT_NODES is set.
+        """
+        if not any(config.get(key) for key in ("CHECKPOINT_EXCLUDE_FIELDS", "CHECKPOINT_EXTERNALIZE_FIELDS", "CHECKPOINT_NODES")):
+            return saver
+        blob_store = CheckpointBlobStore(
+            collection_name=self.blobs_collection_name,
+            serde=saver.serde,
+            uri=self.uri,
+            database_name=self.database_name,
+            appname=self.appname
+        )
+        return SlimCheckpointSaver(saver, blob_store)
+
+    def _get_shared_saver(self, kind: str, factory):
+        """Return the saver of the given kind for this database and collection, creating it once per process."""
+        key = (kind, self.uri, self.appname, self.database_name, self.checkpoint_collection_name)
+        saver = AgentCheckpointer._savers.get(key)
+        if saver is not None:
+            return saver
+        with AgentCheckpointer._lock:
+            saver = AgentCheckpointer._savers.get(key)
+            if saver is None:
+                logger.info(f"[MongoDB] Initializing shared {kind} checkpointer!")
+                logger.info(f"Database: {self.database_name}, Checkpoint Collection: {self.checkpoint_collection_name}, Checkpoint Writes Collection: {self.writes_collection_name}")
+                saver = factory()
+                AgentCheckpointer._savers[key] = saver
+            return saver
+
+    # --- Get Shared MongoDB Saver ---
+    def get_mongodb_saver(self):
+        """
+        Return the process-wide MongoDBSaver, created once on the shared MongoClient.
+
+        Unlike create_mongodb_saver, no client is opened or closed per run, so the saver can
+        be passed to every compiled graph as is. The checkpoint policy (CHECKPOINT_*) is applied.
+
+        Returns:
+            MongoDBSaver: Shared MongoDBSaver instance, or None if the saver cannot be created.
+        """
+        if not self.uri:
+            logger.warning("[MongoDB] MONGO_URI not set. State saving will be disabled.")
+            return None
+        try:
+            return self._get_shared_saver("sync", lambda: self._apply_checkpoint_policy(MongoDBSaver(
+                self.client,
+                db_name=self.database_name,
+                checkpoint_collection_name=self.checkpoint_collection_name,
+                writes_collection_name=self.writes_collection_name
+            )))
+        except Exception as e:
+            logger.error(f"[MongoDB] Error initializing MongoDB saver: {e}")
+            return None
+
+    # --- Get Shared Async MongoDB Saver ---
+    def get_async_mongodb_saver(self):
+        """
+        Return the process-wide AsyncMongoDBSaver, created once on the shared asyncio client,
+        for the async graph path. The checkpoint policy (CHECKPOINT_*) is applied.
+
+        Returns:
+            AsyncMongoDBSaver: Shared AsyncMongoDBSaver instance, or None if the saver cannot be created.
+        """
+        if not self.uri:
+            logger.warning("[MongoDB] MONGO_URI not set. State saving will be disabled.")
+            return None
+        try:
+            return self._get_shared_saver("async", lambda: self._apply_checkpoint_policy(AsyncMongoDBSaver(
+                MongoClientRegistry.get_async_client(self.uri, self.appname),
+                db_name=self.database_name,
+                checkpoint_collection_name=self.checkpoint_collection_name,
+                writes_collection_name=self.writes_collection_name
+            )))
+        except Exception as e:
+            logger.error(f"[MongoDB] Error initializing async MongoDB saver: {e}")
+            return None
+
+    @classmethod
+    def reset(cls):
+        """Forget the shared savers. Meant to be called when the shared clients are closed."""
+        with cls._lock:
+            cls._savers.clear()
 
     # --- Create MongoDB Saver ---
     def create_mongodb_saver(self):
         """
         Create a MongoDBSaver instance to save agent states to MongoDB."
+        It opens its own client; prefer get_mongodb_saver for the application.
 
         Uses:
             - MongoDBSaver.from_conn_string()
@@ -66,11 +159,40 @@ class AgentCheckpointer(MongoDBConnector):
         except Exception as e:
             logger.error(f"[MongoDB] Error initializing MongoDB saver: {e}")
             return None
+
+    # --- Create Async MongoDB Saver ---
+    def create_async_mongodb_saver(self):
+        """
+        Create an AsyncMongoDBSaver instance to save agent states to MongoDB from the async graph path.
+        It opens its own client; prefer get_async_mongodb_saver for the application.
+
+        Uses:
+            - AsyncMongoDBSaver.from_conn_string()
+
+        Returns:
+            AsyncMongoDBSaver: Async context manager yielding an AsyncMongoDBSaver instance.
+        """
+        mongo_uri = self.uri
+        if not mongo_uri:
+            logger.warning("[MongoDB] MONGO_URI not set. State saving will be disabled.")
+            return None
+        try:
+            logger.info(f"[MongoDB] Initializing AsyncMongoDBSaver!")
+            logger.info(f"URI: *****, Database: {self.database_name}, Checkpoint Collection: {self.checkpoint_collection_name}, Checkpoint Writes Collection: {self.writes_collection_name}")
+            return AsyncMongoDBSaver.from_conn_string(
+                conn_string=mongo_uri,
+                db_name=self.database_name,
+                checkpoint_collection_name=self.checkpoint_collection_name,
+                writes_collection_name=self.writes_collection_name
+            )
+        except Exception as e:
+            logger.error(f"[MongoDB] Error initializing async MongoDB saver: {e}")
+            return None
         
 
 
 if __name__ == "__main__":
 
     # Example usage
-    mongodb_saver = AgentCheckpointer().create_mongodb_saver()
+    mongodb_saver = AgentCheckpointer(collection_name=config.get("MDB_CHECKPOINTER_COLLECTION")).get_mongodb_saver()
     print(mongodb_saver)
\ No newline at end of file
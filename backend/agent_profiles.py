@@ -1,7 +1,9 @@
 import logging
+import threading
 from pymongo.errors import DuplicateKeyError
 
 from db.mdb import MongoDBConnector
+from mdb_cache import LRUCache
 from config.config_loader import ConfigLoader
 
 # Configure logging
@@ -11,7 +13,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load configuration
+config = ConfigLoader()
+
 class AgentProfiles(MongoDBConnector):
+    # Resolved profiles, keyed by (database, collection, agent_id), shared by every instance
+    _cache = None
+    _watcher = None
+    _stop_watching = threading.Event()
+    _lock = threading.Lock()
+
     def __init__(self, collection_name: str=None, uri: str = None, database_name: str = None, appname: str = None):
         """
         AgentProfiles class to retrieve agent profiles from MongoDB.
@@ -23,20 +34,45 @@ class AgentProfiles(MongoDBConnector):
             appname (str, optional): Application name. Default parent class value.
         """
         super().__init__(uri, database_name, appname)
-        # Load configuration
-        config = ConfigLoader()
         # Get the MongoDB agent profiles collection name from the config
         MDB_AGENT_PROFILES_COLLECTION = config.get("MDB_AGENT_PROFILES_COLLECTION")
         self.collection_name = collection_name or MDB_AGENT_PROFILES_COLLECTION
         self.collection = self.get_collection(self.collection_name)
-        # Ensure unique index on agent_id
+
+    @classmethod
+    def _get_cache(cls) -> LRUCache:
+        """Return the shared profile cache, created with the AGENT_PROFILES_CACHE_TTL_SECONDS TTL on first use."""
+        if cls._cache is None:
+            with cls._lock:
+                if cls._cache is None:
+                    cls._cache = LRUCache(maxsize=256, ttl_seconds=config.get_int("AGENT_PROFILES_CACHE_TTL_SECONDS", 300))
+        return cls._cache
+
+    @classmethod
+    def invalidate(cls):
+        """Drop every cached profile, e.g. after a profile was changed."""
+        cls._get_cache().clear()
+
+    def ensure_indexes(self):
+        """Ensure the unique index on agent_id. Meant to be called from a startup or admin routine."""
         self.collection.create_index("agent_id", unique=True)
-        logger.info(f"AgentProfiles initialized - Retrieving agent profiles from collection: {self.collection_name}")
+        logger.info(f"Unique index on agent_id ensured for collection: {self.collection_name}")
+
+    def _cache_key(self, agent_id: str) -> tuple:
+        return (self.database_name, self.collection_name, agent_id)
+
+    def get_cached_agent_profile(self, agent_id: str) -> dict:
+        """Return the cached profile for the given agent ID without contacting MongoDB, or None on a miss."""
+        profile = self._get_cache().get(self._cache_key(agent_id))
+        return dict(profile) if profile is not None else None
 
     def get_agent_profile(self, agent_id: str, update_default: bool = False) -> dict:
         """Retrieve the agent profile for the given agent ID.
         If the agent ID is not found, return a default profile.
 
+        Resolved profiles are cached for AGENT_PROFILES_CACHE_TTL_SECONDS, so MongoDB is queried
+        at most once per TTL per agent ID. The agent and default profiles are fetched in one query.
+
         Args:
             agent_id (str): Agent ID to retrieve the profile for.
             update_default (bool): Whether to update the default profile if it already exists. Default is False.
@@ -44,21 +80,40 @@ class AgentProfiles(MongoDBConnector):
         Returns:
             dict: Agent profile for the given agent ID.
         """
-        # Load configuration
-        config = ConfigLoader()
+        if not update_default:
+            profile = self.get_cached_agent_profile(agent_id)
+            if profile is not None:
+                return profile
+
+        profile = self._get_agent_profile(agent_id, update_default)
+        if update_default:
+            # The stored default profile may have changed, so drop profiles that fell back to it
+            self.invalidate()
+        if profile is not None:
+            self._get_cache().set(self._cache_key(agent_id), profile)
+            return dict(profile)
+        # Return the default profile if an error occurs (not cached, so the lookup is retried)
+        return config.get("DEFAULT_AGENT_PROFILE")
+
+    def _get_agent_profile(self, agent_id: str, update_default: bool) -> dict:
+        """Retrieve the agent profile from MongoDB, falling back to the default profile. Returns None on errors."""
         # Load Default Agent Profile from config
         default_profile = config.get("DEFAULT_AGENT_PROFILE")
 
         try:
-            # Retrieve the agent profile from MongoDB
-            profile = self.collection.find_one({"agent_id": agent_id})
+            # Retrieve the agent profile and the stored default profile from MongoDB in one query
+            profiles = {
+                p["agent_id"]: p
+                for p in self.collection.find({"agent_id": {"$in": [agent_id, "DEFAULT"]}})
+            }
+            profile = profiles.get(agent_id)
             if profile:
                 logger.info(f"Agent profile found for agent ID: {agent_id}")
                 # Return the agent profile if found
                 return profile
             else:
                 # Check if the default profile already exists
-                existing_default_profile = self.collection.find_one({"agent_id": "DEFAULT"})
+                existing_default_profile = profiles.get("DEFAULT")
                 if existing_default_profile:
                     if update_default:
                         # Update the existing default profile
@@ -83,8 +138,38 @@ class AgentProfiles(MongoDBConnector):
         except Exception as e:
             logger.error(f"Error retrieving agent profile: {e}")
             logger.warning("Returning default agent profile.")
-            # Return the default profile if an error occurs
-            return default_profile
+            return None
+
+    def start_watching(self):
+        """
+        Invalidate the profile cache whenever the profiles collection changes, using a change stream
+        watched from a background thread. Requires a replica set or sharded cluster.
+        """
+        with AgentProfiles._lock:
+            if AgentProfiles._watcher is not None and AgentProfiles._watcher.is_alive():
+                return
+            AgentProfiles._stop_watching.clear()
+            AgentProfiles._watcher = threading.Thread(target=self._watch_changes, name="agent-profiles-watcher", daemon=True)
+            AgentProfiles._watcher.start()
+
+    @classmethod
+    def stop_watching(cls):
+        """Stop the change stream started by start_watching."""
+        cls._stop_watching.set()
+
+    def _watch_changes(self):
+        """Change stream loop. Any change to the collection drops the cached profiles."""
+        try:
+            with self.collection.watch(max_await_time_ms=1000) as stream:
+                logger.info(f"Watching collection {self.collection_name} for agent profile changes.")
+                while not AgentProfiles._stop_watching.is_set():
+                    change = stream.try_next()
+                    if change is not None:
+                        logger.info(f"Agent profile {change.get('operationType')} detected. Invalidating cached profiles.")
+                        AgentProfiles.invalidate()
+        except Exception as e:
+            if not AgentProfiles._stop_watching.is_set():
+                logger.error(f"Error watching agent profile changes: {e}")
 
 
 # ==================
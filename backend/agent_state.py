@@ -1,7 +1,15 @@
+import operator
 from typing import Any, List, Literal, Optional
-from typing_extensions import TypedDict
+from typing_extensions import Annotated, TypedDict
 from datetime import datetime
 
+# --- Define State Reducers ---
+
+def last_value(current: Any, new: Any) -> Any:
+    """Reducer keeping the most recent write. Unlike the default channel, it accepts
+    several writes in the same step, e.g. from nodes running in parallel branches."""
+    return new
+
 # --- Define State Types ---
 
 class TimeseriesRecord(TypedDict):
@@ -19,13 +27,16 @@ class AgentState(TypedDict):
     chain_of_thought: str
     timeseries_data: List[TimeseriesRecord]
     embedding_vector: List[float]
+    # Query embedding quantized like the stored vectors (int8 or packed bits), when EMBEDDINGS_STORAGE_TYPE needs one
+    quantized_embedding_vector: Optional[List[int]]
     historical_recommendations_list: List[HistoricalRecommendation]
     recommendation_text: str
-    next_step: Literal[
+    next_step: Annotated[Literal[
         "__start__", "start", 
         "reasoning_node", "data_from_csv", "process_data", "embedding_node", 
         "vector_search", "process_vector_search", "persistence_node", "recommendation_node", 
         "__end__", "end"
-    ]
-    updates: List[str]
+    ], last_value]
+    # Nodes return only their new messages; they are concatenated across nodes and branches
+    updates: Annotated[List[str], operator.add]
     thread_id: Optional[str]
\ No newline at end of file
@@ -1,21 +1,27 @@
 from db.mdb import MongoDBConnector
 
+import asyncio
 import datetime
 import logging
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from config.config_loader import ConfigLoader
 from config.prompts import get_chain_of_thoughts_prompt, get_llm_recommendation_prompt
-from utils import convert_objectids
+from utils import convert_objectids, format_timeseries_records
 from bedrock.anthropic_chat_completions import BedrockAnthropicChatCompletions
 
-from loader import CSVLoader
-import csv
+from loader import load_typed_records
 
 from agent_state import AgentState
+from critical_conditions import CriticalConditionsEvaluator
+from langchain_core.runnables import RunnableConfig
+from langgraph.constants import CONFIG_KEY_STREAM_WRITER
 from embedder import Embedder
+from mdb_cache import LLMResponseCache
+from local_vector_search import LocalVectorSearchIndex
+from vector_quantization import encode_vector, get_cohere_embedding_type, rescore
 from agent_profiles import AgentProfiles
 from mdb_timeseries_coll_creator import TimeSeriesCollectionCreator
-from mdb_vector_search_idx_creator import VectorSearchIDXCreator
 
 from dotenv import load_dotenv
 
@@ -29,6 +35,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load configuration
+config = ConfigLoader()
+
+# MongoDB error code raised when writing to a collection that no longer exists
+NAMESPACE_NOT_FOUND = 26
+
+# Only every Nth prepared time-series record is logged (at DEBUG level)
+RECORD_LOG_SAMPLE_EVERY = 100
+
+# Chain of thought used when the LLM call fails
+DEFAULT_CHAIN_OF_THOUGHT = (
+    "1. Consume data.\n"
+    "2. Generate an embedding for the query.\n"
+    "3. Perform a vector search on past recommendations.\n"
+    "4. Persist data into MongoDB.\n"
+    "5. Generate a final summary and recommendation."
+)
+
+
+def emit_stream_event(config: RunnableConfig, event: str, **data):
+    """
+    Emits a custom LangGraph stream event tagged with the running node, e.g. LLM tokens.
+    This is a no-op when the graph is not streamed with stream_mode="custom".
+    The writer is read from the node config because context variables are not propagated
+    to async nodes on Python < 3.11.
+    """
+    config = config or {}
+    writer = (config.get("configurable") or {}).get(CONFIG_KEY_STREAM_WRITER)
+    if writer:
+        node = (config.get("metadata") or {}).get("langgraph_node")
+        writer({"event": event, "node": node, **data})
+
+
+def llm_cache_enabled(config: RunnableConfig) -> bool:
+    """
+    Whether the running node opted into the LLM response cache with "llm_cache": true in
+    AGENT_WORKFLOW_GRAPH. The flag is attached to the node metadata by the workflow graph.
+    """
+    return bool(((config or {}).get("metadata") or {}).get("llm_cache"))
+
+
 class AgentTools(MongoDBConnector):
     def __init__(self, collection_name: str=None, uri=None, database_name: str=None, appname: str=None):
         """
@@ -42,8 +89,7 @@ class AgentTools(MongoDBConnector):
         """
         super().__init__(uri, database_name, appname)
 
-        # Load configuration
-        config = ConfigLoader()
+        # Configuration (cached, reloaded when config.json changes)
         self.config = config
 
         # Get configuration values
@@ -51,11 +97,22 @@ class AgentTools(MongoDBConnector):
         self.mdb_timeseries_collection = self.config.get("MDB_TIMESERIES_COLLECTION")
         self.mdb_timeseries_timefield = self.config.get("MDB_TIMESERIES_TIMEFIELD")
         self.mdb_timeseries_granularity = self.config.get("MDB_TIMESERIES_GRANULARITY")
+        self.mdb_timeseries_insert_batch_size = self.config.get_int("MDB_TIMESERIES_INSERT_BATCH_SIZE", 1000)
+        self.mdb_timeseries_read_window_seconds = self.config.get_int("MDB_TIMESERIES_READ_WINDOW_SECONDS")
+        self.mdb_timeseries_read_window_anchor = self.config.get_str("MDB_TIMESERIES_READ_WINDOW_ANCHOR", "latest")
+        self.mdb_timeseries_read_max_points = self.config.get_int("MDB_TIMESERIES_READ_MAX_POINTS", 1000)
+        self.mdb_timeseries_read_fields = self.config.get_list("MDB_TIMESERIES_READ_FIELDS")
+        self.mdb_timeseries_read_batch_size = self.config.get_int("MDB_TIMESERIES_READ_BATCH_SIZE", 500)
         self.default_timeseries_data = self.config.get("DEFAULT_TIMESERIES_DATA")
         self.critical_conditions_config = self.config.get("CRITICAL_CONDITIONS")
         self.mdb_embeddings_collection = self.config.get("MDB_EMBEDDINGS_COLLECTION")
         self.mdb_embeddings_collection_vs_field = self.config.get("MDB_EMBEDDINGS_COLLECTION_VS_FIELD")
         self.mdb_vs_index = self.config.get("MDB_VS_INDEX")
+        self.vector_search_backend = self.config.get_str("VECTOR_SEARCH_BACKEND", "atlas")
+        self.embeddings_storage_type = self.config.get_str("EMBEDDINGS_STORAGE_TYPE", "float")
+        self.embeddings_rescore_field = self.config.get_str("EMBEDDINGS_RESCORE_FIELD")
+        self.vector_search_rescore_factor = self.config.get_int("VECTOR_SEARCH_RESCORE_FACTOR", 4)
+        self.recommendation_fail_on_error = self.config.get_bool("RECOMMENDATION_FAIL_ON_ERROR", True)
         self.default_similar_queries = self.config.get("DEFAULT_SIMILAR_QUERIES")
         self.mdb_agent_profiles_collection = self.config.get("MDB_AGENT_PROFILES_COLLECTION")
         self.agent_profile_chosen_id = self.config.get("AGENT_PROFILE_CHOSEN_ID")
@@ -76,145 +133,406 @@ class AgentTools(MongoDBConnector):
         """
         message = "[Tool] Retrieved data from CSV file."
         logger.info(message)
+        updates = [message]
+
+        # Load CSV data (parsed and converted once per file version)
+        data_records = load_typed_records(self.csv_data, time_field=self.mdb_timeseries_timefield)
+
+        return {"timeseries_data": data_records, "updates": updates}
 
-        # Load CSV data
-        csv_loader = CSVLoader(filepath=self.csv_data, collection_name=self.mdb_timeseries_collection)
-        csv_filepath = csv_loader.filepath
+    async def aget_data_from_csv(self, state: dict) -> dict:
+        """
+        Async variant of get_data_from_csv. The file is read on the default executor.
+        """
+        return await asyncio.to_thread(self.get_data_from_csv, state)
 
-        data_records = []
-        with open(csv_filepath, "r") as file:
-            reader = csv.DictReader(file)  # Automatically infers field names from the header row
-            for row in reader:
-                data_records.append(row)
+    def _timeseries_window_filter(self, latest: datetime.datetime = None) -> dict:
+        """
+        Builds the time window filter for time-series reads.
+        The window ends at the latest stored point ("latest" anchor) or at the current time ("now" anchor).
+        """
+        if not self.mdb_timeseries_read_window_seconds:
+            return {}
+        window = datetime.timedelta(seconds=self.mdb_timeseries_read_window_seconds)
+        if self.mdb_timeseries_read_window_anchor == "latest":
+            if latest is None:
+                return {}
+            return {self.mdb_timeseries_timefield: {"$gte": latest - window, "$lte": latest}}
+        return {self.mdb_timeseries_timefield: {"$gte": datetime.datetime.now(datetime.timezone.utc) - window}}
 
-        state.setdefault("updates", []).append(message)
-        return {"timeseries_data": data_records, "thread_id": state.get("thread_id", "")}
+    def _timeseries_projection(self) -> dict:
+        """Builds the projection for time-series reads: the time field plus MDB_TIMESERIES_READ_FIELDS, without _id."""
+        if not self.mdb_timeseries_read_fields:
+            return {"_id": 0}
+        projection = {field: 1 for field in self.mdb_timeseries_read_fields}
+        projection[self.mdb_timeseries_timefield] = 1
+        projection["_id"] = 0
+        return projection
+
+    def _uses_latest_anchor(self) -> bool:
+        """Whether the read window is anchored on the latest stored point, which needs one extra lookup."""
+        return bool(self.mdb_timeseries_read_window_seconds) and self.mdb_timeseries_read_window_anchor == "latest"
 
     def get_data_from_mdb(self, state: dict) -> dict:
         """
-        Reads data from a MongoDB collection and dynamically infers field names.
+        Reads the most recent time-series data from a MongoDB collection.
+
+        At most MDB_TIMESERIES_READ_MAX_POINTS documents within the MDB_TIMESERIES_READ_WINDOW_SECONDS window
+        are read, newest first on the time field, and returned in chronological order.
         """
         message = "[Tool] Retrieved data from MongoDB collection."
         logger.info(message)
+        updates = [message]
 
-        data_records = []
-        for record in self.collection.find():
-            # Convert MongoDB ObjectIds to strings
-            record = convert_objectids(record)
-            data_records.append(record)
+        time_field = self.mdb_timeseries_timefield
+        latest = None
+        if self._uses_latest_anchor():
+            latest_doc = self.collection.find_one({}, {time_field: 1, "_id": 0}, sort=[(time_field, -1)])
+            latest = latest_doc.get(time_field) if latest_doc else None
+
+        cursor = self.collection.find(
+            self._timeseries_window_filter(latest),
+            self._timeseries_projection(),
+            sort=[(time_field, -1)],
+            limit=self.mdb_timeseries_read_max_points,
+            batch_size=self.mdb_timeseries_read_batch_size
+        )
+        data_records = list(cursor)
+        data_records.reverse()
+
+        return {"timeseries_data": data_records, "updates": updates}
 
-        state.setdefault("updates", []).append(message)
-        return {"timeseries_data": data_records, "thread_id": state.get("thread_id", "")}
+    async def aget_data_from_mdb(self, state: dict) -> dict:
+        """
+        Async variant of get_data_from_mdb using the asyncio MongoDB client.
+        """
+        message = "[Tool] Retrieved data from MongoDB collection."
+        logger.info(message)
+        updates = [message]
+
+        collection = self.get_async_collection(self.collection_name)
+        time_field = self.mdb_timeseries_timefield
+        latest = None
+        if self._uses_latest_anchor():
+            latest_doc = await collection.find_one({}, {time_field: 1, "_id": 0}, sort=[(time_field, -1)])
+            latest = latest_doc.get(time_field) if latest_doc else None
+
+        cursor = collection.find(
+            self._timeseries_window_filter(latest),
+            self._timeseries_projection(),
+            sort=[(time_field, -1)],
+            limit=self.mdb_timeseries_read_max_points,
+            batch_size=self.mdb_timeseries_read_batch_size
+        )
+        data_records = [record async for record in cursor]
+        data_records.reverse()
+
+        return {"timeseries_data": data_records, "updates": updates}
     
     def evaluate_critical_conditions(self, timeseries_data) -> list:
         """
         Evaluate critical conditions dynamically based on configuration.
+        The CRITICAL_CONDITIONS config is compiled once and evaluated column-wise with NumPy.
 
         Args:
             timeseries_data (list): A list of time-series records.
 
         Returns:
-            list: A list of critical condition messages.
+            list: A list of unique critical condition messages.
         """
-        critical_conditions = []
-        for record in timeseries_data:
-            for key, condition in self.critical_conditions_config.items():
-                try:
-                    value = float(record.get(key, 0))
-                    threshold = condition["threshold"]
-                    condition_operator = condition["condition"]
-                    if (
-                        (condition_operator == ">" and value > threshold) or
-                        (condition_operator == "<" and value < threshold)
-                    ):
-                        critical_conditions.append(condition["message"].format(value=value))
-                except (ValueError, KeyError) as e:
-                    logger.error(f"[Warning] Error parsing values for {key}: {e}")
-        return critical_conditions
+        evaluator = CriticalConditionsEvaluator.from_config(self.critical_conditions_config)
+        return evaluator.evaluate(timeseries_data)
+
+    def _get_embedding_key(self, state: dict) -> str:
+        """Returns the document field holding the embeddings to search against."""
+        if state.get("embedding_key"):
+            return state["embedding_key"]
+        elif self.collection_name:
+            return self.mdb_embeddings_collection_vs_field
+        # Default embedding key
+        return "embedding"
+
+    def _vector_search_limits(self) -> tuple:
+        """
+        Returns (numCandidates, limit) for the search. When EMBEDDINGS_RESCORE_FIELD is set, the
+        quantized search is oversampled by VECTOR_SEARCH_RESCORE_FACTOR and rescored down to 2 results.
+        """
+        factor = self.vector_search_rescore_factor if self.embeddings_rescore_field else 1
+        return 5 * factor, 2 * factor
+
+    def _rescore_vector_search_results(self, results: list, embedding: list) -> list:
+        """Re-ranks oversampled results with the full-precision vectors, when rescoring is enabled."""
+        if not self.embeddings_rescore_field:
+            return results
+        return rescore(results, embedding, self.embeddings_rescore_field, limit=2)
+
+    def _query_vector_type(self) -> str:
+        """Returns the Cohere embedding type the query must be encoded with, or None for float vectors."""
+        if self.embeddings_storage_type in ("int8", "binary"):
+            return get_cohere_embedding_type(self.embeddings_storage_type)
+        return None
+
+    def _vector_search_pipeline(self, embedding_key: str, embedding) -> list:
+        """Builds the $vectorSearch aggregation pipeline."""
+        num_candidates, limit = self._vector_search_limits()
+        pipeline = [
+            {
+                "$vectorSearch": {
+                    "index": self.mdb_vs_index,
+                    "path": embedding_key,
+                    "queryVector": embedding,
+                    "numCandidates": num_candidates,
+                    "limit": limit
+                }
+            }
+        ]
+        if self.embeddings_rescore_field:
+            # The quantized vectors are not needed once the candidates are found
+            pipeline.append({"$project": {embedding_key: 0}})
+        return pipeline
+
+    def _local_vector_search(self, embedding_key: str, embedding: list) -> list:
+        """Runs the same top-k query as the $vectorSearch pipeline against the in-process index."""
+        num_candidates, limit = self._vector_search_limits()
+        index = LocalVectorSearchIndex.get_instance(self.collection_name, embedding_key)
+        return index.search(embedding, limit=limit, num_candidates=num_candidates)
+
+    def _format_vector_search_results(self, results: list, updates: list) -> list:
+        """Formats the vector search results into the list of similar queries."""
+        # Format the results
+        for result in results:
+            if "_id" in result:
+                # result["_id"] = str(result["_id"])
+                # It's not necessary to process the _id field, so removing it!
+                del result["_id"]
+            if self.mdb_embeddings_collection_vs_field in result:
+                # Removing the embedding field from the results
+                del result[self.mdb_embeddings_collection_vs_field]
+            if self.embeddings_rescore_field in result:
+                del result[self.embeddings_rescore_field]
+        if results:
+            logger.info(f"[MongoDB] Retrieved similar data from vector search.")
+            updates.append("[MongoDB] Retrieved similar data.")
+            logger.info(f"Similar queries - Vector Search results: {results}")
+            return results
+        logger.info(f"[MongoDB] No similar data found. Returning default message.")
+        updates.append("[MongoDB] No similar data found.")
+        return [{"query": "No similar queries found", "recommendation": "No immediate action based on past data."}]
+
+    def _default_similar_queries(self, updates: list) -> list:
+        """Returns the default similar queries when no collection is set for vector search."""
+        logger.info("[MongoDB] No collection set for vector search.")
+        logger.info("Setting default similar queries.")
+        updates.append("[MongoDB] No collection set for vector search. Using default similar queries.")
+        return self.default_similar_queries
 
     def vector_search(self, state: dict) -> dict:
         """Performs a vector search in a MongoDB collection."""
-        message = "[Tool] Performing MongoDB Atlas Vector Search"
+        if self.vector_search_backend == "local":
+            message = "[Tool] Performing local vector search"
+        else:
+            message = "[Tool] Performing MongoDB Atlas Vector Search"
         logger.info(message)
 
         # Set default update message
-        state.setdefault("updates", []).append(message)
+        updates = [message]
         # Get embedding key
-        if state.get("embedding_key"):
-            embedding_key = state["embedding_key"]
-        elif self.collection_name:
-            embedding_key = self.mdb_embeddings_collection_vs_field
-        else:
-            # Default embedding key
-            embedding_key = "embedding"
-
+        embedding_key = self._get_embedding_key(state)
         logger.info(f"Embedding key: {embedding_key}")
         # Get the embedding vector from the state
         embedding = state.get("embedding_vector", [])
 
         try:
-            logger.info("Checking Vector Search Index...")
-            # Instantiate the VectorSearchIDXCreator class
-            vector_index_creator = VectorSearchIDXCreator()
-            vector_index_creator_result = vector_index_creator.create_index()
-            logger.info(vector_index_creator_result)
+            # Perform vector search
+            if self.collection is not None and self.vector_search_backend == "local":
+                results = self._local_vector_search(embedding_key, embedding)
+                results = self._rescore_vector_search_results(results, embedding)
+                similar_queries = self._format_vector_search_results(results, updates)
+            elif self.collection is not None:
+                query_vector = embedding
+                query_vector_type = self._query_vector_type()
+                if query_vector_type:
+                    # Quantized vectors are searched with a query quantized the same way, produced by the embedding node
+                    quantized_embedding = state.get("quantized_embedding_vector")
+                    if quantized_embedding is None:
+                        quantized_embedding = Embedder.get_embedding(state["query_reported"], embedding_type=query_vector_type)
+                    query_vector = encode_vector(quantized_embedding, self.embeddings_storage_type)
+                pipeline = self._vector_search_pipeline(embedding_key, query_vector)
+                # Execute the aggregation pipeline
+                results = list(self.collection.aggregate(pipeline))
+                results = self._rescore_vector_search_results(results, embedding)
+                similar_queries = self._format_vector_search_results(results, updates)
+            else:
+                similar_queries = self._default_similar_queries(updates)
         except Exception as e:
-            logger.error(f"[MongoDB] Error checking vector search index: {e}")
-            state.setdefault("updates", []).append("[MongoDB] Error checking vector search.")
+            logger.error(f"Error during MongoDB Vector Search operation: {e}")
+            updates.append("[MongoDB] Error during Vector Search operation.")
+            similar_queries = [{"query": "MongoDB Vector Search operation error", "recommendation": "Please try again later."}]
+
+        return {"historical_recommendations_list": similar_queries, "updates": updates}
+
+    async def avector_search(self, state: dict) -> dict:
+        """Async variant of vector_search using the asyncio MongoDB client."""
+        if self.vector_search_backend == "local":
+            message = "[Tool] Performing local vector search"
+        else:
+            message = "[Tool] Performing MongoDB Atlas Vector Search"
+        logger.info(message)
+
+        # Set default update message
+        updates = [message]
+        # Get embedding key
+        embedding_key = self._get_embedding_key(state)
+        logger.info(f"Embedding key: {embedding_key}")
+        # Get the embedding vector from the state
+        embedding = state.get("embedding_vector", [])
 
         try:
             # Perform vector search
-            if self.collection is not None:
-                pipeline = [
-                    {
-                        "$vectorSearch": {
-                            "index": self.mdb_vs_index,
-                            "path": embedding_key,
-                            "queryVector": embedding,
-                            "numCandidates": 5,
-                            "limit": 2
-                        }
-                    }
-                ]
+            if self.collection is not None and self.vector_search_backend == "local":
+                # The index may refresh from MongoDB, so keep it off the event loop
+                results = await asyncio.to_thread(self._local_vector_search, embedding_key, embedding)
+                results = self._rescore_vector_search_results(results, embedding)
+                similar_queries = self._format_vector_search_results(results, updates)
+            elif self.collection is not None:
+                query_vector = embedding
+                query_vector_type = self._query_vector_type()
+                if query_vector_type:
+                    # Quantized vectors are searched with a query quantized the same way, produced by the embedding node
+                    quantized_embedding = state.get("quantized_embedding_vector")
+                    if quantized_embedding is None:
+                        quantized_embedding = await Embedder.aget_embedding(state["query_reported"], embedding_type=query_vector_type)
+                    query_vector = encode_vector(quantized_embedding, self.embeddings_storage_type)
+                pipeline = self._vector_search_pipeline(embedding_key, query_vector)
                 # Execute the aggregation pipeline
-                results = list(self.collection.aggregate(pipeline))
-                # Format the results
-                for result in results:
-                    if "_id" in result:
-                        # result["_id"] = str(result["_id"])
-                        # It's not necessary to process the _id field, so removing it!
-                        del result["_id"]
-                    if self.mdb_embeddings_collection_vs_field in result:
-                        # Removing the embedding field from the results
-                        del result[self.mdb_embeddings_collection_vs_field]
+                cursor = self.get_async_collection(self.collection_name).aggregate(pipeline)
+                results = await cursor.to_list(length=None)
+                results = self._rescore_vector_search_results(results, embedding)
+                similar_queries = self._format_vector_search_results(results, updates)
             else:
-                logger.info("[MongoDB] No collection set for vector search.")
-                logger.info("Setting default similar queries.")
-                similar_queries = self.default_similar_queries
-                state.setdefault("updates", []).append("[MongoDB] No collection set for vector search. Using default similar queries.")
-            if results:
-                logger.info(f"[MongoDB] Retrieved similar data from vector search.")
-                state.setdefault("updates", []).append("[MongoDB] Retrieved similar data.")
-                similar_queries = results
-                logger.info(f"Similar queries - Vector Search results: {similar_queries}")
-            else:
-                logger.info(f"[MongoDB] No similar data found. Returning default message.")
-                state.setdefault("updates", []).append("[MongoDB] No similar data found.")
-                similar_queries = [{"query": "No similar queries found", "recommendation": "No immediate action based on past data."}]
+                similar_queries = self._default_similar_queries(updates)
         except Exception as e:
             logger.error(f"Error during MongoDB Vector Search operation: {e}")
-            state.setdefault("updates", []).append("[MongoDB] Error during Vector Search operation.")
+            updates.append("[MongoDB] Error during Vector Search operation.")
             similar_queries = [{"query": "MongoDB Vector Search operation error", "recommendation": "Please try again later."}]
 
-        return {"historical_recommendations_list": similar_queries}
+        return {"historical_recommendations_list": similar_queries, "updates": updates}
 
-    def generate_chain_of_thought(self, state: AgentState) -> AgentState:
-        """Generates the chain of thought for the agent."""
-        logger.info("[LLM Chain-of-Thought Reasoning]")
+    def _llm_cache(self, config: RunnableConfig = None) -> LLMResponseCache:
+        """
+        Returns the LLM response cache when the running node opted into it, or None. The cache shares
+        this connector's MongoDB clients and does no I/O when built, so async nodes can create it
+        freely and reach MongoDB only through its aget/aset methods.
+        """
+        if not llm_cache_enabled(config):
+            return None
+        return LLMResponseCache(uri=self.uri, database_name=self.database_name, appname=self.appname)
+
+    def _predict(self, prompt: str, config: RunnableConfig = None) -> str:
+        """
+        Generates a chat completion. When the running node opted into the LLM cache, an identical
+        request (same model, parameters and prompt) is served from the LLMResponseCache.
+        """
+        chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
+        cache = self._llm_cache(config)
+        if cache is None:
+            return chat_completions.predict(prompt)
+
+        key = cache.response_key(self.chatcompletions_model_id, chat_completions.request_params, prompt)
+        response = cache.get(key)
+        if response is not None:
+            logger.info("LLM response served from cache.")
+            return response
+        response = chat_completions.predict(prompt)
+        if response:
+            cache.set(key, response, model_id=self.chatcompletions_model_id)
+        return response
+
+    async def _apredict(self, prompt: str, config: RunnableConfig = None) -> str:
+        """Async variant of _predict. The cache is read and written on the asyncio MongoDB client."""
+        chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
+        cache = self._llm_cache(config)
+        if cache is None:
+            return await chat_completions.apredict(prompt)
+
+        key = cache.response_key(self.chatcompletions_model_id, chat_completions.request_params, prompt)
+        response = await cache.aget(key)
+        if response is not None:
+            logger.info("LLM response served from cache.")
+            return response
+        response = await chat_completions.apredict(prompt)
+        if response:
+            await cache.aset(key, response, model_id=self.chatcompletions_model_id)
+        return response
+
+    def _predict_stream(self, prompt: str, config: RunnableConfig = None) -> str:
+        """
+        Generates a chat completion with token streaming. Each text delta is emitted as a "token"
+        stream event as it arrives. Cached responses (see _predict) are emitted as a single event.
+        """
+        chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
+        cache = self._llm_cache(config)
+        if cache is not None:
+            key = cache.response_key(self.chatcompletions_model_id, chat_completions.request_params, prompt)
+            response = cache.get(key)
+            if response is not None:
+                logger.info("LLM response served from cache.")
+                emit_stream_event(config, "token", text=response)
+                return response
+
+        chunks = []
+        for event in chat_completions.predict_stream(prompt):
+            if event["type"] == "delta":
+                chunks.append(event["text"])
+                emit_stream_event(config, "token", text=event["text"])
+            else:
+                logger.info(f"LLM usage: {event}")
+        response = "".join(chunks)
+        if cache is not None and response:
+            cache.set(key, response, model_id=self.chatcompletions_model_id)
+        return response
+
+    async def _apredict_stream(self, prompt: str, config: RunnableConfig = None) -> str:
+        """Async variant of _predict_stream. The cache is read and written on the asyncio MongoDB client."""
+        chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
+        cache = self._llm_cache(config)
+        if cache is not None:
+            key = cache.response_key(self.chatcompletions_model_id, chat_completions.request_params, prompt)
+            response = await cache.aget(key)
+            if response is not None:
+                logger.info("LLM response served from cache.")
+                emit_stream_event(config, "token", text=response)
+                return response
+
+        chunks = []
+        async for event in chat_completions.apredict_stream(prompt):
+            if event["type"] == "delta":
+                chunks.append(event["text"])
+                emit_stream_event(config, "token", text=event["text"])
+            else:
+                logger.info(f"LLM usage: {event}")
+        response = "".join(chunks)
+        if cache is not None and response:
+            await cache.aset(key, response, model_id=self.chatcompletions_model_id)
+        return response
+
+    def _get_agent_profile(self) -> dict:
+        """Retrieves the chosen agent profile."""
         # Instantiate the AgentProfiles class
         profiler = AgentProfiles(collection_name=self.mdb_agent_profiles_collection)
         # Get the agent profile
-        p = profiler.get_agent_profile(agent_id=self.agent_profile_chosen_id)
+        return profiler.get_agent_profile(agent_id=self.agent_profile_chosen_id)
+
+    async def _aget_agent_profile(self) -> dict:
+        """Async variant of _get_agent_profile. Cached profiles are returned without leaving the event loop."""
+        profiler = AgentProfiles(collection_name=self.mdb_agent_profiles_collection)
+        profile = profiler.get_cached_agent_profile(self.agent_profile_chosen_id)
+        if profile is None:
+            profile = await asyncio.to_thread(profiler.get_agent_profile, self.agent_profile_chosen_id)
+        return profile
+
+    def _chain_of_thought_prompt(self, state: AgentState, p: dict) -> str:
+        """Builds the chain-of-thought prompt for the given agent profile."""
         # Get the Query Reported from the state
         query_reported = state["query_reported"]
 
@@ -231,68 +549,122 @@ class AgentTools(MongoDBConnector):
         )
         logger.info("Chain-of-Thought Reasoning Prompt:")
         logger.info(CHAIN_OF_THOUGHTS_PROMPT)
+        return CHAIN_OF_THOUGHTS_PROMPT
+
+    def _chain_of_thought_result(self, chain_of_thought: str) -> AgentState:
+        """Builds the node output for the generated chain of thought."""
+        logger.info("Chain-of-Thought Reasoning:")
+        logger.info(chain_of_thought)
+        return {"chain_of_thought": chain_of_thought, "updates": ["Chain-of-thought generated."], "next_step": "get_data_from_csv_tool"}
+
+    def generate_chain_of_thought(self, state: AgentState, config: RunnableConfig = None) -> AgentState:
+        """Generates the chain of thought for the agent."""
+        logger.info("[LLM Chain-of-Thought Reasoning]")
+        p = self._get_agent_profile()
+        CHAIN_OF_THOUGHTS_PROMPT = self._chain_of_thought_prompt(state, p)
 
         try:
-            # Instantiate the chat completion model
-            chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
             # Generate a chain of thought based on the prompt
-            chain_of_thought = chat_completions.predict(CHAIN_OF_THOUGHTS_PROMPT)
+            chain_of_thought = self._predict(CHAIN_OF_THOUGHTS_PROMPT, config)
         except Exception as e:
             logger.error(f"Error generating chain of thought: {e}")
-            chain_of_thought = (
-                "1. Consume data.\n"
-                "2. Generate an embedding for the query.\n"
-                "3. Perform a vector search on past recommendations.\n"
-                "4. Persist data into MongoDB.\n"
-                "5. Generate a final summary and recommendation."
-            )
+            chain_of_thought = DEFAULT_CHAIN_OF_THOUGHT
+
+        return self._chain_of_thought_result(chain_of_thought)
+
+    async def agenerate_chain_of_thought(self, state: AgentState, config: RunnableConfig = None) -> AgentState:
+        """Async variant of generate_chain_of_thought."""
+        logger.info("[LLM Chain-of-Thought Reasoning]")
+        p = await self._aget_agent_profile()
+        CHAIN_OF_THOUGHTS_PROMPT = self._chain_of_thought_prompt(state, p)
+
+        try:
+            # Generate a chain of thought based on the prompt
+            chain_of_thought = await self._apredict(CHAIN_OF_THOUGHTS_PROMPT, config)
+        except Exception as e:
+            logger.error(f"Error generating chain of thought: {e}")
+            chain_of_thought = DEFAULT_CHAIN_OF_THOUGHT
+
+        return self._chain_of_thought_result(chain_of_thought)
 
-        logger.info("Chain-of-Thought Reasoning:")
-        logger.info(chain_of_thought)
-        state.setdefault("updates", []).append("Chain-of-thought generated.")
-        return {**state, "chain_of_thought": chain_of_thought, "next_step": "get_data_from_csv_tool"}
-    
     @staticmethod
     def process_data(state: AgentState) -> AgentState:
         """Processes the data."""
-        state.setdefault("updates", []).append("Data processed.")
-        state["next_step"] = "embedding_node"
-        return state
+        return {"updates": ["Data processed."], "next_step": "embedding_node"}
+
+    def _query_embedding_types(self) -> list:
+        """Cohere embedding types requested for the query: float, plus the quantized type searched with, if any."""
+        query_vector_type = self._query_vector_type()
+        return ["float", query_vector_type] if query_vector_type else ["float"]
+
+    def _split_query_embeddings(self, embeddings: dict) -> tuple:
+        """Returns the float and quantized (None when not needed) query embeddings."""
+        if not embeddings:
+            raise ValueError("No query embedding returned.")
+        query_vector_type = self._query_vector_type()
+        return embeddings["float"], embeddings[query_vector_type] if query_vector_type else None
+
+    @staticmethod
+    def _query_embedding_result(embedding: list, quantized_embedding: list, updates: list) -> dict:
+        """Builds the embedding node result. The quantized embedding is only added to the state when there is one."""
+        result = {"embedding_vector": embedding, "updates": updates, "next_step": "vector_search_tool"}
+        if quantized_embedding is not None:
+            result["quantized_embedding_vector"] = quantized_embedding
+        return result
 
     def get_query_embedding(self, state: AgentState) -> AgentState:
         """Generates the query embedding."""
         logger.info("[Action] Generating Query Embedding...")
-        state.setdefault("updates", []).append("Generating query embedding...")
+        updates = ["Generating query embedding..."]
 
         # Get the query text
         text = state["query_reported"]
 
-        try: 
+        try:
             # Instantiate the Embedder
             embedder = Embedder(collection_name=self.mdb_embeddings_collection)
-            embedding = embedder.get_embedding(text)
-            state.setdefault("updates", []).append("Query embedding generated!")
+            # The float embedding and, for quantized storage, the query-side quantized one come from one call
+            embeddings = embedder.get_embedding_types(text, self._query_embedding_types())
+            embedding, quantized_embedding = self._split_query_embeddings(embeddings)
+            updates.append("Query embedding generated!")
             logger.info("Query embedding generated!")
         except Exception as e:
             logger.error(f"Error generating query embedding: {e}")
-            state.setdefault("updates", []).append("Error generating query embedding; using dummy vector.")
-            embedding = [0.0] * 1024
-        return {**state, "embedding_vector": embedding, "next_step": "vector_search_tool"}
-    
+            updates.append("Error generating query embedding; using dummy vector.")
+            embedding, quantized_embedding = [0.0] * 1024, None
+        return self._query_embedding_result(embedding, quantized_embedding, updates)
+
+    async def aget_query_embedding(self, state: AgentState) -> AgentState:
+        """Async variant of get_query_embedding."""
+        logger.info("[Action] Generating Query Embedding...")
+        updates = ["Generating query embedding..."]
+
+        # Get the query text
+        text = state["query_reported"]
+
+        try:
+            embeddings = await Embedder.aget_embedding_types(text, self._query_embedding_types())
+            embedding, quantized_embedding = self._split_query_embeddings(embeddings)
+            updates.append("Query embedding generated!")
+            logger.info("Query embedding generated!")
+        except Exception as e:
+            logger.error(f"Error generating query embedding: {e}")
+            updates.append("Error generating query embedding; using dummy vector.")
+            embedding, quantized_embedding = [0.0] * 1024, None
+        return self._query_embedding_result(embedding, quantized_embedding, updates)
+
     @staticmethod
     def process_vector_search(state: AgentState) -> AgentState:
         """Processes the vector search results."""
-        state.setdefault("updates", []).append("Vector search results processed.")
-        state["next_step"] = "persistence_node"
-        return state
-    
-    def persist_data(self, state: AgentState) -> AgentState:
+        return {"updates": ["Vector search results processed."], "next_step": "persistence_node"}
+
+    def _check_timeseries_collection(self, updates: list) -> bool:
         """
-        Persists the data into MongoDB.
+        Creates the time series collection if it does not exist yet.
+        The collection is normally provisioned at startup, in which case this is an in-process lookup.
         """
-        state.setdefault("updates", []).append("Persisting data to MongoDB...")
-        logger.info("[Action] Persisting data to MongoDB...")
-
+        if TimeSeriesCollectionCreator.is_known(self.database_name, self.mdb_timeseries_collection):
+            return True
         try:
             # Instantiate the TimeSeriesCollectionCreator class
             logger.info("Checking Time Series Collection...")
@@ -302,122 +674,289 @@ class AgentTools(MongoDBConnector):
                     granularity=self.mdb_timeseries_granularity
             )
             logger.info(ts_coll_result)
-            # Get the MongoDB collection
-            timeseries_collection_name = self.mdb_timeseries_collection
-            timeseries_collection = self.get_collection(self.mdb_timeseries_collection)
+            if ts_coll_result.get("status") not in ("collection_created", "collection_exists"):
+                updates.append(f"Error creating time series collection: {ts_coll_result.get('message')}")
+                return False
+            return True
         except Exception as e:
             logger.error(f"Error creating time series collection: {e}")
-            state.setdefault("updates", []).append("Error creating time series collection.")
-
-        if timeseries_collection is not None:
-            combined_data = {
-                "query_reported": state["query_reported"],
-                "timeseries": state["timeseries_data"],
-                "similar_queries": state["historical_recommendations_list"],
-                "thread_id": state.get("thread_id", "")
-            }
+            updates.append("Error creating time series collection.")
+            return False
+
+    @staticmethod
+    def _prepare_timeseries_records(state: AgentState) -> list:
+        """Copies the time-series records in the state into documents ready to persist, tagged with the thread ID."""
+        thread_id = state.get("thread_id", "")
+        log_sample = logger.isEnabledFor(logging.DEBUG)
+        records = []
+        for i, record in enumerate(state["timeseries_data"]):
+            # Work on a copy so the records held in the graph state are not mutated. Records are
+            # already typed: converted once when the CSV file is loaded, or as read from MongoDB.
+            record = convert_objectids(record)
+            record["thread_id"] = thread_id
+            if log_sample and i % RECORD_LOG_SAMPLE_EVERY == 0:
+                logger.debug(f"Persisting record {i}: {record}")
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _insert_errors(e: BulkWriteError, offset: int) -> list:
+        """Extracts the per-record errors of an unordered insert_many, with indexes relative to all records."""
+        return [
+            {"index": offset + error["index"], "code": error.get("code"), "message": error.get("errmsg")}
+            for error in e.details.get("writeErrors", [])
+        ]
+
+    def _recreate_timeseries_collection(self, updates: list, e: OperationFailure):
+        """Forgets and recreates the time series collection after a NamespaceNotFound error, re-raising any other error."""
+        if e.code != NAMESPACE_NOT_FOUND:
+            raise e
+        # The collection was dropped since it was provisioned: create it again and retry
+        logger.warning(f"Collection {self.mdb_timeseries_collection} not found. Creating it again.")
+        TimeSeriesCollectionCreator.forget(self.database_name, self.mdb_timeseries_collection)
+        if not self._check_timeseries_collection(updates):
+            raise e
+
+    def insert_timeseries_records(self, records: list, updates: list) -> tuple:
+        """
+        Inserts the records with unordered insert_many calls of MDB_TIMESERIES_INSERT_BATCH_SIZE records.
+        Records that fail are collected instead of aborting the remaining ones.
+
+        Returns:
+            tuple: Number of inserted records and the list of per-record errors.
+        """
+        collection = self.get_collection(self.mdb_timeseries_collection)
+        batch_size = self.mdb_timeseries_insert_batch_size
+        inserted, errors = 0, []
+        for offset in range(0, len(records), batch_size):
+            batch = records[offset:offset + batch_size]
+            for retry in (False, True):
+                try:
+                    inserted += len(collection.insert_many(batch, ordered=False).inserted_ids)
+                except BulkWriteError as e:
+                    inserted += e.details.get("nInserted", 0)
+                    errors.extend(self._insert_errors(e, offset))
+                except OperationFailure as e:
+                    if retry:
+                        raise
+                    self._recreate_timeseries_collection(updates, e)
+                    continue
+                break
+        return inserted, errors
+
+    async def ainsert_timeseries_records(self, records: list, updates: list) -> tuple:
+        """Async variant of insert_timeseries_records using the asyncio MongoDB client."""
+        collection = self.get_async_collection(self.mdb_timeseries_collection)
+        batch_size = self.mdb_timeseries_insert_batch_size
+        inserted, errors = 0, []
+        for offset in range(0, len(records), batch_size):
+            batch = records[offset:offset + batch_size]
+            for retry in (False, True):
+                try:
+                    inserted += len((await collection.insert_many(batch, ordered=False)).inserted_ids)
+                except BulkWriteError as e:
+                    inserted += e.details.get("nInserted", 0)
+                    errors.extend(self._insert_errors(e, offset))
+                except OperationFailure as e:
+                    if retry:
+                        raise
+                    await asyncio.to_thread(self._recreate_timeseries_collection, updates, e)
+                    continue
+                break
+        return inserted, errors
+
+    @staticmethod
+    def _persist_result_updates(timeseries_collection_name: str, inserted: int, errors: list, updates: list):
+        """Logs the outcome of a bulk insert and appends it to the updates."""
+        logger.info(f"[MongoDB] {inserted} records persisted in {timeseries_collection_name} collection.")
+        if errors:
+            logger.error(f"[MongoDB] {len(errors)} records could not be persisted in {timeseries_collection_name} collection. First error: {errors[0]}")
+            updates.append(f"{len(errors)} records could not be persisted to MongoDB.")
+
+    @staticmethod
+    def _log_entry(state: AgentState) -> dict:
+        """Builds the run log document."""
+        log_entry = {
+            "thread_id": state.get("thread_id", ""),
+            "query_reported": state["query_reported"],
+            "similar_queries": state["historical_recommendations_list"],
+            "created_at": datetime.datetime.now(datetime.timezone.utc)
+        }
+        return convert_objectids(log_entry)
+
+    def persist_data(self, state: AgentState) -> AgentState:
+        """
+        Persists the data into MongoDB.
+        """
+        updates = ["Persisting data to MongoDB..."]
+        logger.info("[Action] Persisting data to MongoDB...")
+
+        if self._check_timeseries_collection(updates):
+            # Get the MongoDB collection name
+            timeseries_collection_name = self.mdb_timeseries_collection
             try:
-                # Persist each record in the time-series data
-                for record in combined_data["timeseries"]:
-                    try:
-                        # Parse timestamp and convert values dynamically
-                        record["timestamp"] = datetime.datetime.strptime(record["timestamp"], "%Y-%m-%dT%H:%M:%SZ")
-                        for key in record:
-                            if key != "timestamp" and key != "thread_id":
-                                record[key] = float(record[key])
-                    except Exception as e:
-                        logger.error(f"Error processing record: {e}")
-                    record["thread_id"] = state.get("thread_id", "")
-                    record = convert_objectids(record)
-                    # TODO: REMOVE THIS LOGGER STATEMENT
-                    logger.info(f"Persisting record: {record}")
-                    timeseries_collection.insert_one(record)
-
-                logger.info(f"[MongoDB] Data persisted in {timeseries_collection_name} collection.")
+                # Persist the time-series data in bulk
+                records = self._prepare_timeseries_records(state)
+                inserted, errors = self.insert_timeseries_records(records, updates)
+                self._persist_result_updates(timeseries_collection_name, inserted, errors, updates)
 
                 # Persist logs
                 coll_logs = self.db["logs"]
-                log_entry = {
-                    "thread_id": state.get("thread_id", ""),
-                    "query_reported": combined_data["query_reported"],
-                    "similar_queries": combined_data["similar_queries"],
-                    "created_at": datetime.datetime.now(datetime.timezone.utc)
-                }
-                log_entry = convert_objectids(log_entry)
-                coll_logs.insert_one(log_entry)
-                state.setdefault("updates", []).append("Data persisted to MongoDB.")
+                coll_logs.insert_one(self._log_entry(state))
+                updates.append("Data persisted to MongoDB.")
             except Exception as e:
                 logger.error(f"Error persisting data to MongoDB: {e}")
-                state.setdefault("updates", []).append("Error persisting data to MongoDB.")
+                updates.append("Error persisting data to MongoDB.")
         else:
-            state.setdefault("updates", []).append("No MongoDB collection set for persistence.")
+            updates.append("No MongoDB collection set for persistence.")
             logger.info("No MongoDB collection set for persistence.")
 
-        return {**state, "next_step": "recommendation_node"}
-        
-    def get_llm_recommendation(self, state: AgentState) -> AgentState:
-        """Generates the LLM recommendation."""
-        state.setdefault("updates", []).append("Generating final recommendation...")
-        logger.info("[Final Answer] Generating final recommendation...")
-        
-        # Use default timeseries data if none is provided
+        return {"updates": updates, "next_step": "recommendation_node"}
+
+    async def apersist_data(self, state: AgentState) -> AgentState:
+        """
+        Async variant of persist_data using the asyncio MongoDB client.
+        """
+        updates = ["Persisting data to MongoDB..."]
+        logger.info("[Action] Persisting data to MongoDB...")
+
+        if TimeSeriesCollectionCreator.is_known(self.database_name, self.mdb_timeseries_collection) \
+                or await asyncio.to_thread(self._check_timeseries_collection, updates):
+            # Get the MongoDB collection name
+            timeseries_collection_name = self.mdb_timeseries_collection
+            try:
+                # Persist the time-series data in bulk
+                records = self._prepare_timeseries_records(state)
+                inserted, errors = await self.ainsert_timeseries_records(records, updates)
+                self._persist_result_updates(timeseries_collection_name, inserted, errors, updates)
+
+                # Persist logs
+                coll_logs = self.adb["logs"]
+                await coll_logs.insert_one(self._log_entry(state))
+                updates.append("Data persisted to MongoDB.")
+            except Exception as e:
+                logger.error(f"Error persisting data to MongoDB: {e}")
+                updates.append("Error persisting data to MongoDB.")
+        else:
+            updates.append("No MongoDB collection set for persistence.")
+            logger.info("No MongoDB collection set for persistence.")
+
+        return {"updates": updates, "next_step": "recommendation_node"}
+
+    def _get_timeseries_data(self, state: AgentState, updates: list) -> list:
+        """Returns the time-series data in the state, or the default data if none is provided."""
         timeseries_data = state.get("timeseries_data", [])
         if not timeseries_data:
-            state.setdefault("updates", []).append("No timeseries data; using default values.")
+            updates.append("No timeseries data; using default values.")
             logger.warning("[Warning] No timeseries data available. Using default values.")
             timeseries_data = self.default_timeseries_data
+        return timeseries_data
 
+    def _llm_recommendation_prompt(self, state: AgentState, timeseries_data: list, p: dict) -> str:
+        """Builds the LLM recommendation prompt, including any critical alerts."""
         # Evaluate critical conditions
         critical_conditions = self.evaluate_critical_conditions(timeseries_data)
         critical_info = "CRITICAL ALERT: " + ", ".join(critical_conditions) + "\n\n" if critical_conditions else ""
 
-        # Instantiate the AgentProfiles class
-        profiler = AgentProfiles(collection_name=self.mdb_agent_profiles_collection)
-        # Get the agent profile
-        p = profiler.get_agent_profile(agent_id=self.agent_profile_chosen_id)
-
         # Generate the LLM recommendation prompt
         LLM_RECOMMENDATION_PROMPT = get_llm_recommendation_prompt(
             agent_role=p["role"],
             agent_kind_of_data=p["kind_of_data"],
             critical_info=critical_info,
-            timeseries_data=timeseries_data,
+            timeseries_data=format_timeseries_records(timeseries_data, self.mdb_timeseries_timefield),
             historical_recommendations_list=state.get("historical_recommendations_list", [])
         )
         logger.info("LLM Recommendation Prompt:")
         logger.info(LLM_RECOMMENDATION_PROMPT)
+        return LLM_RECOMMENDATION_PROMPT
+
+    @staticmethod
+    def _recommendation_record(state: AgentState, timeseries_data: list, llm_recommendation: str) -> dict:
+        """Builds the historical recommendation document."""
+        recommendation_record = {
+            "thread_id": state.get("thread_id", ""),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc),
+            "query_reported": state["query_reported"],
+            "timeseries_data": timeseries_data,
+            "historical_recommendations": state.get("historical_recommendations_list", []),
+            "recommendation": llm_recommendation
+        }
+        return convert_objectids(recommendation_record)
+
+    def get_llm_recommendation(self, state: AgentState, config: RunnableConfig = None) -> AgentState:
+        """
+        Generates the LLM recommendation. The text is streamed from the model and emitted as "token" stream events.
+        If the LLM call fails, the error is raised so the run can be resumed, or a fallback text is returned when RECOMMENDATION_FAIL_ON_ERROR is false.
+        """
+        updates = ["Generating final recommendation..."]
+        logger.info("[Final Answer] Generating final recommendation...")
+
+        # Use default timeseries data if none is provided
+        timeseries_data = self._get_timeseries_data(state, updates)
+        p = self._get_agent_profile()
+        LLM_RECOMMENDATION_PROMPT = self._llm_recommendation_prompt(state, timeseries_data, p)
 
         try:
-            # Instantiate the chat completion model
-            chat_completions = BedrockAnthropicChatCompletions(model_id=self.chatcompletions_model_id)
-            # Generate a chain of thought based on the prompt
-            llm_recommendation = chat_completions.predict(LLM_RECOMMENDATION_PROMPT)
+            # Generate a recommendation based on the prompt, streaming the tokens as they arrive
+            llm_recommendation = self._predict_stream(LLM_RECOMMENDATION_PROMPT, config)
         except Exception as e:
             logger.error(f"Error generating LLM recommendation: {e}")
+            if self.recommendation_fail_on_error:
+                # Fail the run, so it can be resumed from the last checkpoint with /resume-agent
+                raise
             llm_recommendation = "Unable to generate recommendation at this time."
+            emit_stream_event(config, "token", text=llm_recommendation)
 
         logger.info("LLM Recommendation:")
         logger.info(llm_recommendation)
-        state.setdefault("updates", []).append("Final recommendation generated.")
+        updates.append("Final recommendation generated.")
 
         try:
-            recommendation_record = {
-                "thread_id": state.get("thread_id", ""),
-                "timestamp": datetime.datetime.now(datetime.timezone.utc),
-                "query_reported": state["query_reported"],
-                "timeseries_data": timeseries_data,
-                "historical_recommendations": state.get("historical_recommendations_list", []),
-                "recommendation": llm_recommendation
-            }
-            recommendation_record = convert_objectids(recommendation_record)
-            self.collection.insert_one(recommendation_record)
-            state.setdefault("updates", []).append("Recommendation stored in MongoDB.")
+            self.collection.insert_one(self._recommendation_record(state, timeseries_data, llm_recommendation))
+            updates.append("Recommendation stored in MongoDB.")
             logger.info("[MongoDB] Recommendation stored in historical records")
         except Exception as e:
             logger.error(f"Error storing recommendation in MongoDB: {e}")
-            state.setdefault("updates", []).append("Error storing recommendation in MongoDB.")
+            updates.append("Error storing recommendation in MongoDB.")
+
+        return {"recommendation_text": llm_recommendation, "updates": updates, "next_step": "end"}
 
-        return {**state, "recommendation_text": llm_recommendation, "next_step": "end"}
+    async def aget_llm_recommendation(self, state: AgentState, config: RunnableConfig = None) -> AgentState:
+        """Async variant of get_llm_recommendation."""
+        updates = ["Generating final recommendation..."]
+        logger.info("[Final Answer] Generating final recommendation...")
+
+        # Use default timeseries data if none is provided
+        timeseries_data = self._get_timeseries_data(state, updates)
+        p = await self._aget_agent_profile()
+        LLM_RECOMMENDATION_PROMPT = self._llm_recommendation_prompt(state, timeseries_data, p)
+
+        try:
+            # Generate a recommendation based on the prompt, streaming the tokens as they arrive
+            llm_recommendation = await self._apredict_stream(LLM_RECOMMENDATION_PROMPT, config)
+        except Exception as e:
+            logger.error(f"Error generating LLM recommendation: {e}")
+            if self.recommendation_fail_on_error:
+                # Fail the run, so it can be resumed from the last checkpoint with /resume-agent
+                raise
+            llm_recommendation = "Unable to generate recommendation at this time."
+            emit_stream_event(config, "token", text=llm_recommendation)
+
+        logger.info("LLM Recommendation:")
+        logger.info(llm_recommendation)
+        updates.append("Final recommendation generated.")
+
+        try:
+            await self.get_async_collection(self.collection_name).insert_one(
+                self._recommendation_record(state, timeseries_data, llm_recommendation)
+            )
+            updates.append("Recommendation stored in MongoDB.")
+            logger.info("[MongoDB] Recommendation stored in historical records")
+        except Exception as e:
+            logger.error(f"Error storing recommendation in MongoDB: {e}")
+            updates.append("Error storing recommendation in MongoDB.")
+
+        return {"recommendation_text": llm_recommendation, "updates": updates, "next_step": "end"}
 
 
 
@@ -429,8 +968,6 @@ def get_data_from_csv_tool(state: dict) -> dict:
 
 def get_data_from_mdb_tool(state: dict) -> dict:
     "Reads data from a MongoDB collection."
-    # Load configuration
-    config = ConfigLoader()
     # Get the MongoDB collection name
     mdb_timeseries_collection = config.get("MDB_TIMESERIES_COLLECTION")
     # Instantiate the AgentTools class
@@ -439,18 +976,16 @@ def get_data_from_mdb_tool(state: dict) -> dict:
 
 def vector_search_tool(state: dict) -> dict:
     """Performs a vector search in a MongoDB collection."""
-    # Load configuration
-    config = ConfigLoader()
     # Get the MongoDB collection name
     mdb_embeddings_collection = config.get("MDB_EMBEDDINGS_COLLECTION")
     # Instantiate the AgentTools class
     agent_tools = AgentTools(collection_name=mdb_embeddings_collection)
     return agent_tools.vector_search(state=state)
 
-def generate_chain_of_thought_tool(state: AgentState) -> AgentState:
+def generate_chain_of_thought_tool(state: AgentState, config: RunnableConfig = None) -> AgentState:
     """Generates the chain of thought for the agent."""
     agent_tools = AgentTools()
-    return agent_tools.generate_chain_of_thought(state=state)
+    return agent_tools.generate_chain_of_thought(state=state, config=config)
 
 def process_data_tool(state: AgentState) -> AgentState:
     """Processes the data."""
@@ -473,12 +1008,66 @@ def persist_data_tool(state: AgentState) -> AgentState:
     agent_tools = AgentTools()
     return agent_tools.persist_data(state=state)
 
-def get_llm_recommendation_tool(state: AgentState) -> AgentState:
+def get_llm_recommendation_tool(state: AgentState, config: RunnableConfig = None) -> AgentState:
     """Generates the LLM recommendation."""
-    # Load configuration
-    config = ConfigLoader()
+    # Get the MongoDB collection name ("config" is the node's RunnableConfig here, not the ConfigLoader)
+    mdb_historical_recommendations_collection = ConfigLoader().get("MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION")
+    # Instantiate the AgentTools class
+    agent_tools = AgentTools(collection_name=mdb_historical_recommendations_collection)
+    return agent_tools.get_llm_recommendation(state=state, config=config)
+
+
+# Define async tools
+# The workflow graph pairs each tool with its "a"-prefixed async variant, used by workflow.ainvoke()
+async def aget_data_from_csv_tool(state: dict) -> dict:
+    "Reads data from a CSV file."
+    agent_tools = AgentTools()
+    return await agent_tools.aget_data_from_csv(state=state)
+
+async def aget_data_from_mdb_tool(state: dict) -> dict:
+    "Reads data from a MongoDB collection."
     # Get the MongoDB collection name
-    mdb_historical_recommendations_collection = config.get("MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION")
+    mdb_timeseries_collection = config.get("MDB_TIMESERIES_COLLECTION")
+    # Instantiate the AgentTools class
+    agent_tools = AgentTools(collection_name=mdb_timeseries_collection)
+    return await agent_tools.aget_data_from_mdb(state)
+
+async def avector_search_tool(state: dict) -> dict:
+    """Performs a vector search in a MongoDB collection."""
+    # Get the MongoDB collection name
+    mdb_embeddings_collection = config.get("MDB_EMBEDDINGS_COLLECTION")
+    # Instantiate the AgentTools class
+    agent_tools = AgentTools(collection_name=mdb_embeddings_collection)
+    return await agent_tools.avector_search(state=state)
+
+async def agenerate_chain_of_thought_tool(state: AgentState, config: RunnableConfig = None) -> AgentState:
+    """Generates the chain of thought for the agent."""
+    agent_tools = AgentTools()
+    return await agent_tools.agenerate_chain_of_thought(state=state, config=config)
+
+async def aprocess_data_tool(state: AgentState) -> AgentState:
+    """Processes the data."""
+    return AgentTools.process_data(state=state)
+
+async def aget_query_embedding_tool(state: AgentState) -> AgentState:
+    """Generates the query embedding."""
+    agent_tools = AgentTools()
+    return await agent_tools.aget_query_embedding(state=state)
+
+async def aprocess_vector_search_tool(state: AgentState) -> AgentState:
+    """Processes the vector search results."""
+    return AgentTools.process_vector_search(state=state)
+
+async def apersist_data_tool(state: AgentState) -> AgentState:
+    """Persists the data into MongoDB."""
+    # Instantiate the AgentTools class
+    agent_tools = AgentTools()
+    return await agent_tools.apersist_data(state=state)
+
+async def aget_llm_recommendation_tool(state: AgentState, config: RunnableConfig = None) -> AgentState:
+    """Generates the LLM recommendation."""
+    # Get the MongoDB collection name ("config" is the node's RunnableConfig here, not the ConfigLoader)
+    mdb_historical_recommendations_collection = ConfigLoader().get("MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION")
     # Instantiate the AgentTools class
     agent_tools = AgentTools(collection_name=mdb_historical_recommendations_collection)
-    return agent_tools.get_llm_recommendation(state=state)
+    return await agent_tools.aget_llm_recommendation(state=state, config=config)
@@ -1,9 +1,29 @@
+import json
+import hashlib
 import importlib
-from langgraph.graph import StateGraph, END
+import logging
+import threading
+import weakref
+from functools import lru_cache
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
 from agent_state import AgentState
 from config.config_loader import ConfigLoader
 
+logger = logging.getLogger(__name__)
 
+# Load configuration
+config = ConfigLoader()
+
+# Compiled graphs are cached for the current AGENT_WORKFLOW_GRAPH hash: the base graph
+# (no checkpointer) plus one copy per checkpointer it has been bound to.
+_compiled_graph = {"hash": None, "graph": None}
+_bound_graphs = weakref.WeakKeyDictionary()
+_graph_config_hash = {"snapshot": None, "hash": None}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
 def resolve_tool(tool_path):
     """
     Dynamically import a tool function based on its import path.
@@ -19,6 +39,57 @@ def resolve_tool(tool_path):
     return getattr(module, function_name)
 
 
+@lru_cache(maxsize=None)
+def resolve_async_tool(tool_path):
+    """
+    Resolve the async variant of a tool, following the "a" prefix convention
+    (e.g., "agent_tools.get_data_from_csv_tool" -> "agent_tools.aget_data_from_csv_tool").
+
+    Args:
+        tool_path (str): The full import path of the sync tool.
+
+    Returns:
+        function: The imported async tool function, or None if the module does not define one.
+    """
+    module_name, function_name = tool_path.rsplit(".", 1)
+    module = importlib.import_module(module_name)
+    return getattr(module, "a" + function_name, None)
+
+
+def build_node(tool_path):
+    """
+    Build a graph node from a tool import path. When the tool has an async variant, the node
+    runs the sync function under workflow.invoke() and the async one under workflow.ainvoke().
+
+    Args:
+        tool_path (str): The full import path of the tool.
+
+    Returns:
+        Callable or RunnableLambda: The node action.
+    """
+    tool_function = resolve_tool(tool_path)
+    async_tool_function = resolve_async_tool(tool_path)
+    if async_tool_function is None:
+        return tool_function
+    return RunnableLambda(tool_function, afunc=async_tool_function, name=tool_function.__name__)
+
+
+def get_graph_config_hash() -> str:
+    """
+    Hash of the current AGENT_WORKFLOW_GRAPH config, recomputed only when the config is reloaded.
+
+    Returns:
+        str: SHA-256 hex digest of the graph config.
+    """
+    snapshot = config.snapshot
+    if _graph_config_hash["snapshot"] is not snapshot:
+        graph_config = config.get("AGENT_WORKFLOW_GRAPH")
+        digest = hashlib.sha256(json.dumps(graph_config, sort_keys=True).encode("utf-8")).hexdigest()
+        _graph_config_hash["hash"] = digest
+        _graph_config_hash["snapshot"] = snapshot
+    return _graph_config_hash["hash"]
+
+
 def create_workflow_graph(checkpointer=None):
     """
     Create the LangGraph StateGraph for the agent workflow based on the JSON config file.
@@ -30,27 +101,30 @@ def create_workflow_graph(checkpointer=None):
         StateGraph: LangGraph StateGraph for the agent workflow
     """
     # Load configuration
-    config_loader = ConfigLoader()
-    graph_config = config_loader.get("AGENT_WORKFLOW_GRAPH")
+    graph_config = config.get("AGENT_WORKFLOW_GRAPH")
 
     graph = StateGraph(AgentState)
 
     # Add nodes
+    # Optional node flags (e.g. "llm_cache": true) are attached as node metadata, which the tools
+    # read from config["metadata"] at runtime
     for node in graph_config["nodes"]:
-        tool_function = resolve_tool(node["tool"])
-        graph.add_node(node["id"], tool_function)
+        metadata = {"llm_cache": True} if node.get("llm_cache") else None
+        graph.add_node(node["id"], build_node(node["tool"]), metadata=metadata)
 
     # Add edges
+    # "to" may be a list of nodes to fan out to parallel branches, and "from" may be a list
+    # of nodes to join: the target then runs once all of them have completed.
     for edge in graph_config["edges"]:
         from_node = edge["from"]
-        to_node = edge["to"]
-        if to_node == "END":
-            graph.add_edge(from_node, END)
-        else:
-            graph.add_edge(from_node, to_node)
+        to_nodes = edge["to"] if isinstance(edge["to"], list) else [edge["to"]]
+        for to_node in to_nodes:
+            graph.add_edge(from_node, END if to_node == "END" else to_node)
 
-    # Set entry point
-    graph.set_entry_point(graph_config["entry_point"])
+    # Set entry point(s). A list starts several branches in parallel.
+    entry_points = graph_config["entry_point"]
+    for entry_point in entry_points if isinstance(entry_points, list) else [entry_points]:
+        graph.add_edge(START, entry_point)
 
     # Compile the graph
     if checkpointer:
@@ -59,6 +133,40 @@ def create_workflow_graph(checkpointer=None):
         return graph.compile()
 
 
+def get_workflow_graph(checkpointer=None):
+    """
+    Return the compiled workflow graph, compiling it only when AGENT_WORKFLOW_GRAPH changes.
+
+    The graph is compiled once per graph config hash. Binding a checkpointer reuses the
+    compiled graph and is cached per checkpointer instance.
+
+    Args:
+        checkpointer (AgentCheckpointer, optional): AgentCheckpointer instance. Default is None.
+
+    Returns:
+        CompiledStateGraph: Compiled LangGraph workflow.
+    """
+    graph_hash = get_graph_config_hash()
+
+    with _lock:
+        if _compiled_graph["hash"] != graph_hash:
+            if _compiled_graph["hash"] is not None:
+                logger.info("AGENT_WORKFLOW_GRAPH changed. Recompiling the workflow graph.")
+            _compiled_graph["graph"] = create_workflow_graph()
+            _compiled_graph["hash"] = graph_hash
+            _bound_graphs.clear()
+        workflow = _compiled_graph["graph"]
+
+        if checkpointer is None:
+            return workflow
+
+        bound = _bound_graphs.get(checkpointer)
+        if bound is None or bound[0] != graph_hash:
+            bound = (graph_hash, workflow.copy(update={"checkpointer": checkpointer}))
+            _bound_graphs[checkpointer] = bound
+        return bound[1]
+
+
 if __name__ == "__main__":
     # Example usage
     workflow = create_workflow_graph()
@@ -68,4 +176,4 @@ if __name__ == "__main__":
 
     # Print the graph in ASCII format
     ascii_graph = graph.draw_ascii()
-    print(ascii_graph)
\ No newline at end of file
+    print(ascii_graph)
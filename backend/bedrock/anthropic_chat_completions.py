@@ -1,9 +1,10 @@
 import json
+import asyncio
 
 from bedrock.client import BedrockClient
 from botocore.exceptions import ClientError
 
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 
 import logging
 
@@ -22,6 +23,10 @@ class BedrockAnthropicChatCompletions(BedrockClient):
 
     log: logging.Logger = logging.getLogger("BedrockAnthropicChatCompletions")
 
+    # Sampling parameters sent with every request
+    temperature: float = 0.00001
+    max_tokens: int = 512
+
     def __init__(self, aws_access_key: Optional[str] = None, aws_secret_key: Optional[str] = None, region_name: Optional[str] = "us-east-1",
                 model_id: Optional[str] = "anthropic.claude-3-haiku-20240307-v1:0") -> None:
         super().__init__(aws_access_key=aws_access_key, aws_secret_key=aws_secret_key, region_name=region_name)
@@ -38,24 +43,15 @@ class BedrockAnthropicChatCompletions(BedrockClient):
         self.model_id = model_id
         self.bedrock_client = self._get_bedrock_client()
 
-    def predict(self, text: str):
-        """ Predict a chat completion based on the input text.
-
-        Args:
-            text (str): The input text to generate a chat completion for.
-
-        Returns:
-            str: The chat completion generated by the model.
-        """
-
-        temperature = 0.00001
-        max_tokens = 512
+    @property
+    def request_params(self) -> dict:
+        """ Parameters that, together with the model ID and prompt, determine the completion. """
+        return {"anthropic_version": "bedrock-2023-05-31", "max_tokens": self.max_tokens, "temperature": self.temperature}
 
-        # Format the request payload using the model's native structure.
+    def _request_body(self, text: str) -> str:
+        """ Format the request payload using the model's native structure, as JSON. """
         native_request = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": max_tokens,
-            "temperature": temperature,
+            **self.request_params,
             "messages": [
                 {
                     "role": "user",
@@ -63,9 +59,23 @@ class BedrockAnthropicChatCompletions(BedrockClient):
                 }
             ],
         }
+        return json.dumps(native_request)
+
+    def predict(self, text: str):
+        """ Predict a chat completion based on the input text.
+
+        Args:
+            text (str): The input text to generate a chat completion for.
+
+        Returns:
+            str: The chat completion generated by the model.
+
+        Raises:
+            ClientError: If the model cannot be invoked.
+        """
 
         # Convert the native request to JSON.
-        request = json.dumps(native_request)
+        request = self._request_body(text)
 
         try:
             # Invoke the model with the request.
@@ -74,8 +84,8 @@ class BedrockAnthropicChatCompletions(BedrockClient):
 
         except (ClientError, Exception) as e:
             self.log.error(
-                f"ERROR: Can't invoke '{self.text_model}'. Reason: {e}")
-            exit(1)
+                f"ERROR: Can't invoke '{self.model_id}'. Reason: {e}")
+            raise
 
         # Decode the response body.
         model_response = json.loads(response["body"].read())
@@ -84,3 +94,67 @@ class BedrockAnthropicChatCompletions(BedrockClient):
         response_text = model_response["content"][0]["text"]
 
         return response_text
+
+    def predict_stream(self, text: str) -> Iterator[dict]:
+        """ Stream a chat completion based on the input text, using invoke_model_with_response_stream.
+
+        Args:
+            text (str): The input text to generate a chat completion for.
+
+        Yields:
+            dict: {"type": "delta", "text": str} for each text delta as it arrives, then a final
+                {"type": "usage", "input_tokens": int, "output_tokens": int, "stop_reason": str}.
+
+        Raises:
+            ClientError: If the model cannot be invoked.
+        """
+        request = self._request_body(text)
+
+        try:
+            response = self.bedrock_client.invoke_model_with_response_stream(
+                modelId=self.model_id, body=request)
+        except (ClientError, Exception) as e:
+            self.log.error(
+                f"ERROR: Can't invoke '{self.model_id}'. Reason: {e}")
+            raise
+
+        usage = {"type": "usage", "input_tokens": None, "output_tokens": None, "stop_reason": None}
+        for event in response["body"]:
+            chunk = json.loads(event["chunk"]["bytes"])
+            chunk_type = chunk.get("type")
+            if chunk_type == "content_block_delta" and chunk["delta"].get("type") == "text_delta":
+                yield {"type": "delta", "text": chunk["delta"]["text"]}
+            elif chunk_type == "message_start":
+                usage["input_tokens"] = chunk["message"].get("usage", {}).get("input_tokens")
+            elif chunk_type == "message_delta":
+                usage["stop_reason"] = chunk.get("delta", {}).get("stop_reason")
+                usage["output_tokens"] = chunk.get("usage", {}).get("output_tokens")
+        yield usage
+
+    async def apredict_stream(self, text: str) -> AsyncIterator[dict]:
+        """ Async variant of predict_stream. The blocking reads of the response stream run on the default executor.
+
+        Args:
+            text (str): The input text to generate a chat completion for.
+
+        Yields:
+            dict: The same events as predict_stream.
+        """
+        events = await asyncio.to_thread(self.predict_stream, text)
+        sentinel = object()
+        while True:
+            event = await asyncio.to_thread(next, events, sentinel)
+            if event is sentinel:
+                return
+            yield event
+
+    async def apredict(self, text: str):
+        """ Async variant of predict. The boto3 call runs on the default executor so the event loop is not blocked.
+
+        Args:
+            text (str): The input text to generate a chat completion for.
+
+        Returns:
+            str: The chat completion generated by the model.
+        """
+        return await asyncio.to_thread(self.predict, text)
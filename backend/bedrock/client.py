@@ -1,6 +1,9 @@
 import boto3
+import botocore.session
 from botocore.config import Config
+from botocore.credentials import CredentialProvider, DeferredRefreshableCredentials
 import os
+import threading
 
 from typing import Optional
 
@@ -10,71 +13,140 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+class AssumeRoleCredentialProvider(CredentialProvider):
+    """Credential provider returning lazily fetched, auto-refreshing STS assume_role credentials.
+
+    Args:
+        refresh (Callable): Returns the credential metadata (access_key, secret_key, token, expiry_time).
+    """
+
+    METHOD = "sts-assume-role"
+    CANONICAL_NAME = "bedrock-assume-role"
+
+    def __init__(self, refresh):
+        super().__init__()
+        self._refresh = refresh
+
+    def load(self):
+        return DeferredRefreshableCredentials(refresh_using=self._refresh, method=self.METHOD)
+
+
 class BedrockClient:
-    """Implementation of BedrockClient class."""
-    
+    """Implementation of BedrockClient class.
+
+    boto3 clients are thread-safe, so the clients built here are cached per process and
+    shared by every BedrockClient subclass instance. The cache is keyed by region, AWS
+    profile, assumed role, static access key and service name.
+
+    The HTTP pool and timeouts can be tuned through the following environment variables:
+        BEDROCK_MAX_POOL_CONNECTIONS (int): Max pooled HTTP connections per client. Default is 50.
+        BEDROCK_CONNECT_TIMEOUT (int): Connect timeout in seconds. Default is 10.
+        BEDROCK_READ_TIMEOUT (int): Read timeout in seconds. Default is 120.
+    """
+
+    _clients = {}
+    _lock = threading.Lock()
+
     def __init__(self, aws_access_key: Optional[str] = None, aws_secret_key: Optional[str] = None,
                  assumed_role: Optional[str] = None, region_name: Optional[str] = "us-east-1") -> None:
         self.region_name = region_name
         self.assumed_role = assumed_role
         self.aws_access_key = aws_access_key
         self.aws_secret_key = aws_secret_key
-    
+
     def _get_bedrock_client(
             self,
             runtime: Optional[bool] = True,
     ):
-        """Create a boto3 client for Amazon Bedrock, with optional configuration overrides."""
+        """Return the shared boto3 client for Amazon Bedrock, creating it on first use."""
         if self.region_name is None:
             target_region = os.environ.get("AWS_REGION", os.environ.get("AWS_DEFAULT_REGION"))
         else:
             target_region = self.region_name
-        session_kwargs = {"region_name": target_region}
-        client_kwargs = {**session_kwargs}
-        
         profile_name = os.environ.get("AWS_PROFILE")
-        
+        service_name = 'bedrock-runtime' if runtime else 'bedrock'
+
+        key = (target_region, profile_name, self.assumed_role, self.aws_access_key, service_name)
+        bedrock_client = BedrockClient._clients.get(key)
+        if bedrock_client is not None:
+            return bedrock_client
+
+        with BedrockClient._lock:
+            bedrock_client = BedrockClient._clients.get(key)
+            if bedrock_client is None:
+                bedrock_client = self._create_bedrock_client(target_region, profile_name, service_name)
+                BedrockClient._clients[key] = bedrock_client
+        return bedrock_client
+
+    def _create_bedrock_client(self, target_region: str, profile_name: Optional[str], service_name: str):
+        """Create a boto3 client for Amazon Bedrock, with optional configuration overrides."""
+        session_kwargs = {"region_name": target_region}
+        client_kwargs = {}
+
         if profile_name:
             session_kwargs["profile_name"] = profile_name
-        
+
         retry_config = Config(
             region_name=target_region,
             retries={
                 "max_attempts": 10,
                 "mode": "standard",
             },
+            max_pool_connections=int(os.environ.get("BEDROCK_MAX_POOL_CONNECTIONS", 50)),
+            connect_timeout=int(os.environ.get("BEDROCK_CONNECT_TIMEOUT", 10)),
+            read_timeout=int(os.environ.get("BEDROCK_READ_TIMEOUT", 120)),
         )
         session = boto3.Session(**session_kwargs)
-        
+
         if self.assumed_role:
-            sts = session.client("sts")
-            response = sts.assume_role(
-                RoleArn=str(self.assumed_role),
-                RoleSessionName="bedrock-admin"
-            )
-            client_kwargs["aws_access_key_id"] = response["Credentials"]["AccessKeyId"]
-            client_kwargs["aws_secret_access_key"] = response["Credentials"]["SecretAccessKey"]
-            client_kwargs["aws_session_token"] = response["Credentials"]["SessionToken"]
-        
+            session = self._get_assumed_role_session(session, target_region)
+
         if self.aws_access_key and self.aws_secret_key:
             client_kwargs["aws_access_key_id"] = self.aws_access_key
             client_kwargs["aws_secret_access_key"] = self.aws_secret_key
-        
-        service_name = 'bedrock-runtime' if runtime else 'bedrock'
-        
+
         bedrock_client = session.client(
             service_name=service_name,
             config=retry_config,
             **client_kwargs
         )
-    
+
         return bedrock_client
-    
-    def _close_bedrock(self):
-        """Close Bedrock client."""
-        if hasattr(self, 'bedrock') and self.bedrock:
-            self.bedrock.close()
-    
-    def __del__(self):
-        """Destructor."""
-        self._close_bedrock()
\ No newline at end of file
+
+    def _get_assumed_role_session(self, session: boto3.Session, target_region: str) -> boto3.Session:
+        """
+        Build a session whose credentials come from STS assume_role and are refreshed by
+        botocore shortly before they expire, so a cached client never runs on stale credentials.
+
+        The role is plugged in through the session's public credential provider chain, ahead of
+        the environment provider. STS is only called when the credentials are first used.
+        """
+        sts = session.client("sts")
+
+        def refresh():
+            response = sts.assume_role(
+                RoleArn=str(self.assumed_role),
+                RoleSessionName="bedrock-admin"
+            )
+            credentials = response["Credentials"]
+            return {
+                "access_key": credentials["AccessKeyId"],
+                "secret_key": credentials["SecretAccessKey"],
+                "token": credentials["SessionToken"],
+                "expiry_time": credentials["Expiration"].isoformat(),
+            }
+
+        botocore_session = botocore.session.get_session()
+        botocore_session.set_config_variable("region", target_region)
+        botocore_session.get_component("credential_provider").insert_before(
+            "env", AssumeRoleCredentialProvider(refresh)
+        )
+        return boto3.Session(botocore_session=botocore_session)
+
+    @classmethod
+    def close_all(cls):
+        """Close every shared client and clear the cache. Meant to be called from the application shutdown hook."""
+        with cls._lock:
+            for bedrock_client in cls._clients.values():
+                bedrock_client.close()
+            cls._clients.clear()
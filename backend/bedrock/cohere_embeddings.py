@@ -1,4 +1,5 @@
 import json
+import asyncio
 
 from bedrock.client import BedrockClient
 from botocore.exceptions import ClientError
@@ -61,6 +62,9 @@ class BedrockCohereEnglishEmbeddings(BedrockClient):
 
         return response
 
+    # Maximum number of texts accepted by the Cohere Embed API in a single request
+    MAX_BATCH_SIZE = 96
+
     def predict(self, text: str):
         """ Predict text embeddings based on the input text. 
 
@@ -70,23 +74,63 @@ class BedrockCohereEnglishEmbeddings(BedrockClient):
         Returns:
             list: The text embeddings generated by the model.
         """
+        embeddings = self.predict_batch([text])
+        return embeddings[0] if embeddings else None
+
+    def predict_batch(self, texts: list, input_type: str = "search_document"):
+        """ Predict text embeddings for several texts, sending up to MAX_BATCH_SIZE texts per request.
+
+        Args:
+            texts (list): The input texts to generate embeddings for.
+            input_type (str): The Cohere input type. Default is "search_document".
+
+        Returns:
+            list: One embedding per input text, in the same order, or None if a request fails.
+        """
+        embeddings = self.predict_batch_types(texts, input_type=input_type, embedding_types=["float"])
+        return embeddings["float"] if embeddings else None
+
+    def predict_batch_types(self, texts: list, input_type: str = "search_document", embedding_types: list = None):
+        """ Predict text embeddings of one or more types ("float", "int8", "uint8", "binary", "ubinary")
+        for several texts, sending up to MAX_BATCH_SIZE texts per request. All the types come from a single request.
+
+        Args:
+            texts (list): The input texts to generate embeddings for.
+            input_type (str): The Cohere input type. Default is "search_document".
+            embedding_types (list): The embedding types to request. Default is ["float"].
+
+        Returns:
+            dict: One list of embeddings per requested type, in input order, or None if a request fails.
+        """
 
-        input_type = "search_document"
-        embedding_types = ["float"]
+        embedding_types = embedding_types or ["float"]
 
         try:
-            body = json.dumps({
-                "texts": [text],
-                "input_type": input_type,
-                "embedding_types": embedding_types}
-            )
-            response = self.generate_text_embeddings(body=body)
-            # Extract the response embeddings
-            response_embeddings = json.loads(response.get('body').read())[
-                "embeddings"]["float"][0]
+            response_embeddings = {embedding_type: [] for embedding_type in embedding_types}
+            for start in range(0, len(texts), self.MAX_BATCH_SIZE):
+                body = json.dumps({
+                    "texts": texts[start:start + self.MAX_BATCH_SIZE],
+                    "input_type": input_type,
+                    "embedding_types": embedding_types}
+                )
+                response = self.generate_text_embeddings(body=body)
+                # Extract the response embeddings
+                embeddings = json.loads(response.get('body').read())["embeddings"]
+                for embedding_type in embedding_types:
+                    response_embeddings[embedding_type].extend(embeddings[embedding_type])
 
             return response_embeddings
         except ClientError as err:
             message = err.response["Error"]["Message"]
             self.log.error("A client error occurred: %s", message)
 
+    async def apredict(self, text: str):
+        """ Async variant of predict. The boto3 call runs on the default executor so the event loop is not blocked.
+
+        Args:
+            text (str): The input text to generate embeddings for.
+
+        Returns:
+            list: The text embeddings generated by the model.
+        """
+        return await asyncio.to_thread(self.predict, text)
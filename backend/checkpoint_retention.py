@@ -0,0 +1,220 @@
+import time
+import asyncio
+import logging
+import argparse
+import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from db.mdb import MongoDBConnector
+from slim_checkpointer import CheckpointBlobStore
+from config.config_loader import ConfigLoader
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load configuration
+config = ConfigLoader()
+
+
+class CheckpointRetention(MongoDBConnector):
+    """
+    Retention job for the checkpoint collections (MDB_CHECKPOINTER_COLLECTION and its _writes and _blobs companions).
+
+    - Completed threads (a "completed" session in MDB_AGENT_SESSIONS_COLLECTION) keep only their
+      latest checkpoint, and lose every write. Compacted sessions are flagged so they are not scanned again.
+    - Other threads (failed or abandoned) are deleted entirely once their last checkpoint is older
+      than CHECKPOINT_RETENTION_MAX_AGE_SECONDS, and their references to externalized blobs are
+      released. Each pass only scans the checkpoints that became older than the cutoff since the
+      previous pass of the same job.
+
+    Deletes are issued in batches of CHECKPOINT_RETENTION_BATCH_SIZE documents, so the job does not
+    hold long-running operations on the collections.
+
+    Args:
+        collection_name (str, optional): Checkpoint collection name. Default is MDB_CHECKPOINTER_COLLECTION.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    def __init__(self, collection_name: str = None, uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(uri, database_name, appname)
+        self.collection_name = collection_name or config.get("MDB_CHECKPOINTER_COLLECTION")
+        self.checkpoints = self.get_collection(self.collection_name)
+        self.writes = self.get_collection(self.collection_name + "_writes")
+        self.blobs = CheckpointBlobStore(self.collection_name + "_blobs", serde=None, uri=uri, database_name=database_name, appname=appname)
+        self.sessions = self.get_collection(config.get("MDB_AGENT_SESSIONS_COLLECTION"))
+        self.max_age_seconds = config.get_int("CHECKPOINT_RETENTION_MAX_AGE_SECONDS", 7 * 24 * 3600)
+        self.batch_size = config.get_int("CHECKPOINT_RETENTION_BATCH_SIZE", 1000)
+        # Cutoff of the last successful expiry pass: older checkpoints were already examined
+        self._expired_until = None
+
+    def ensure_indexes(self):
+        """Create the indexes the job and the checkpointer look checkpoints up with."""
+        for collection in (self.checkpoints, self.writes):
+            collection.create_index([("thread_id", ASCENDING), ("checkpoint_ns", ASCENDING), ("checkpoint_id", DESCENDING)])
+        self.sessions.create_index([("status", ASCENDING), ("checkpoints_compacted", ASCENDING)])
+        self.blobs.ensure_indexes()
+
+    def _delete_in_batches(self, collection, query: dict, dry_run: bool = False) -> int:
+        """Delete the documents matching the query, batch_size documents at a time."""
+        if dry_run:
+            return collection.count_documents(query)
+        deleted = 0
+        while True:
+            ids = [doc["_id"] for doc in collection.find(query, {"_id": 1}).limit(self.batch_size)]
+            if not ids:
+                return deleted
+            deleted += collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+    def _latest_checkpoints(self, thread_id: str) -> list:
+        """Return the latest checkpoint ID of each namespace of the thread."""
+        latest = self.checkpoints.aggregate([
+            {"$match": {"thread_id": thread_id}},
+            {"$sort": {"checkpoint_ns": 1, "checkpoint_id": -1}},
+            {"$group": {"_id": "$checkpoint_ns", "checkpoint_id": {"$first": "$checkpoint_id"}}}
+        ])
+        return [doc["checkpoint_id"] for doc in latest]
+
+    def compact_completed_threads(self, dry_run: bool = False) -> dict:
+        """
+        Keep only the latest checkpoint of completed threads and delete their writes.
+
+        Args:
+            dry_run (bool, optional): Count what would be deleted without deleting. Default is False.
+
+        Returns:
+            dict: Number of threads compacted, checkpoints and writes deleted.
+        """
+        result = {"threads": 0, "checkpoints": 0, "writes": 0}
+        query = {"status": "completed", "checkpoints_compacted": {"$ne": True}, "thread_id": {"$exists": True}}
+        while True:
+            thread_ids = self.sessions.distinct("thread_id", query) if dry_run else [
+                doc.get("thread_id") for doc in self.sessions.find(query, {"thread_id": 1}).limit(self.batch_size)
+            ]
+            if not thread_ids:
+                return result
+            for thread_id in set(thread_ids):
+                latest = self._latest_checkpoints(thread_id)
+                result["checkpoints"] += self._delete_in_batches(
+                    self.checkpoints, {"thread_id": thread_id, "checkpoint_id": {"$nin": latest}}, dry_run)
+                result["writes"] += self._delete_in_batches(self.writes, {"thread_id": thread_id}, dry_run)
+                result["threads"] += 1
+            if dry_run:
+                return result
+            self.sessions.update_many({"thread_id": {"$in": thread_ids}}, {"$set": {"checkpoints_compacted": True}})
+
+    def expire_stale_threads(self, dry_run: bool = False) -> dict:
+        """
+        Delete every checkpoint and write of the threads without a completed session whose
+        last checkpoint is older than max_age_seconds, and release their blobs.
+
+        Checkpoints are upserted, so their ObjectId carries the time they were first written. Only the
+        checkpoints written between the previous cutoff and the current one are scanned (by _id), so a
+        pass reads the threads that went stale since the last one, not the whole collection.
+
+        Args:
+            dry_run (bool, optional): Count what would be deleted without deleting. Default is False.
+
+        Returns:
+            dict: Number of threads expired, checkpoints, writes and blobs deleted.
+        """
+        result = {"threads": 0, "checkpoints": 0, "writes": 0, "blobs": 0}
+        if not self.max_age_seconds:
+            return result
+        cutoff = ObjectId.from_datetime(
+            datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=self.max_age_seconds))
+        id_range = {"$lt": cutoff}
+        if self._expired_until is not None:
+            id_range["$gte"] = self._expired_until
+        candidates = self.checkpoints.aggregate([
+            {"$match": {"_id": id_range, "thread_id": {"$exists": True}}},
+            {"$group": {"_id": "$thread_id"}}
+        ], batchSize=self.batch_size)
+
+        def expire(thread_ids: list):
+            # Threads with a checkpoint newer than the cutoff are still active
+            active = set(self.checkpoints.distinct("thread_id", {"thread_id": {"$in": thread_ids}, "_id": {"$gte": cutoff}}))
+            completed = set(self.sessions.distinct("thread_id", {"thread_id": {"$in": thread_ids}, "status": "completed"}))
+            expired = [thread_id for thread_id in thread_ids if thread_id not in active and thread_id not in completed]
+            if expired:
+                result["checkpoints"] += self._delete_in_batches(self.checkpoints, {"thread_id": {"$in": expired}}, dry_run)
+                result["writes"] += self._delete_in_batches(self.writes, {"thread_id": {"$in": expired}}, dry_run)
+                result["blobs"] += self.blobs.release(expired, dry_run)
+                result["threads"] += len(expired)
+
+        thread_ids = []
+        for doc in candidates:
+            thread_ids.append(doc["_id"])
+            if len(thread_ids) >= self.batch_size:
+                expire(thread_ids)
+                thread_ids = []
+        if thread_ids:
+            expire(thread_ids)
+        if not dry_run:
+            self._expired_until = cutoff
+        return result
+
+    def run(self, dry_run: bool = False) -> dict:
+        """
+        Run a full retention pass.
+
+        Args:
+            dry_run (bool, optional): Count what would be deleted without deleting. Default is False.
+
+        Returns:
+            dict: Counts per step.
+        """
+        started_at = time.monotonic()
+        result = {
+            "compacted": self.compact_completed_threads(dry_run),
+            "expired": self.expire_stale_threads(dry_run)
+        }
+        logger.info(f"Checkpoint retention {'dry run ' if dry_run else ''}done in {time.monotonic() - started_at:.1f}s: {result}")
+        return result
+
+
+async def run_checkpoint_retention_periodically(interval_seconds: float):
+    """
+    Run the retention job every interval_seconds, off the event loop. Meant to be started as
+    a background task at application startup and cancelled on shutdown.
+
+    Args:
+        interval_seconds (float): Seconds between two passes.
+    """
+    retention = CheckpointRetention()
+    try:
+        await asyncio.to_thread(retention.ensure_indexes)
+    except Exception as e:
+        logger.error(f"Error creating checkpoint retention indexes: {e}")
+    while True:
+        try:
+            await asyncio.to_thread(retention.run)
+        except Exception as e:
+            logger.error(f"Error during checkpoint retention: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+# ==================
+# Command line usage
+# ==================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact and expire agent checkpoints.")
+    parser.add_argument("--dry-run", action="store_true", help="Count the documents that would be deleted without deleting them.")
+    args = parser.parse_args()
+
+    retention = CheckpointRetention()
+    retention.ensure_indexes()
+    print(retention.run(dry_run=args.dry_run))
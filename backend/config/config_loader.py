@@ -1,6 +1,11 @@
 import os
 import json
+import time
 import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 
 # Configure logging
 logging.basicConfig(
@@ -8,28 +13,181 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Expected types of the known configuration keys. Keys listed in REQUIRED_KEYS must be present.
+CONFIG_SCHEMA = {
+    "CSV_DATA": str,
+    "MDB_DATABASE_NAME": str,
+    "MDB_CLIENT_OPTIONS": dict,
+    "MDB_TIMESERIES_COLLECTION": str,
+    "DEFAULT_TIMESERIES_DATA": list,
+    "CRITICAL_CONDITIONS": dict,
+    "MDB_TIMESERIES_TIMEFIELD": str,
+    "MDB_TIMESERIES_GRANULARITY": str,
+    "MDB_TIMESERIES_INSERT_BATCH_SIZE": int,
+    "MDB_TIMESERIES_READ_WINDOW_SECONDS": int,
+    "MDB_TIMESERIES_READ_WINDOW_ANCHOR": str,
+    "MDB_TIMESERIES_READ_MAX_POINTS": int,
+    "MDB_TIMESERIES_READ_FIELDS": list,
+    "MDB_TIMESERIES_READ_BATCH_SIZE": int,
+    "MDB_EMBEDDINGS_COLLECTION": str,
+    "MDB_EMBEDDINGS_COLLECTION_VS_FIELD": str,
+    "MDB_VS_INDEX": str,
+    "VECTOR_SEARCH_BACKEND": str,
+    "LOCAL_VECTOR_SEARCH_REFRESH_SECONDS": (int, float),
+    "LOCAL_VECTOR_SEARCH_MMAP_PATH": str,
+    "LOCAL_VECTOR_SEARCH_ANN_MIN_SIZE": int,
+    "LOCAL_VECTOR_SEARCH_FULL_RELOAD_SECONDS": (int, float),
+    "MDB_VS_INDEX_QUANTIZATION": str,
+    "VECTOR_SEARCH_RESCORE_FACTOR": int,
+    "MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION": str,
+    "SIMILAR_QUERIES": list,
+    "MDB_CHAT_HISTORY_COLLECTION": str,
+    "MDB_CHECKPOINTER_COLLECTION": str,
+    "CHECKPOINT_EXCLUDE_FIELDS": list,
+    "CHECKPOINT_EXTERNALIZE_FIELDS": list,
+    "CHECKPOINT_NODES": list,
+    "CHECKPOINT_RETENTION_INTERVAL_SECONDS": (int, float),
+    "CHECKPOINT_RETENTION_MAX_AGE_SECONDS": int,
+    "CHECKPOINT_RETENTION_BATCH_SIZE": int,
+    "RECOMMENDATION_FAIL_ON_ERROR": bool,
+    "MDB_LOGS_COLLECTION": str,
+    "MDB_AGENT_PROFILES_COLLECTION": str,
+    "AGENT_PROFILES_CACHE_TTL_SECONDS": int,
+    "AGENT_PROFILES_CHANGE_STREAM": bool,
+    "MDB_AGENT_SESSIONS_COLLECTION": str,
+    "AGENT_RUN_COALESCING_WINDOW_SECONDS": (int, float),
+    "AGENT_PROFILE_CHOSEN_ID": str,
+    "DEFAULT_AGENT_PROFILE": dict,
+    "EMBEDDINGS_MODEL_NAME": str,
+    "EMBEDDINGS_MODEL_ID": str,
+    "EMBEDDINGS_BATCH_SIZE": int,
+    "EMBEDDINGS_CONCURRENCY": int,
+    "EMBEDDINGS_STORAGE_TYPE": str,
+    "EMBEDDINGS_RESCORE_FIELD": str,
+    "MDB_EMBEDDINGS_CACHE_COLLECTION": str,
+    "EMBEDDINGS_CACHE_TTL_SECONDS": int,
+    "EMBEDDINGS_CACHE_LRU_SIZE": int,
+    "CHATCOMPLETIONS_MODEL_NAME": str,
+    "CHATCOMPLETIONS_MODEL_ID": str,
+    "MDB_LLM_CACHE_COLLECTION": str,
+    "LLM_CACHE_TTL_SECONDS": int,
+    "LLM_CACHE_LRU_SIZE": int,
+    "AGENT_WORKFLOW_GRAPH": dict,
+}
+REQUIRED_KEYS = ("MDB_DATABASE_NAME", "AGENT_WORKFLOW_GRAPH")
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Recursively convert a frozen value back into plain dicts and lists."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Immutable, validated view of the configuration file as it was at a given mtime.
+    """
+    config_file: str
+    mtime: float
+    data: Mapping[str, Any]
+
+
 class ConfigLoader:
     """
     A class to load configuration from a JSON file.
+
+    Parsed configurations are cached per process and shared by every ConfigLoader instance,
+    so constructing one is cheap. The file is re-read only when its mtime changes, and the
+    mtime itself is checked at most once every RELOAD_INTERVAL seconds. If a modified file
+    fails to parse or validate, the previous snapshot is kept.
     """
+
+    RELOAD_INTERVAL = 1.0
+
+    _snapshots = {}
+    _checked_at = {}
+    _lock = threading.Lock()
+
     def __init__(self, config_file: str = "config.json"):
         """
         Initialize the ConfigLoader with a relative config file path.
         The config file path will be resolved relative to the script's directory.
         """
-        
+
         # Get the directory of the current script
         script_dir = os.path.dirname(os.path.abspath(__file__))
-        
+
         # Construct the absolute path to the config.json file
         self.config_file = os.path.join(script_dir, config_file)
-        
+
         # Check if the config file exists at the resolved path
-        if not os.path.exists(self.config_file):
+        if self.config_file not in ConfigLoader._snapshots and not os.path.exists(self.config_file):
             raise FileNotFoundError(f"Config file not found: {self.config_file}")
-        
-        # Load the configuration data
-        self.config_data = self._load_config()
+
+        # Load (or reuse) the configuration snapshot
+        self._refresh()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """
+        Current configuration snapshot, reloaded if the file changed on disk.
+        """
+        checked_at = ConfigLoader._checked_at.get(self.config_file, 0.0)
+        if time.monotonic() - checked_at >= self.RELOAD_INTERVAL:
+            self._refresh()
+        return ConfigLoader._snapshots[self.config_file]
+
+    @property
+    def config_data(self) -> Mapping[str, Any]:
+        """
+        Read-only mapping of the current configuration.
+        """
+        return self.snapshot.data
+
+    def _refresh(self):
+        """
+        Re-read the configuration file if its mtime differs from the cached snapshot.
+        """
+        with ConfigLoader._lock:
+            current = ConfigLoader._snapshots.get(self.config_file)
+            ConfigLoader._checked_at[self.config_file] = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.config_file)
+            except OSError:
+                if current is None:
+                    raise
+                logging.error(f"Configuration file {self.config_file} is no longer accessible. Keeping previous configuration.")
+                return
+            if current is not None and current.mtime == mtime:
+                return
+            try:
+                config_data = self._load_config()
+                self._validate(config_data)
+            except (json.JSONDecodeError, ValueError):
+                if current is None:
+                    raise
+                logging.error(f"Keeping previous configuration for {self.config_file}.")
+                return
+            ConfigLoader._snapshots[self.config_file] = ConfigSnapshot(
+                config_file=self.config_file,
+                mtime=mtime,
+                data=_freeze(config_data)
+            )
+            if current is not None:
+                logging.info(f"Configuration reloaded from {self.config_file}.")
 
     def _load_config(self):
         """
@@ -46,13 +204,79 @@ class ConfigLoader:
             logging.error(f"Error parsing {self.config_file}: {e}")
             raise
 
+    def _validate(self, config_data):
+        """
+        Validate the top-level structure and the types of known keys.
+        """
+        if not isinstance(config_data, dict):
+            raise ValueError(f"Configuration in {self.config_file} must be a JSON object.")
+        errors = [f"missing required key '{key}'" for key in REQUIRED_KEYS if key not in config_data]
+        for key, expected_type in CONFIG_SCHEMA.items():
+            if key in config_data and config_data[key] is not None and not isinstance(config_data[key], expected_type):
+                type_name = " or ".join(t.__name__ for t in expected_type) if isinstance(expected_type, tuple) else expected_type.__name__
+                errors.append(f"'{key}' must be of type {type_name}")
+        if errors:
+            message = f"Invalid configuration in {self.config_file}: " + "; ".join(errors)
+            logging.error(message)
+            raise ValueError(message)
+
     def get(self, key, default=None):
         """
         Get a configuration value by key.
+        Dicts and lists are returned as fresh mutable copies of the cached snapshot.
+        """
+        value = self.snapshot.data.get(key)
+        if value is None:
+            return default
+        return _thaw(value)
+
+    def _get_typed(self, key, expected_type, default):
+        """
+        Get a configuration value by key and check its type.
         """
-        value = self.config_data.get(key, default)
+        value = self.get(key, default)
+        if value is not None and not isinstance(value, expected_type):
+            raise ValueError(f"Configuration key '{key}' must be of type {expected_type}, got {type(value).__name__}.")
         return value
 
+    def get_str(self, key, default: Optional[str] = None) -> Optional[str]:
+        """
+        Get a string configuration value by key.
+        """
+        return self._get_typed(key, str, default)
+
+    def get_int(self, key, default: Optional[int] = None) -> Optional[int]:
+        """
+        Get an integer configuration value by key.
+        """
+        value = self._get_typed(key, (int, float), default)
+        return int(value) if value is not None else None
+
+    def get_float(self, key, default: Optional[float] = None) -> Optional[float]:
+        """
+        Get a float configuration value by key.
+        """
+        value = self._get_typed(key, (int, float), default)
+        return float(value) if value is not None else None
+
+    def get_bool(self, key, default: Optional[bool] = None) -> Optional[bool]:
+        """
+        Get a boolean configuration value by key.
+        """
+        return self._get_typed(key, bool, default)
+
+    def get_list(self, key, default: Optional[list] = None) -> Optional[list]:
+        """
+        Get a list configuration value by key.
+        """
+        return self._get_typed(key, list, default)
+
+    def get_dict(self, key, default: Optional[dict] = None) -> Optional[dict]:
+        """
+        Get a dict configuration value by key.
+        """
+        return self._get_typed(key, dict, default)
+
 # ==================
 # Example usage
 # ==================
@@ -64,7 +288,7 @@ if __name__ == "__main__":
     MDB_DATABASE_NAME = config_loader.get("MDB_DATABASE_NAME")
     MDB_TIMESERIES_COLLECTION = config_loader.get("MDB_TIMESERIES_COLLECTION")
     CSV_DATA = config_loader.get("CSV_DATA")
-    
+
     # Print configurations
     logging.info(f"MDB_DATABASE_NAME: {MDB_DATABASE_NAME}")
     logging.info(f"MDB_TIMESERIES_COLLECTION: {MDB_TIMESERIES_COLLECTION}")
@@ -0,0 +1,190 @@
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Comparison operators applied element-wise to a metric column
+COMPARISON_OPERATORS = {
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+}
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """
+    A single validated critical condition.
+
+    Attributes:
+        metric (str): Time-series field the condition applies to.
+        operator (str): One of ">", "<", ">=", "<=", "range" or "rate_of_change".
+        message (str): Message template, formatted with {value} (and {change} for rate_of_change).
+        threshold (float, optional): Threshold for comparison and rate_of_change operators.
+        low (float, optional): Inclusive lower bound for the range operator.
+        high (float, optional): Inclusive upper bound for the range operator.
+        direction (str): For rate_of_change: "up", "down" or "any". Default is "any".
+        order (int): Position of the condition in the config, used to order the alerts.
+    """
+    metric: str
+    operator: str
+    message: str
+    threshold: Optional[float] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    direction: str = "any"
+    order: int = 0
+
+
+def _compile_condition(metric: str, condition: dict, order: int) -> CompiledCondition:
+    """Validate one condition config entry and turn it into a CompiledCondition."""
+    operator = condition["condition"]
+    message = condition["message"]
+    if operator in COMPARISON_OPERATORS:
+        return CompiledCondition(metric, operator, message, threshold=float(condition["threshold"]), order=order)
+    if operator == "range":
+        return CompiledCondition(metric, operator, message, low=float(condition["min"]), high=float(condition["max"]), order=order)
+    if operator == "rate_of_change":
+        direction = condition.get("direction", "any")
+        if direction not in ("up", "down", "any"):
+            raise ValueError(f"unknown direction '{direction}'")
+        return CompiledCondition(metric, operator, message, threshold=float(condition["threshold"]), direction=direction, order=order)
+    raise ValueError(f"unknown condition '{operator}'")
+
+
+def _to_float(value) -> float:
+    """Convert a cell to float, mapping missing or non-numeric values to NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CriticalConditionsEvaluator:
+    """
+    Columnar evaluator for the CRITICAL_CONDITIONS config.
+
+    The config is compiled once into a plan of CompiledConditions. Evaluation builds one NumPy
+    array per referenced metric and applies every condition on that metric as a vectorized
+    operation. Identical alerts are reported once.
+
+    Each CRITICAL_CONDITIONS entry maps a metric to a condition, or to a list of conditions:
+        {"threshold": 2.5, "condition": "<", "message": "GDP growth slowing: {value}%"}
+        {"min": 20, "max": 30, "condition": "range", "message": "VIX in the elevated band: {value}"}
+        {"threshold": 0.5, "condition": "rate_of_change", "direction": "up", "message": "Rates jumped {change} to {value}%"}
+
+    Args:
+        conditions_config (dict): The CRITICAL_CONDITIONS config.
+    """
+
+    def __init__(self, conditions_config: dict):
+        plan = []
+        for metric, conditions in (conditions_config or {}).items():
+            for condition in conditions if isinstance(conditions, list) else [conditions]:
+                try:
+                    plan.append(_compile_condition(metric, condition, len(plan)))
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.error(f"[Warning] Invalid critical condition for {metric}: {e}")
+        self.plan = tuple(plan)
+        self.metrics = tuple(dict.fromkeys(condition.metric for condition in self.plan))
+
+    @classmethod
+    def from_config(cls, conditions_config: dict) -> "CriticalConditionsEvaluator":
+        """Return an evaluator for the given config, compiling it only once per distinct config."""
+        return cls._from_config_json(json.dumps(conditions_config or {}, sort_keys=True))
+
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _from_config_json(cls, conditions_config_json: str) -> "CriticalConditionsEvaluator":
+        return cls(json.loads(conditions_config_json))
+
+    def _columns(self, timeseries_data: list) -> dict:
+        """Build one float64 array per referenced metric, in a single pass per metric."""
+        n = len(timeseries_data)
+        return {
+            metric: np.fromiter((_to_float(record.get(metric)) for record in timeseries_data), dtype=np.float64, count=n)
+            for metric in self.metrics
+        }
+
+    @staticmethod
+    def _matches(condition: CompiledCondition, column: np.ndarray) -> tuple:
+        """Return the indexes of the rows matching the condition, and the per-row change for rate_of_change."""
+        if condition.operator in COMPARISON_OPERATORS:
+            return np.flatnonzero(COMPARISON_OPERATORS[condition.operator](column, condition.threshold)), None
+        if condition.operator == "range":
+            return np.flatnonzero((column >= condition.low) & (column <= condition.high)), None
+        # rate_of_change: change from the previous point, the first point has none
+        change = np.empty_like(column)
+        change[0] = np.nan
+        np.subtract(column[1:], column[:-1], out=change[1:])
+        if condition.direction == "up":
+            mask = change > condition.threshold
+        elif condition.direction == "down":
+            mask = change < -condition.threshold
+        else:
+            mask = np.abs(change) > condition.threshold
+        return np.flatnonzero(mask), change
+
+    def evaluate(self, timeseries_data: list) -> list:
+        """
+        Evaluate the compiled conditions over the time-series records.
+
+        Args:
+            timeseries_data (list): A list of time-series records.
+
+        Returns:
+            list: Unique critical condition messages, ordered by record, then by condition.
+        """
+        if not timeseries_data or not self.plan:
+            return []
+        columns = self._columns(timeseries_data)
+
+        alerts = []
+        for condition in self.plan:
+            column = columns[condition.metric]
+            rows, change = self._matches(condition, column)
+            for row in rows.tolist():
+                try:
+                    if change is None:
+                        message = condition.message.format(value=float(column[row]))
+                    else:
+                        message = condition.message.format(value=float(column[row]), change=float(change[row]))
+                except (KeyError, IndexError, ValueError) as e:
+                    logger.error(f"[Warning] Error formatting message for {condition.metric}: {e}")
+                    continue
+                alerts.append((row, condition.order, message))
+
+        alerts.sort(key=lambda alert: (alert[0], alert[1]))
+        # De-duplicate identical alerts, keeping the first occurrence
+        return list(dict.fromkeys(message for _, _, message in alerts))
+
+
+# ==================
+# Example usage
+# ==================
+
+if __name__ == "__main__":
+    evaluator = CriticalConditionsEvaluator({
+        "gdp": {"threshold": 2.5, "condition": "<", "message": "GDP growth slowing: {value}%"},
+        "vix": [
+            {"threshold": 20, "condition": ">", "message": "High market volatility (VIX): {value}"},
+            {"threshold": 5, "condition": "rate_of_change", "direction": "up", "message": "VIX jumped {change} to {value}"}
+        ]
+    })
+    messages = evaluator.evaluate([
+        {"gdp": 2.6, "vix": 15},
+        {"gdp": 2.4, "vix": 22},
+        {"gdp": 2.4, "vix": 22}
+    ])
+    print(f"Critical conditions: {messages}")
@@ -1,5 +1,8 @@
 import os
+import logging
+import threading
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from abc import abstractmethod
 from dotenv import load_dotenv
 from config.config_loader import ConfigLoader
@@ -10,6 +13,83 @@ load_dotenv()
 # Load configuration
 config = ConfigLoader()
 
+logger = logging.getLogger(__name__)
+
+
+class MongoClientRegistry:
+    """ Process-wide registry of shared MongoClient instances.
+
+    MongoClient is thread-safe and owns its own connection pool, so every connector
+    pointing at the same cluster should reuse one client instead of paying server
+    discovery and the TLS handshake again. Clients are keyed by (uri, appname).
+
+    Pool settings are read from the MDB_CLIENT_OPTIONS config entry and passed to
+    MongoClient as keyword arguments (e.g. maxPoolSize, minPoolSize, maxIdleTimeMS).
+    The same options apply to the asyncio (Motor) clients used by the async execution path.
+    """
+
+    _clients = {}
+    _async_clients = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_client(cls, uri: str, appname: str = None) -> MongoClient:
+        """Return the shared client for the given URI and appname, creating it if needed."""
+        key = (uri, appname)
+        client = cls._clients.get(key)
+        if client is not None:
+            return client
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client_options = config.get("MDB_CLIENT_OPTIONS") or {}
+                client = MongoClient(uri, appname=appname, **client_options)
+                cls._clients[key] = client
+                logger.info(f"[MongoDB] Shared client created for appname: {appname}")
+            return client
+
+    @classmethod
+    def get_async_client(cls, uri: str, appname: str = None) -> AsyncIOMotorClient:
+        """Return the shared asyncio client for the given URI and appname, creating it if needed."""
+        key = (uri, appname)
+        client = cls._async_clients.get(key)
+        if client is not None:
+            return client
+        with cls._lock:
+            client = cls._async_clients.get(key)
+            if client is None:
+                client_options = config.get("MDB_CLIENT_OPTIONS") or {}
+                client = AsyncIOMotorClient(uri, appname=appname, **client_options)
+                cls._async_clients[key] = client
+                logger.info(f"[MongoDB] Shared async client created for appname: {appname}")
+            return client
+
+    @classmethod
+    def startup(cls, uri: str = None, appname: str = None) -> MongoClient:
+        """
+        Create the default shared client and run a ping so server discovery happens
+        before the first request. Meant to be called from the application startup hook.
+        """
+        client = cls.get_client(uri or os.getenv("MONGODB_URI"), appname or os.getenv("APP_NAME"))
+        try:
+            client.admin.command("ping")
+            logger.info("[MongoDB] Shared client connected.")
+        except Exception as e:
+            logger.error(f"[MongoDB] Error connecting shared client: {e}")
+        return client
+
+    @classmethod
+    def shutdown(cls):
+        """Close every shared client. Meant to be called from the application shutdown hook."""
+        with cls._lock:
+            for client in cls._clients.values():
+                client.close()
+            cls._clients.clear()
+            for client in cls._async_clients.values():
+                client.close()
+            cls._async_clients.clear()
+        logger.info("[MongoDB] Shared clients closed.")
+
 
 class MongoDBConnector:
     """ MongoDBConnector class to connect to MongoDB. 
@@ -28,7 +108,7 @@ class MongoDBConnector:
         self.appname = appname or os.getenv("APP_NAME")
         self.filepath = filepath
         self.collection_name = collection_name
-        self.client = MongoClient(self.uri, appname=self.appname)
+        self.client = MongoClientRegistry.get_client(self.uri, self.appname)
         self.db = self.client[self.database_name]
 
     def __enter__(self):
@@ -36,13 +116,17 @@ class MongoDBConnector:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Exit the runtime context and close the MongoDB connection."""
+        """Exit the runtime context and release the MongoDB connection."""
         self.close_connection()
 
     def close_connection(self):
-        """Close the MongoDB connection."""
-        if self.client:
-            self.client.close()
+        """
+        Release the MongoDB connection.
+
+        The underlying client is shared through MongoClientRegistry, so it is left open
+        for other connectors and closed only by MongoClientRegistry.shutdown().
+        """
+        pass
 
     @abstractmethod
     def run(self, **kwargs):
@@ -56,6 +140,15 @@ class MongoDBConnector:
         collection_name = collection_name
         return self.db[collection_name]
 
+    @property
+    def adb(self) -> AsyncIOMotorDatabase:
+        """Database handle on the shared asyncio client, for use from async code."""
+        return MongoClientRegistry.get_async_client(self.uri, self.appname)[self.database_name]
+
+    def get_async_collection(self, collection_name=None):
+        """Retrieve a collection on the shared asyncio client."""
+        return self.adb[collection_name]
+
     def insert_one(self, collection_name: str, document):
         """Insert a single document into a collection."""
         collection = self.get_collection(collection_name)
@@ -1,9 +1,15 @@
 import os
+import asyncio
 import logging
+import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pymongo import UpdateOne
 
 from db.mdb import MongoDBConnector
+from mdb_cache import EmbeddingCache
 from config.config_loader import ConfigLoader
 from bedrock.cohere_embeddings import BedrockCohereEnglishEmbeddings
+from vector_quantization import encode_vector, get_cohere_embedding_type
 
 from dotenv import load_dotenv
 import os
@@ -19,6 +25,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load configuration
+config = ConfigLoader()
+
 class Embedder(MongoDBConnector):
     def __init__(self, collection_name: str=None, uri=None, database_name: str = None, appname: str = None):
         """
@@ -32,33 +41,70 @@ class Embedder(MongoDBConnector):
         """
         super().__init__(uri, database_name, appname)
 
-        # Load configuration
-        config = ConfigLoader()
         # Get the MongoDB vectors collection name from the config
         MDB_EMBEDDINGS_COLLECTION = config.get("MDB_EMBEDDINGS_COLLECTION")
         self.collection_name = collection_name or MDB_EMBEDDINGS_COLLECTION
         self.collection = self.get_collection(self.collection_name)
 
     @staticmethod
-    def get_embedding(text: str) -> BedrockCohereEnglishEmbeddings:
+    def _cache_model_id(model_id: str, embedding_type: str) -> str:
+        """Model ID used in the cache key. Float embeddings keep the plain model ID."""
+        return model_id if embedding_type == "float" else f"{model_id}:{embedding_type}"
+
+    @staticmethod
+    def get_embedding(text: str, use_cache: bool = True, embedding_type: str = "float") -> BedrockCohereEnglishEmbeddings:
         """Generate an embedding for the given text using Bedrock Cohere English Embeddings.
 
+        Embeddings are looked up in the EmbeddingCache first (in-process LRU, then MongoDB),
+        keyed by the model ID, the embedding type and the normalized text. Bedrock is called only on a miss.
+
         Args:
             text (str): Text to generate an embedding for.
+            use_cache (bool): Whether to read and populate the embedding cache. Default is True.
+            embedding_type (str): The Cohere embedding type, e.g. "float", "int8" or "ubinary". Default is "float".
 
         Returns:
             BedrockCohereEnglishEmbeddings: Embedding for the given text.
         """
+        embeddings = Embedder.get_embedding_types(text, [embedding_type], use_cache)
+        return embeddings.get(embedding_type) if embeddings else None
+
+    @staticmethod
+    def get_embedding_types(text: str, embedding_types: list, use_cache: bool = True) -> dict:
+        """Generate the embeddings of several Cohere embedding types for the given text.
+
+        Each type is looked up in the EmbeddingCache first. The types missing from the cache are
+        requested from Bedrock in a single call.
+
+        Args:
+            text (str): Text to generate embeddings for.
+            embedding_types (list): Cohere embedding types, e.g. ["float", "int8"].
+            use_cache (bool): Whether to read and populate the embedding cache. Default is True.
+
+        Returns:
+            dict: Embedding per type, or None on error.
+        """
         # Check for valid input
         if not text or not isinstance(text, str):
             logging.error("Invalid input. Please provide a valid text input.")
             return None
 
-        # Load configuration
-        config = ConfigLoader()
         # Load Cohere English model ID from config
         model_id = config.get("EMBEDDINGS_MODEL_ID")
 
+        result, missing = {}, list(embedding_types)
+        if use_cache:
+            cache = EmbeddingCache()
+            keys = {t: cache.embedding_key(text, Embedder._cache_model_id(model_id, t)) for t in embedding_types}
+            for embedding_type in embedding_types:
+                embedding = cache.get(keys[embedding_type])
+                if embedding is not None:
+                    result[embedding_type] = embedding
+            missing = [t for t in embedding_types if t not in result]
+            if not missing:
+                logger.info("Embedding served from cache.")
+                return result
+
         # Example usage of the BedrockCohereEnglishEmbeddings class.
         embeddings = BedrockCohereEnglishEmbeddings(
             model_id=model_id,
@@ -66,21 +112,157 @@ class Embedder(MongoDBConnector):
         )
 
         try:
-            # Call the predict method to generate embeddings
-            embedding = embeddings.predict(text)
-            return embedding
+            # Call the predict method to generate the missing embedding types at once
+            generated = embeddings.predict_batch_types([text], embedding_types=missing)
+            for embedding_type in missing:
+                result[embedding_type] = generated[embedding_type][0]
+        except Exception as e:
+            logger.error(f"Error in get_embedding: {e}")
+            return None
+
+        if use_cache:
+            for embedding_type in missing:
+                cache.set(keys[embedding_type], result[embedding_type], model_id=model_id)
+        return result
+
+    @staticmethod
+    async def aget_embedding(text: str, use_cache: bool = True, embedding_type: str = "float") -> BedrockCohereEnglishEmbeddings:
+        """Async variant of get_embedding. The cache lookup runs on the asyncio client and
+        the Bedrock call, on a miss, runs on the default executor.
+
+        Args:
+            text (str): Text to generate an embedding for.
+            use_cache (bool): Whether to read and populate the embedding cache. Default is True.
+            embedding_type (str): The Cohere embedding type, e.g. "float", "int8" or "ubinary". Default is "float".
+
+        Returns:
+            BedrockCohereEnglishEmbeddings: Embedding for the given text.
+        """
+        embeddings = await Embedder.aget_embedding_types(text, [embedding_type], use_cache)
+        return embeddings.get(embedding_type) if embeddings else None
+
+    @staticmethod
+    async def aget_embedding_types(text: str, embedding_types: list, use_cache: bool = True) -> dict:
+        """Async variant of get_embedding_types. The cache lookups run on the asyncio client and
+        the Bedrock call, on a miss, runs on the default executor.
+
+        Args:
+            text (str): Text to generate embeddings for.
+            embedding_types (list): Cohere embedding types, e.g. ["float", "int8"].
+            use_cache (bool): Whether to read and populate the embedding cache. Default is True.
+
+        Returns:
+            dict: Embedding per type, or None on error.
+        """
+        if not use_cache or not text or not isinstance(text, str):
+            return await asyncio.to_thread(Embedder.get_embedding_types, text, embedding_types, use_cache)
+
+        model_id = config.get("EMBEDDINGS_MODEL_ID")
+        cache = EmbeddingCache()
+        keys = {t: cache.embedding_key(text, Embedder._cache_model_id(model_id, t)) for t in embedding_types}
+        result = {}
+        for embedding_type in embedding_types:
+            embedding = await cache.aget(keys[embedding_type])
+            if embedding is not None:
+                result[embedding_type] = embedding
+        missing = [t for t in embedding_types if t not in result]
+        if not missing:
+            logger.info("Embedding served from cache.")
+            return result
+
+        generated = await asyncio.to_thread(Embedder.get_embedding_types, text, missing, False)
+        if generated is None:
+            return None
+        for embedding_type in missing:
+            result[embedding_type] = generated[embedding_type]
+            await cache.aset(keys[embedding_type], generated[embedding_type], model_id=model_id)
+        return result
+
+    @staticmethod
+    def get_embeddings(texts: list, embedding_types: list = None):
+        """Generate embeddings for several texts using Bedrock Cohere English Embeddings,
+        batching them into as few requests as possible.
+
+        Args:
+            texts (list): Texts to generate embeddings for.
+            embedding_types (list, optional): Cohere embedding types to request. Default is None (float only).
+
+        Returns:
+            list | dict: One float embedding per text, in the same order, or, when embedding_types is given,
+            one such list per type. None if the request fails.
+        """
+        # Load Cohere English model ID from config
+        model_id = config.get("EMBEDDINGS_MODEL_ID")
+
+        embeddings = BedrockCohereEnglishEmbeddings(
+            model_id=model_id,
+            region_name=os.getenv("AWS_REGION")
+        )
+
+        try:
+            if embedding_types:
+                return embeddings.predict_batch_types(texts, embedding_types=embedding_types)
+            return embeddings.predict_batch(texts)
         except Exception as e:
-            print(f"Error in get_embedding: {e}")
+            logger.error(f"Error in get_embeddings: {e}")
             return None
 
-    def embed(self, attribute_name: str, overwrite: bool = True):
+    def _embed_batch(self, batch: list, embedding_field: str) -> int:
+        """Embed one batch of (_id, text) pairs and store the embeddings with a single bulk write.
+
+        Embeddings are stored as EMBEDDINGS_STORAGE_TYPE, with their write time in "<embedding_field>_updated_at".
+        When EMBEDDINGS_RESCORE_FIELD is set, a float32 copy is stored in that field too, for rescoring
+        quantized search results.
+        Every type comes from the same Bedrock request.
+
+        Args:
+            batch (list): List of (_id, text) tuples.
+            embedding_field (str): Field to store the embeddings in.
+
+        Returns:
+            int: Number of documents updated.
+        """
+        storage_type = config.get_str("EMBEDDINGS_STORAGE_TYPE", "float")
+        rescore_field = config.get_str("EMBEDDINGS_RESCORE_FIELD")
+        embedding_type = get_cohere_embedding_type(storage_type)
+        embedding_types = list(dict.fromkeys([embedding_type] + (["float"] if rescore_field else [])))
+
+        embeddings = self.get_embeddings([text for _, text in batch], embedding_types=embedding_types)
+        if not embeddings or any(len(embeddings[t]) != len(batch) for t in embedding_types):
+            logger.error(
+                f"Failed to generate embeddings for a batch of {len(batch)} documents starting with _id: {batch[0][0]}")
+            return 0
+
+        # Stamp the embeddings, so the local vector index can tell documents re-embedded in place
+        updated_at = datetime.datetime.now(datetime.timezone.utc)
+        requests = []
+        for i, (_id, _) in enumerate(batch):
+            fields = {
+                embedding_field: encode_vector(embeddings[embedding_type][i], storage_type),
+                f"{embedding_field}_updated_at": updated_at
+            }
+            if rescore_field:
+                fields[rescore_field] = encode_vector(embeddings["float"][i], "float32")
+            requests.append(UpdateOne({"_id": _id}, {"$set": fields}))
+        result = self.collection.bulk_write(requests, ordered=False)
+        return result.modified_count
+
+    def embed(self, attribute_name: str, overwrite: bool = True, batch_size: int = None, concurrency: int = None):
         """
         Generate embeddings for a specified attribute in the MongoDB collection and store them.
 
+        Texts are embedded in batches (one Bedrock request per batch) and each batch is written
+        back with a single unordered bulk_write. Up to `concurrency` batches are in flight at once.
+
         Args:
             attribute_name (str): The attribute name to generate embeddings for.
             overwrite (bool): Whether to overwrite existing embeddings. Default is True.
+            batch_size (int, optional): Texts per Bedrock request, at most 96. Default is EMBEDDINGS_BATCH_SIZE.
+            concurrency (int, optional): Number of batches processed in parallel. Default is EMBEDDINGS_CONCURRENCY.
         """
+        batch_size = min(batch_size or config.get_int("EMBEDDINGS_BATCH_SIZE", 96), BedrockCohereEnglishEmbeddings.MAX_BATCH_SIZE)
+        concurrency = concurrency or config.get_int("EMBEDDINGS_CONCURRENCY", 4)
+
         # Check if the attribute exists in the collection
         sample_doc = self.collection.find_one()
         if attribute_name not in sample_doc:
@@ -88,32 +270,45 @@ class Embedder(MongoDBConnector):
                 f"Attribute '{attribute_name}' not found in the collection.")
             return
 
+        embedding_field = f"{attribute_name}_embedding"
+        # Skip documents that already have embeddings on the server side
+        query = {attribute_name: {"$exists": True, "$nin": [None, ""]}}
+        if not overwrite:
+            query[embedding_field] = {"$exists": False}
+
         # Get the total number of documents for the progress bar
-        total_docs = self.collection.count_documents({})
-
-        # Process each document in the collection
-        for doc in tqdm(self.collection.find(), desc="Embedding documents", total=total_docs):
-            text = doc.get(attribute_name)
-            if text:
-                embedding_field = f"{attribute_name}_embedding"
-                if not overwrite and embedding_field in doc:
-                    logger.info(
-                        f"Skipping document with _id: {doc['_id']} as '{embedding_field}' already exists.")
-                    continue
-
-                embedding = self.get_embedding(text)
-                if embedding is not None:
-                    self.collection.update_one(
-                        {"_id": doc["_id"]},
-                        {"$set": {embedding_field: embedding}}
-                    )
-                else:
-                    logger.error(
-                        f"Failed to generate embedding for document with _id: {doc['_id']}")
+        total_docs = self.collection.count_documents(query)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor, \
+                tqdm(desc="Embedding documents", total=total_docs) as progress:
+            in_flight = {}
+
+            def collect(futures):
+                for future in futures:
+                    progress.update(in_flight.pop(future))
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error storing a batch of embeddings: {e}")
+
+            batch = []
+            for doc in self.collection.find(query, {attribute_name: 1}):
+                batch.append((doc["_id"], doc[attribute_name]))
+                if len(batch) == batch_size:
+                    in_flight[executor.submit(self._embed_batch, batch, embedding_field)] = len(batch)
+                    batch = []
+                    # Bound the number of pending batches so the cursor is not drained into memory
+                    if len(in_flight) >= concurrency * 2:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+            if batch:
+                in_flight[executor.submit(self._embed_batch, batch, embedding_field)] = len(batch)
+            done, _ = wait(in_flight)
+            collect(done)
 
         logger.info(
             f"Successfully embedded '{attribute_name}' in the collection.")
-        return {"status": "success", "message": "Embedding completed in attribute '{attribute_name}' for all documents."}
+        return {"status": "success", "message": f"Embedding completed in attribute '{attribute_name}' for all documents."}
 
 # ==================
 # Example usage
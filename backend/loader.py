@@ -1,6 +1,8 @@
 import os
+import csv
 import pandas as pd
 import logging
+import threading
 from db.mdb import MongoDBConnector
 from datetime import datetime
 
@@ -11,6 +13,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Parsed CSV files, keyed by absolute path: (mtime, records)
+_typed_csv_cache = {}
+_typed_csv_lock = threading.Lock()
+
+
+def resolve_filepath(filepath: str) -> str:
+    """
+    Resolve a data file path relative to this script's directory.
+
+    Args:
+        filepath (str): Relative path to the file.
+
+    Returns:
+        str: Absolute path to the file.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, filepath)
+
+
+def _convert_row(row: dict, time_field: str) -> dict:
+    """Convert a CSV row: the time field to a datetime and numeric values to floats."""
+    record = {}
+    for key, value in row.items():
+        if key == time_field:
+            try:
+                value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+            except (TypeError, ValueError) as e:
+                logger.error(f"Error parsing '{time_field}' value {value!r}: {e}")
+        else:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                pass
+        record[key] = value
+    return record
+
+
+def load_typed_records(filepath: str, time_field: str = "timestamp", delimiter: str = ',', encoding: str = 'utf-8') -> list:
+    """
+    Load a CSV file as a list of typed records, converting values once at load time.
+
+    Parsed files are cached per process and re-read only when their mtime changes, so repeated
+    calls are a dictionary lookup. The returned records are shared between callers and must not
+    be mutated in place.
+
+    Args:
+        filepath (str): Relative path to the CSV file.
+        time_field (str, optional): Field parsed as a "%Y-%m-%dT%H:%M:%SZ" datetime. Defaults to "timestamp".
+        delimiter (str, optional): Delimiter for the CSV file. Defaults to ",".
+        encoding (str, optional): Encoding for the CSV file. Defaults to "utf-8".
+
+    Returns:
+        list: Records with the time field as a datetime and numeric fields as floats.
+    """
+    path = resolve_filepath(filepath)
+    mtime = os.path.getmtime(path)
+    cached = _typed_csv_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+
+    with _typed_csv_lock:
+        cached = _typed_csv_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "r", encoding=encoding, newline="") as file:
+                reader = csv.DictReader(file, delimiter=delimiter)  # Automatically infers field names from the header row
+                records = [_convert_row(row, time_field) for row in reader]
+            cached = (mtime, records)
+            _typed_csv_cache[path] = cached
+            logger.info(f"Loaded and cached {len(records)} records from CSV file: {path}")
+    return list(cached[1])
+
+
 class CSVLoader(MongoDBConnector):
     """
     Class to handle loading CSV files into Pandas DataFrames with error handling.
@@ -35,11 +109,8 @@ class CSVLoader(MongoDBConnector):
         self.collection_name = collection_name
         self.collection = self.get_collection(self.collection_name)
 
-        # Get the directory of the current script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
         # Always treat the provided filepath as relative and join with the script's directory
-        self.filepath = os.path.join(script_dir, relative_path)
+        self.filepath = resolve_filepath(relative_path)
         
         # Check if the file exists at the resolved path
         if not os.path.exists(self.filepath):
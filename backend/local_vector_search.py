@@ -0,0 +1,353 @@
+import os
+import time
+import logging
+import threading
+
+import numpy as np
+
+from db.mdb import MongoDBConnector
+from vector_quantization import decode_vector
+from config.config_loader import ConfigLoader
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load configuration
+config = ConfigLoader()
+
+
+class LocalVectorSearchIndex(MongoDBConnector):
+    """
+    In-process vector search engine, used instead of Atlas $vectorSearch when VECTOR_SEARCH_BACKEND is "local".
+
+    The vectors of the collection are loaded into a contiguous float32 matrix of L2-normalized rows, so a
+    cosine top-k query is one matrix-vector product and an argpartition. The matrix can be backed by a
+    memory-mapped file (LOCAL_VECTOR_SEARCH_MMAP_PATH) to keep large sets out of the process heap.
+
+    The index is refreshed at most once every LOCAL_VECTOR_SEARCH_REFRESH_SECONDS, in a background thread
+    started by search(): queries never wait on MongoDB once the first load is done. A refresh compares the
+    number of vectors in the collection with the index: documents with an _id above the last loaded one are
+    fetched incrementally, and a full reload happens when the counts still differ (documents were removed,
+    embedded after newer ones, or written with out-of-order ObjectIds).
+
+    Vectors re-embedded in place do not change the count. The Embedder stamps each embedding with a
+    "<vector field>_updated_at" datetime, and a full reload happens when a loaded document carries a stamp
+    newer than any seen by the last load. Vectors written by other means are picked up by the full reload
+    done every LOCAL_VECTOR_SEARCH_FULL_RELOAD_SECONDS, when set.
+
+    Above LOCAL_VECTOR_SEARCH_ANN_MIN_SIZE vectors, an approximate inverted-file index is built with
+    k-means: queries only score the vectors of the closest clusters. Its centroids are rebuilt each time
+    the index doubles in size since the last build.
+
+    Args:
+        collection_name (str, optional): Collection name. Default is MDB_EMBEDDINGS_COLLECTION.
+        vector_field (str, optional): Vector field name. Default is MDB_EMBEDDINGS_COLLECTION_VS_FIELD.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, collection_name: str = None, vector_field: str = None, uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(uri, database_name, appname)
+        self.collection_name = collection_name or config.get("MDB_EMBEDDINGS_COLLECTION")
+        self.vector_field = vector_field or config.get("MDB_EMBEDDINGS_COLLECTION_VS_FIELD")
+        self.updated_field = f"{self.vector_field}_updated_at"
+        self.collection = self.get_collection(self.collection_name)
+
+        self.refresh_seconds = config.get_float("LOCAL_VECTOR_SEARCH_REFRESH_SECONDS", 60.0)
+        self.mmap_path = config.get_str("LOCAL_VECTOR_SEARCH_MMAP_PATH")
+        self.ann_min_size = config.get_int("LOCAL_VECTOR_SEARCH_ANN_MIN_SIZE", 50000)
+        self.full_reload_seconds = config.get_float("LOCAL_VECTOR_SEARCH_FULL_RELOAD_SECONDS", 0.0)
+
+        self._matrix = None
+        self._size = 0
+        self._documents = []
+        self._last_id = None
+        self._updated_at = None
+        self._refreshed_at = None
+        self._reloaded_at = None
+        self._centroids = None
+        self._lists = None
+        self._ann_size = 0
+        self._generation = 0
+        # _lock guards the state read by search(); _refresh_lock serializes refreshes, which do their
+        # MongoDB reads and heavy computation without _lock and only take it to publish the result.
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+
+    @classmethod
+    def get_instance(cls, collection_name: str = None, vector_field: str = None) -> "LocalVectorSearchIndex":
+        """Return the process-wide index for the given collection and vector field."""
+        collection_name = collection_name or config.get("MDB_EMBEDDINGS_COLLECTION")
+        vector_field = vector_field or config.get("MDB_EMBEDDINGS_COLLECTION_VS_FIELD")
+        key = (collection_name, vector_field)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(collection_name=collection_name, vector_field=vector_field)
+            return cls._instances[key]
+
+    def _allocate(self, capacity: int, dimensions: int) -> np.ndarray:
+        """
+        Allocate a float32 matrix, memory-mapped when LOCAL_VECTOR_SEARCH_MMAP_PATH is set.
+        Each allocation gets its own file, so the previous matrix can still be copied from.
+        """
+        if not self.mmap_path:
+            return np.empty((capacity, dimensions), dtype=np.float32)
+        self._generation += 1
+        path = f"{self.mmap_path}.{self.collection_name}.{self.vector_field}.{self._generation}.npy"
+        return np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(capacity, dimensions))
+
+    def _release(self, matrix: np.ndarray):
+        """Delete the file backing a memory-mapped matrix that is no longer used."""
+        if isinstance(matrix, np.memmap) and matrix.filename:
+            try:
+                os.remove(matrix.filename)
+            except OSError as e:
+                logger.warning(f"Could not remove memory-mapped file {matrix.filename}: {e}")
+
+    def _vector_query(self) -> dict:
+        """Filter on the documents holding a non-empty vector, shared by the counts and the reads of a refresh."""
+        return {self.vector_field: {"$ne": None, "$not": {"$size": 0}}}
+
+    def _fetch(self, query: dict) -> tuple:
+        """
+        Read the documents matching the query, in _id order.
+
+        Returns:
+            tuple: The L2-normalized vectors (None when no document matched), the documents without
+                the vector field, the last _id read, and the latest embedding stamp read (or None).
+        """
+        vectors, documents, last_id, updated_at = [], [], None, None
+        for doc in self.collection.find(query, sort=[("_id", 1)], batch_size=1000):
+            vector = doc.pop(self.vector_field, None)
+            if vector is None or not len(vector):
+                continue
+            last_id = doc["_id"]
+            stamp = doc.get(self.updated_field)
+            if stamp is not None and (updated_at is None or stamp > updated_at):
+                updated_at = stamp
+            # Decode binData vectors (float32, int8 or packed bits) stored by the Embedder
+            vectors.append(decode_vector(vector))
+            documents.append(doc)
+        if not vectors:
+            return None, documents, last_id, updated_at
+        vectors = np.stack(vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        return vectors, documents, last_id, updated_at
+
+    def _reload(self, query: dict) -> int:
+        """Load every document matching the query into a new matrix, then swap it in. Returns the number loaded."""
+        vectors, documents, last_id, updated_at = self._fetch(query)
+        matrix, centroids, lists, size = None, None, None, 0
+        if vectors is not None:
+            size = len(vectors)
+            matrix = self._allocate(max(size, 1024), vectors.shape[1])
+            matrix[:size] = vectors
+            if size >= self.ann_min_size:
+                centroids, lists = self._build_ann_index(matrix[:size])
+
+        with self._lock:
+            previous = self._matrix
+            self._matrix, self._size, self._documents, self._last_id = matrix, size, documents, last_id
+            self._updated_at = updated_at
+            self._centroids, self._lists, self._ann_size = centroids, lists, size if lists is not None else 0
+        if previous is not None:
+            self._release(previous)
+        return size
+
+    def _append(self, query: dict) -> int:
+        """
+        Append the documents matching the query. The matrix grows geometrically, so incremental refreshes
+        are amortized O(n). New rows are written past _size, which search() does not read, and are
+        published under the lock. Returns the number appended.
+        """
+        vectors, documents, last_id, updated_at = self._fetch(query)
+        if vectors is None:
+            return 0
+        size = self._size
+        needed = size + len(vectors)
+        matrix = self._matrix
+        if matrix is None or needed > len(matrix):
+            matrix = self._allocate(max(needed, 2 * size, 1024), vectors.shape[1])
+            if self._matrix is not None:
+                matrix[:size] = self._matrix[:size]
+        matrix[size:needed] = vectors
+        assignments = None
+        if self._lists is not None:
+            assignments = np.argmax(vectors @ self._centroids.T, axis=1).tolist()
+
+        with self._lock:
+            previous = self._matrix
+            self._matrix = matrix
+            if assignments is not None:
+                for row, cluster in enumerate(assignments, start=size):
+                    self._lists[cluster].append(row)
+            self._documents.extend(documents)
+            self._size, self._last_id = needed, last_id
+            if updated_at is not None and (self._updated_at is None or updated_at > self._updated_at):
+                self._updated_at = updated_at
+        if previous is not None and previous is not matrix:
+            self._release(previous)
+
+        if needed >= self.ann_min_size and (self._lists is None or needed >= 2 * self._ann_size):
+            centroids, lists = self._build_ann_index(matrix[:needed])
+            with self._lock:
+                self._centroids, self._lists, self._ann_size = centroids, lists, needed
+        return len(vectors)
+
+    def _reembedded_since_load(self) -> bool:
+        """Whether a document up to the last loaded _id was embedded after the latest stamp in the index."""
+        query = self._vector_query()
+        query[self.updated_field] = {"$gt": self._updated_at} if self._updated_at is not None else {"$exists": True}
+        if self._last_id is not None:
+            query["_id"] = {"$lte": self._last_id}
+        return self.collection.find_one(query, {"_id": 1}) is not None
+
+    def refresh(self, full: bool = False):
+        """
+        Load new vectors from MongoDB. A full reload happens on first use, when `full` is True, every
+        LOCAL_VECTOR_SEARCH_FULL_RELOAD_SECONDS when set, when loaded documents were re-embedded, or when
+        the collection and the index still hold a different number of vectors after the incremental load.
+        """
+        with self._refresh_lock:
+            base_query = self._vector_query()
+            if not full and self._reloaded_at is not None and self.full_reload_seconds:
+                full = time.monotonic() - self._reloaded_at >= self.full_reload_seconds
+            if not full and self._refreshed_at is not None and self._reembedded_since_load():
+                logger.info("Local vector index reloading: documents were re-embedded since the last load.")
+                full = True
+            if not full and self._refreshed_at is not None:
+                count = self.collection.count_documents(base_query)
+                if count < self._size:
+                    full = True
+                elif count > self._size:
+                    query = dict(base_query)
+                    if self._last_id is not None:
+                        query["_id"] = {"$gt": self._last_id}
+                    loaded = self._append(query)
+                    if loaded:
+                        logger.info(f"Local vector index refreshed with {loaded} new vectors.")
+                    # Documents embedded after newer ones, or written with an older ObjectId, are not
+                    # above the last _id: their count is still missing
+                    full = self._size < count
+            if full or self._refreshed_at is None:
+                loaded = self._reload(base_query)
+                logger.info(f"Local vector index loaded with {loaded} vectors from {self.collection_name}.")
+                self._reloaded_at = time.monotonic()
+            self._refreshed_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        """Start a refresh thread unless one is already running."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_safely, name="local-vector-search-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_safely(self):
+        """Refresh, logging errors instead of raising them in the background thread."""
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing local vector index for {self.collection_name}: {e}")
+
+    def _maybe_refresh(self):
+        """
+        Load the index on first use. Afterwards, start a background refresh when the index is older
+        than LOCAL_VECTOR_SEARCH_REFRESH_SECONDS.
+        """
+        if self._refreshed_at is None:
+            self.refresh()
+        elif time.monotonic() - self._refreshed_at >= self.refresh_seconds:
+            self._refresh_in_background()
+
+    @staticmethod
+    def _build_ann_index(vectors: np.ndarray, iterations: int = 10, sample_size: int = 100000) -> tuple:
+        """Build an inverted-file index: k-means centroids (on a sample) and the rows of each cluster."""
+        size = len(vectors)
+        n_lists = max(1, int(np.sqrt(size)))
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(size, size=min(sample_size, size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(n_lists):
+                members = sample[assignments == cluster]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1.0)
+
+        lists = [[] for _ in range(n_lists)]
+        for start in range(0, size, sample_size):
+            assignments = np.argmax(vectors[start:start + sample_size] @ centroids.T, axis=1)
+            for row, cluster in enumerate(assignments.tolist(), start=start):
+                lists[cluster].append(row)
+        logger.info(f"Approximate index built with {n_lists} clusters.")
+        return centroids, lists
+
+    def _candidate_rows(self, query: np.ndarray, num_candidates: int):
+        """Rows of the clusters closest to the query, enough to cover num_candidates. None means all rows."""
+        if self._lists is None:
+            return None
+        order = np.argsort(-(self._centroids @ query))
+        rows = []
+        for cluster in order.tolist():
+            rows.extend(self._lists[cluster])
+            if len(rows) >= num_candidates:
+                break
+        return np.asarray(rows, dtype=np.int64)
+
+    def search(self, query_vector: list, limit: int = 2, num_candidates: int = 5) -> list:
+        """
+        Return the documents whose vectors have the highest cosine similarity with the query vector.
+
+        Args:
+            query_vector (list): Query embedding.
+            limit (int, optional): Number of documents returned. Default is 2.
+            num_candidates (int, optional): Minimum number of vectors scored when the approximate index is used. Default is 5.
+
+        Returns:
+            list: Matching documents without the vector field, best match first.
+        """
+        self._maybe_refresh()
+        with self._lock:
+            if not self._size:
+                return []
+            query = np.asarray(query_vector, dtype=np.float32)
+            if query.shape != (self._matrix.shape[1],):
+                raise ValueError(f"Query vector has {query.size} dimensions, the index has {self._matrix.shape[1]}.")
+            query /= (np.linalg.norm(query) or 1.0)
+
+            rows = self._candidate_rows(query, max(num_candidates, limit))
+            scores = self._matrix[:self._size] @ query if rows is None else self._matrix[rows] @ query
+            k = min(limit, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            if rows is not None:
+                top = rows[top]
+            return [dict(self._documents[row]) for row in top.tolist()]
+
+
+# ==================
+# Example usage
+# ==================
+
+if __name__ == "__main__":
+    index = LocalVectorSearchIndex.get_instance()
+    index.refresh(full=True)
+    print(f"Vectors loaded: {index._size}")
@@ -1,25 +1,39 @@
 from db.mdb import MongoDBConnector
 
+import asyncio
+import hashlib
 import logging
 import datetime
+import uuid
+from contextlib import asynccontextmanager
 
 import json
 from bson import ObjectId
 from pydantic import BaseModel
 
 from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import APIRouter
 
 from config.config_loader import ConfigLoader
-from utils import convert_objectids, format_document
+from utils import convert_objectids, format_document, format_timeseries_records
 
-from db.mdb import MongoDBConnector
+from db.mdb import MongoDBConnector, MongoClientRegistry
 
-from agent_workflow_graph import create_workflow_graph
+from agent_workflow_graph import get_workflow_graph, get_graph_config_hash
 from agent_state import AgentState
 from agent_checkpointer import AgentCheckpointer
+from checkpoint_retention import run_checkpoint_retention_periodically
+from mdb_vector_search_idx_creator import VectorSearchIDXCreator
+from local_vector_search import LocalVectorSearchIndex
+from mdb_timeseries_coll_creator import TimeSeriesCollectionCreator
+from agent_profiles import AgentProfiles
+from mdb_cache import EmbeddingCache, LLMResponseCache
+from loader import resolve_filepath
+from single_flight import SingleFlight
+from bedrock.client import BedrockClient
 
 import os
 from dotenv import load_dotenv
@@ -39,6 +53,7 @@ MDB_AGENT_SESSIONS_COLLECTION = config.get("MDB_AGENT_SESSIONS_COLLECTION")
 MDB_EMBEDDINGS_COLLECTION = config.get("MDB_EMBEDDINGS_COLLECTION")
 MDB_EMBEDDINGS_COLLECTION_VS_FIELD = config.get("MDB_EMBEDDINGS_COLLECTION_VS_FIELD")
 MDB_TIMESERIES_COLLECTION = config.get("MDB_TIMESERIES_COLLECTION")
+MDB_TIMESERIES_TIMEFIELD = config.get("MDB_TIMESERIES_TIMEFIELD")
 MDB_LOGS_COLLECTION = config.get("MDB_LOGS_COLLECTION")
 MDB_AGENT_PROFILES_COLLECTION = config.get("MDB_AGENT_PROFILES_COLLECTION")
 AGENT_PROFILE_CHOSEN_ID = config.get("AGENT_PROFILE_CHOSEN_ID")
@@ -53,7 +68,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared MongoDB client and checkpointer, compile the workflow graph and provision collections on startup; close the shared clients on shutdown.
+    The vector search index is checked (and created if missing) in the background, so a new index
+    being built does not delay startup. With VECTOR_SEARCH_BACKEND "local", the in-process index is
+    loaded in the background instead. The checkpoint retention job runs in the background every
+    CHECKPOINT_RETENTION_INTERVAL_SECONDS, when set."""
+    MongoClientRegistry.startup(uri=MDB_URI)
+    # Create the shared checkpointer once and bind it to the compiled graph
+    get_workflow_graph(checkpointer=get_checkpointer())
+    # Provision the time series collection once, so agent runs skip the check
+    await asyncio.to_thread(
+        TimeSeriesCollectionCreator().create_timeseries_collection,
+        collection_name=MDB_TIMESERIES_COLLECTION,
+        time_field=MDB_TIMESERIES_TIMEFIELD,
+        granularity=config.get("MDB_TIMESERIES_GRANULARITY")
+    )
+    agent_profiles = AgentProfiles(collection_name=MDB_AGENT_PROFILES_COLLECTION)
+    try:
+        await asyncio.to_thread(agent_profiles.ensure_indexes)
+    except Exception as e:
+        logger.error(f"Error creating agent profile indexes: {e}")
+    for cache in (EmbeddingCache(), LLMResponseCache()):
+        try:
+            await asyncio.to_thread(cache.ensure_indexes)
+        except Exception as e:
+            logger.error(f"Error creating TTL index on '{cache.collection_name}': {e}")
+    if config.get_bool("AGENT_PROFILES_CHANGE_STREAM", False):
+        agent_profiles.start_watching()
+    if config.get_str("VECTOR_SEARCH_BACKEND", "atlas") == "local":
+        vector_search_index_task = asyncio.create_task(
+            asyncio.to_thread(LocalVectorSearchIndex.get_instance(MDB_EMBEDDINGS_COLLECTION).refresh)
+        )
+    else:
+        vector_search_index_task = asyncio.create_task(
+            asyncio.to_thread(VectorSearchIDXCreator(collection_name=MDB_EMBEDDINGS_COLLECTION).ensure_index)
+        )
+    retention_interval = config.get_float("CHECKPOINT_RETENTION_INTERVAL_SECONDS", 0.0)
+    retention_task = None
+    if retention_interval > 0:
+        retention_task = asyncio.create_task(run_checkpoint_retention_periodically(retention_interval))
+    yield
+    if retention_task is not None:
+        retention_task.cancel()
+    if not vector_search_index_task.done():
+        logger.warning("Shutting down before the vector search index was ready.")
+    AgentProfiles.stop_watching()
+    AgentCheckpointer.reset()
+    BedrockClient.close_all()
+    MongoClientRegistry.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -70,19 +136,16 @@ async def read_root(request: Request):
     return {"message": "Server is running"}
 
 
-@app.get("/run-agent")
-async def run_agent(query_reported: str = Query("Default query reported by the user", description="Query reported text")):
-    """Run the agent with the given query.
+def create_initial_state(query_reported: str) -> tuple:
+    """Create a new thread ID and the initial agent state for the given query.
 
     Args:
-        query_reported (str, optional): _description_. Defaults to Query("Default query reported by the user", description="Query reported text").
-
-    Raises:
-        HTTPException: _description_
+        query_reported (str): Query reported text.
 
     Returns:
-        _type_: _description_
+        tuple: The thread ID and the initial AgentState.
     """
+    thread_id = f"thread_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}"
     initial_state: AgentState = {
         "query_reported": query_reported,
         "chain_of_thought": "",
@@ -92,37 +155,108 @@ async def run_agent(query_reported: str = Query("Default query reported by the u
         "recommendation_text": "",
         "next_step": "reasoning_node",
         "updates": [],
-        "thread_id": ""
+        "thread_id": thread_id
     }
-    thread_id = f"thread_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    initial_state["thread_id"] = thread_id
+    return thread_id, initial_state
+
+
+async def store_session_metadata(session_metadata: dict):
+    """Insert a session document into the agent sessions collection.
+
+    Args:
+        session_metadata (dict): Session document.
+    """
+    with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector:
+        session_metadata = convert_objectids(session_metadata)
+        await mdb_connector.get_async_collection(MDB_AGENT_SESSIONS_COLLECTION).insert_one(session_metadata)
+
+
+# Identical /run-agent requests share one run while it is in flight, and for
+# AGENT_RUN_COALESCING_WINDOW_SECONDS after it started
+agent_runs = SingleFlight(window_seconds=config.get_float("AGENT_RUN_COALESCING_WINDOW_SECONDS", 0.0))
+
+
+def get_run_key(query_reported: str) -> str:
+    """Build the coalescing key of an agent run: the normalized query, the agent profile,
+    the version of the input data and the workflow graph.
+
+    Args:
+        query_reported (str): Query reported text.
+
+    Returns:
+        str: SHA-256 hex digest identifying equivalent runs.
+    """
+    try:
+        data_version = str(os.path.getmtime(resolve_filepath(config.get("CSV_DATA"))))
+    except (OSError, TypeError):
+        data_version = ""
+    parts = (
+        EmbeddingCache.normalize_text(query_reported),
+        str(config.get("AGENT_PROFILE_CHOSEN_ID")),
+        data_version,
+        get_graph_config_hash()
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_checkpointer():
+    """Return the shared async checkpointer created at startup, or None when state saving is disabled."""
+    return AgentCheckpointer(database_name=MDB_DATABASE_NAME, collection_name=MDB_CHECKPOINTER_COLLECTION).get_async_mongodb_saver()
+
+
+async def execute_workflow(thread_id: str, initial_state: AgentState) -> dict:
+    """Run the workflow graph to completion, checkpointing it when a saver is available.
+
+    Args:
+        thread_id (str): Thread ID of the run.
+        initial_state (AgentState): Initial agent state.
+
+    Returns:
+        dict: Final state, with the thread ID.
+    """
     config = {"configurable": {"thread_id": thread_id}}
+    logger.info(f"Running agent for thread ID: {thread_id}")
+    workflow = get_workflow_graph(checkpointer=get_checkpointer())
+    final_state = await workflow.ainvoke(initial_state, config=config)
+    final_state = convert_objectids(final_state)
+    final_state["timeseries_data"] = format_timeseries_records(final_state.get("timeseries_data", []), MDB_TIMESERIES_TIMEFIELD)
+    final_state["thread_id"] = thread_id
+    return final_state
+
+
+@app.get("/run-agent")
+async def run_agent(query_reported: str = Query("Default query reported by the user", description="Query reported text")):
+    """Run the agent with the given query.
+
+    Args:
+        query_reported (str, optional): _description_. Defaults to Query("Default query reported by the user", description="Query reported text").
+
+    Raises:
+        HTTPException: _description_
+
+    Returns:
+        _type_: _description_
+    """
+    thread_id, initial_state = create_initial_state(query_reported)
     try:
-        logger.info(f"Running agent for thread ID: {thread_id}")
-        mongodb_saver = AgentCheckpointer(database_name=MDB_DATABASE_NAME, collection_name=MDB_CHECKPOINTER_COLLECTION).create_mongodb_saver()
-        if mongodb_saver:
-            with mongodb_saver as checkpointer:
-                workflow = create_workflow_graph(checkpointer=checkpointer)
-                final_state = workflow.invoke(initial_state, config=config)
-                final_state = convert_objectids(final_state)
-        else:
-            workflow = create_workflow_graph()
-            final_state = workflow.invoke(initial_state, config=config)
-            final_state = convert_objectids(final_state)
-        final_state["thread_id"] = thread_id
+        # Identical concurrent requests attach to one run; each caller still records its own session
+        final_state, coalesced = await agent_runs.run(
+            get_run_key(query_reported),
+            lambda: execute_workflow(thread_id, initial_state)
+        )
+        final_state = dict(final_state)
+        thread_id = final_state["thread_id"]
         
         try:
-            with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector: 
-                session_metadata = {
-                    "thread_id": thread_id,
-                    "query_reported": query_reported,
-                    "created_at": datetime.datetime.now(datetime.timezone.utc),
-                    "status": "completed",
-                    "recommendation": final_state["recommendation_text"]
-                }
-                session_metadata = convert_objectids(session_metadata)
-                mdb_connector.insert_one(collection_name=MDB_AGENT_SESSIONS_COLLECTION, document=session_metadata)
-                return final_state
+            await store_session_metadata({
+                "thread_id": thread_id,
+                "query_reported": query_reported,
+                "created_at": datetime.datetime.now(datetime.timezone.utc),
+                "status": "completed",
+                "recommendation": final_state["recommendation_text"],
+                "coalesced": coalesced
+            })
+            return final_state
         except Exception as e:
             logger.info(f"[MongoDB] Error storing session metadata: {e}")
             return final_state
@@ -130,47 +264,203 @@ async def run_agent(query_reported: str = Query("Default query reported by the u
         logger.info(f"[Error] An error occurred during execution: {e}")
         logger.info(f"You can resume this session later using thread ID: {thread_id}")
         try:
-            with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector: 
-                session_metadata = {
-                    "thread_id": thread_id,
-                    "query_reported": query_reported,
-                    "created_at": datetime.datetime.now(datetime.timezone.utc),
-                    "status": "error",
-                    "error_message": str(e)
-                }
-                session_metadata = convert_objectids(session_metadata)
-                mdb_connector.insert_one(collection_name=MDB_AGENT_SESSIONS_COLLECTION, document=session_metadata)
-                logger.info("[MongoDB] Error state recorded in session metadata")
+            await store_session_metadata({
+                "thread_id": thread_id,
+                "query_reported": query_reported,
+                "created_at": datetime.datetime.now(datetime.timezone.utc),
+                "status": "error",
+                "error_message": str(e)
+            })
+            logger.info("[MongoDB] Error state recorded in session metadata")
         except Exception as db_error:
                 logger.info(f"[MongoDB] Error storing session error state: {db_error}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def format_sse(event: str, data) -> str:
+    """Format a server-sent event.
+
+    Args:
+        event (str): Event name.
+        data (Any): JSON-serializable event payload.
+
+    Returns:
+        str: The encoded event.
+    """
+    return f"event: {event}\ndata: {json.dumps(convert_objectids(data), default=str)}\n\n"
+
+
+# State fields forwarded to the client when a node updates them. Large fields such as
+# the embedding vector or the time-series data are left out of the stream.
+STREAMED_STATE_FIELDS = ("chain_of_thought", "historical_recommendations_list", "recommendation_text")
+
+
+@app.get("/run-agent-stream")
+async def run_agent_stream(query_reported: str = Query("Default query reported by the user", description="Query reported text")):
+    """Run the agent with the given query and stream its progress as server-sent events.
+
+    Events:
+        start: {"thread_id"} once the run is created.
+        node: {"node", "updates", ...} when a node completes, with its new update messages and
+            any of the STREAMED_STATE_FIELDS it changed.
+        token: {"node", "text"} for LLM text emitted by a node as it arrives.
+        end: {"thread_id", "status", "recommendation_text"} when the run completes.
+        error: {"thread_id", "status", "error_message"} if the run fails.
+
+    Args:
+        query_reported (str, optional): Query reported text.
+
+    Returns:
+        StreamingResponse: text/event-stream response.
+    """
+    thread_id, initial_state = create_initial_state(query_reported)
+    config = {"configurable": {"thread_id": thread_id}}
+
+    result = {"recommendation_text": ""}
+
+    async def stream_workflow(workflow):
+        async for mode, chunk in workflow.astream(initial_state, config=config, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield format_sse(chunk.get("event", "token"), chunk)
+                continue
+            for node, output in chunk.items():
+                output = output or {}
+                event = {"node": node, "updates": output.get("updates", [])}
+                for field in STREAMED_STATE_FIELDS:
+                    if output.get(field):
+                        event[field] = output[field]
+                if output.get("recommendation_text"):
+                    result["recommendation_text"] = output["recommendation_text"]
+                yield format_sse("node", event)
+
+    async def event_stream():
+        logger.info(f"Streaming agent run for thread ID: {thread_id}")
+        yield format_sse("start", {"thread_id": thread_id})
+        try:
+            async for message in stream_workflow(get_workflow_graph(checkpointer=get_checkpointer())):
+                yield message
+        except Exception as e:
+            logger.info(f"[Error] An error occurred during execution: {e}")
+            logger.info(f"You can resume this session later using thread ID: {thread_id}")
+            session_metadata = {
+                "thread_id": thread_id,
+                "query_reported": query_reported,
+                "created_at": datetime.datetime.now(datetime.timezone.utc),
+                "status": "error",
+                "error_message": str(e)
+            }
+            yield format_sse("error", {"thread_id": thread_id, "status": "error", "error_message": str(e)})
+        else:
+            session_metadata = {
+                "thread_id": thread_id,
+                "query_reported": query_reported,
+                "created_at": datetime.datetime.now(datetime.timezone.utc),
+                "status": "completed",
+                "recommendation": result["recommendation_text"]
+            }
+            yield format_sse("end", {"thread_id": thread_id, "status": "completed", "recommendation_text": result["recommendation_text"]})
+        try:
+            await store_session_metadata(session_metadata)
+        except Exception as db_error:
+            logger.info(f"[MongoDB] Error storing session metadata: {db_error}")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def resume_workflow(thread_id: str):
+    """Continue a run from its latest checkpoint. Nodes completed before that checkpoint are not run again.
+
+    Args:
+        thread_id (str): Thread ID of the run.
+
+    Returns:
+        tuple: The final state, with the thread ID, and whether any node was run. None if the thread has no checkpoint.
+    """
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        return None
+    config = {"configurable": {"thread_id": thread_id}}
+    workflow = get_workflow_graph(checkpointer=checkpointer)
+    snapshot = await workflow.aget_state(config)
+    if snapshot.created_at is None:
+        return None
+    if snapshot.next:
+        logger.info(f"Resuming agent for thread ID: {thread_id} at nodes: {', '.join(snapshot.next)}")
+        final_state = await workflow.ainvoke(None, config=config)
+    else:
+        logger.info(f"Thread ID: {thread_id} has no pending nodes. Returning its last state.")
+        final_state = snapshot.values
+    final_state = convert_objectids(dict(final_state))
+    final_state["timeseries_data"] = format_timeseries_records(final_state.get("timeseries_data", []), MDB_TIMESERIES_TIMEFIELD)
+    final_state["thread_id"] = thread_id
+    return final_state, bool(snapshot.next)
+
+
+async def update_session_metadata(thread_id: str, fields: dict):
+    """Update the session documents of a thread.
+
+    Args:
+        thread_id (str): Thread ID of the run.
+        fields (dict): Fields to set.
+    """
+    with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector:
+        await mdb_connector.get_async_collection(MDB_AGENT_SESSIONS_COLLECTION).update_many(
+            {"thread_id": thread_id}, {"$set": convert_objectids(fields)}
+        )
+
+
 @app.get("/resume-agent")
 async def resume_agent(thread_id: str = Query(..., description="Thread ID to resume session")):
-    """Resume the agent with the given thread ID. 
-    
+    """Resume the agent run with the given thread ID from its latest checkpoint.
+
+    The pending nodes of the run are executed (e.g. only the recommendation node if it failed)
+    and the final state is returned, as with /run-agent. A run that already completed returns
+    its last state. Without a checkpoint, the session document is returned.
+
     Args:
-        thread_id (str, optional): Thread ID to resume session. Defaults to Query(..., description="Thread ID to resume session").
+        thread_id (str): Thread ID to resume session.
 
     Raises:
-        HTTPException: _description_
-    
+        HTTPException: 404 if the thread has neither a checkpoint nor a session, 500 if the resumed run fails.
+
     Returns:
-        session: The session to resume.
+        dict: The final state of the run, or the session document.
     """
+    try:
+        # Concurrent resumes of the same thread share one run
+        resumed, _ = await agent_runs.run(f"resume:{thread_id}", lambda: resume_workflow(thread_id))
+    except Exception as e:
+        logger.info(f"[Error] An error occurred while resuming thread ID {thread_id}: {e}")
+        try:
+            await update_session_metadata(thread_id, {"status": "error", "error_message": str(e)})
+        except Exception as db_error:
+            logger.info(f"[MongoDB] Error storing session error state: {db_error}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if resumed is not None:
+        final_state, ran = resumed
+        final_state = dict(final_state)
+        if ran:
+            try:
+                await update_session_metadata(thread_id, {
+                    "status": "completed",
+                    "recommendation": final_state.get("recommendation_text", ""),
+                    "resumed_at": datetime.datetime.now(datetime.timezone.utc)
+                })
+            except Exception as e:
+                logger.info(f"[MongoDB] Error storing session metadata: {e}")
+        return final_state
+
     try:
         with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector: 
-            mdb_sessions_collection = mdb_connector.get_collection(MDB_AGENT_SESSIONS_COLLECTION)
-            logger.info(f"Resuming agent for thread ID: {thread_id}")
-            session = mdb_sessions_collection.find_one({"thread_id": thread_id})
-        if session:
-            session = convert_objectids(session)
-            return session
-        else:
-            raise HTTPException(status_code=404, detail="Session not found")
+            mdb_sessions_collection = mdb_connector.get_async_collection(MDB_AGENT_SESSIONS_COLLECTION)
+            logger.info(f"No checkpoint found for thread ID: {thread_id}. Returning its session.")
+            session = await mdb_sessions_collection.find_one({"thread_id": thread_id})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if session:
+        return convert_objectids(session)
+    raise HTTPException(status_code=404, detail="Session not found")
     
 
 @app.get("/get-sessions")
@@ -185,8 +475,8 @@ async def get_sessions():
     """
     try:
         with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector:
-            mdb_sessions_collection = mdb_connector.get_collection(MDB_AGENT_SESSIONS_COLLECTION)
-            sessions = list(mdb_sessions_collection.find().sort("created_at", -1).limit(10))
+            mdb_sessions_collection = mdb_connector.get_async_collection(MDB_AGENT_SESSIONS_COLLECTION)
+            sessions = await mdb_sessions_collection.find().sort("created_at", -1).limit(10).to_list(length=10)
         sessions = convert_objectids(sessions)
         return sessions
     except Exception as e:
@@ -212,35 +502,35 @@ async def get_run_documents(thread_id: str = Query(..., description="Thread ID o
         # Retrieve documents
         logger.info(f"Retrieving documents for thread ID: {thread_id}")
         with MongoDBConnector(uri=MDB_URI, database_name=MDB_DATABASE_NAME) as mdb_connector:
-            mdb_historical_recommendations_collection = mdb_connector.get_collection(MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION)
-            mdb_agent_sessions_collection = mdb_connector.get_collection(MDB_AGENT_SESSIONS_COLLECTION)
-            mdb_timeseries_collection = mdb_connector.get_collection(MDB_TIMESERIES_COLLECTION)
-            mdb_logs_collection = mdb_connector.get_collection(MDB_LOGS_COLLECTION)
-            mdb_agent_profiles_collection = mdb_connector.get_collection(MDB_AGENT_PROFILES_COLLECTION)
-            mdb_embeddings_collection = mdb_connector.get_collection(MDB_EMBEDDINGS_COLLECTION)
-            mdb_checkpoint_collection = mdb_connector.get_collection(MDB_CHECKPOINTER_COLLECTION)
+            mdb_historical_recommendations_collection = mdb_connector.get_async_collection(MDB_HISTORICAL_RECOMMENDATIONS_COLLECTION)
+            mdb_agent_sessions_collection = mdb_connector.get_async_collection(MDB_AGENT_SESSIONS_COLLECTION)
+            mdb_timeseries_collection = mdb_connector.get_async_collection(MDB_TIMESERIES_COLLECTION)
+            mdb_logs_collection = mdb_connector.get_async_collection(MDB_LOGS_COLLECTION)
+            mdb_agent_profiles_collection = mdb_connector.get_async_collection(MDB_AGENT_PROFILES_COLLECTION)
+            mdb_embeddings_collection = mdb_connector.get_async_collection(MDB_EMBEDDINGS_COLLECTION)
+            mdb_checkpoint_collection = mdb_connector.get_async_collection(MDB_CHECKPOINTER_COLLECTION)
         
             # Retrieve agent_sessions document
-            session = mdb_agent_sessions_collection.find_one(query)
+            session = await mdb_agent_sessions_collection.find_one(query)
 
             # Retrieve historical_recommendations for the run
-            historical = mdb_historical_recommendations_collection.find_one(query)
+            historical = await mdb_historical_recommendations_collection.find_one(query)
 
             # Retrieve 3 timeseries data points
-            timeseries = list(mdb_timeseries_collection.find().limit(3))
+            timeseries = await mdb_timeseries_collection.find().limit(3).to_list(length=3)
 
             # Retrieve logs for the run
-            log = mdb_logs_collection.find_one(query)
+            log = await mdb_logs_collection.find_one(query)
 
             # Retrieve the agent profile
             chosen_agent_id = AGENT_PROFILE_CHOSEN_ID or "DEFAULT"
-            profile = mdb_agent_profiles_collection.find_one({"agent_id": chosen_agent_id})
+            profile = await mdb_agent_profiles_collection.find_one({"agent_id": chosen_agent_id})
 
             # Retrieve 3 queries from the embeddings collection
-            queries = list(mdb_embeddings_collection.find().limit(3))
+            queries = await mdb_embeddings_collection.find().limit(3).to_list(length=3)
 
             # Retrieve the last checkpoint
-            last_checkpoint = mdb_checkpoint_collection.find_one(query)
+            last_checkpoint = await mdb_checkpoint_collection.find_one(query)
         
         logger.info(f"Formatting documents for thread ID: {thread_id}")
         # Format the documents
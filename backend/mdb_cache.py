@@ -0,0 +1,251 @@
+import json
+import time
+import hashlib
+import logging
+import datetime
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+from pymongo import ASCENDING
+
+from db.mdb import MongoDBConnector
+from config.config_loader import ConfigLoader
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load configuration
+config = ConfigLoader()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with an optional per-entry TTL.
+
+    Args:
+        maxsize (int): Maximum number of entries kept. Default is 1024.
+        ttl_seconds (int, optional): Entry lifetime in seconds. Default is None (no expiry).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for the key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry when the cache is full."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class MongoDBCache(MongoDBConnector):
+    """Two-tier key/value cache: an in-process LRU in front of a MongoDB collection with a TTL index.
+
+    Entries are stored as {"_id": key, "value": ..., "created_at": ...}. The LRU is shared by every
+    instance pointing at the same collection, so constructing a MongoDBCache per call is cheap.
+    MongoDB errors are logged and treated as cache misses; they never fail the caller.
+
+    Args:
+        collection_name (str): Collection name.
+        ttl_seconds (int, optional): Entry lifetime in seconds, in both tiers. Default is None (no expiry).
+        lru_size (int, optional): Maximum number of entries kept in process. Default is 1024.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    _lrus = {}
+    _lock = threading.Lock()
+
+    def __init__(self, collection_name: str, ttl_seconds: int = None, lru_size: int = 1024,
+                 uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(uri, database_name, appname)
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self.collection = self.get_collection(self.collection_name)
+
+        cache_id = (self.database_name, self.collection_name)
+        with MongoDBCache._lock:
+            if cache_id not in MongoDBCache._lrus:
+                MongoDBCache._lrus[cache_id] = LRUCache(maxsize=lru_size, ttl_seconds=ttl_seconds)
+            self.lru = MongoDBCache._lrus[cache_id]
+
+    def ensure_indexes(self):
+        """Ensure the TTL index on created_at, when a TTL is set. Meant to be called from a startup or admin routine."""
+        if not self.ttl_seconds:
+            return
+        self.collection.create_index([("created_at", ASCENDING)], expireAfterSeconds=self.ttl_seconds)
+        logger.info(f"TTL index on created_at ensured for collection: {self.collection_name}")
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key as the SHA-256 hex digest of the given parts."""
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Look the key up in process first, then in MongoDB.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Any: Cached value, or None on a miss.
+        """
+        value = self.lru.get(key)
+        if value is not None:
+            return value
+        try:
+            doc = self.collection.find_one({"_id": key}, {"value": 1})
+        except Exception as e:
+            logger.error(f"Error reading cache entry from '{self.collection_name}': {e}")
+            return None
+        if doc is None:
+            return None
+        self.lru.set(key, doc["value"])
+        return doc["value"]
+
+    def set(self, key: str, value: Any, **metadata):
+        """Store a value in both tiers.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Value to cache.
+            **metadata: Extra fields stored alongside the value in MongoDB (e.g., model_id).
+        """
+        self.lru.set(key, value)
+        try:
+            self.collection.update_one(
+                {"_id": key},
+                {"$set": {"value": value, "created_at": datetime.datetime.now(datetime.timezone.utc), **metadata}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error writing cache entry to '{self.collection_name}': {e}")
+
+    async def aget(self, key: str) -> Any:
+        """Async variant of get. The MongoDB lookup runs on the shared asyncio client."""
+        value = self.lru.get(key)
+        if value is not None:
+            return value
+        try:
+            doc = await self.get_async_collection(self.collection_name).find_one({"_id": key}, {"value": 1})
+        except Exception as e:
+            logger.error(f"Error reading cache entry from '{self.collection_name}': {e}")
+            return None
+        if doc is None:
+            return None
+        self.lru.set(key, doc["value"])
+        return doc["value"]
+
+    async def aset(self, key: str, value: Any, **metadata):
+        """Async variant of set. The MongoDB write runs on the shared asyncio client."""
+        self.lru.set(key, value)
+        try:
+            await self.get_async_collection(self.collection_name).update_one(
+                {"_id": key},
+                {"$set": {"value": value, "created_at": datetime.datetime.now(datetime.timezone.utc), **metadata}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error writing cache entry to '{self.collection_name}': {e}")
+
+
+class EmbeddingCache(MongoDBCache):
+    """Cache of text embeddings keyed by a hash of the model ID and the normalized text.
+
+    Args:
+        collection_name (str, optional): Collection name. Default is MDB_EMBEDDINGS_CACHE_COLLECTION.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    def __init__(self, collection_name: str = None, uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(
+            collection_name=collection_name or config.get("MDB_EMBEDDINGS_CACHE_COLLECTION", "embeddings_cache"),
+            ttl_seconds=config.get_int("EMBEDDINGS_CACHE_TTL_SECONDS"),
+            lru_size=config.get_int("EMBEDDINGS_CACHE_LRU_SIZE", 1024),
+            uri=uri,
+            database_name=database_name,
+            appname=appname
+        )
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different inputs share an entry (Unicode form, case and whitespace)."""
+        return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+    def embedding_key(self, text: str, model_id: str) -> str:
+        """Build the cache key for a text and embedding model."""
+        return self.make_key(model_id, self.normalize_text(text))
+
+
+class LLMResponseCache(MongoDBCache):
+    """Exact-match cache of LLM completions keyed by a hash of the model ID, request parameters and prompt.
+
+    Args:
+        collection_name (str, optional): Collection name. Default is MDB_LLM_CACHE_COLLECTION.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    def __init__(self, collection_name: str = None, uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(
+            collection_name=collection_name or config.get("MDB_LLM_CACHE_COLLECTION", "llm_cache"),
+            ttl_seconds=config.get_int("LLM_CACHE_TTL_SECONDS"),
+            lru_size=config.get_int("LLM_CACHE_LRU_SIZE", 256),
+            uri=uri,
+            database_name=database_name,
+            appname=appname
+        )
+
+    def response_key(self, model_id: str, params: dict, prompt: str) -> str:
+        """Build the cache key for a model, its request parameters and a prompt."""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return self.make_key(model_id, json.dumps(params, sort_keys=True), prompt_hash)
+
+
+# ==================
+# Example usage
+# ==================
+
+if __name__ == "__main__":
+    cache = EmbeddingCache()
+    cache.ensure_indexes()
+    key = cache.embedding_key("GDP growth slowing", config.get("EMBEDDINGS_MODEL_ID"))
+    print(f"Cache key: {key}")
+    print(f"Cached embedding found: {cache.get(key) is not None}")
@@ -1,10 +1,11 @@
 from pymongo import ASCENDING
-from pymongo.errors import CollectionInvalid
+from pymongo.errors import CollectionInvalid, OperationFailure
 from bson.codec_options import CodecOptions
 from bson.datetime_ms import DatetimeConversion
 from db.mdb import MongoDBConnector
 
 import logging
+import threading
 
 import os
 from dotenv import load_dotenv
@@ -19,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# MongoDB error code returned by the create command when the collection already exists
+NAMESPACE_EXISTS = 48
+
 
 class TimeSeriesCollectionCreator(MongoDBConnector):
     """Class to create a time series collection in MongoDB.
@@ -28,13 +32,37 @@ class TimeSeriesCollectionCreator(MongoDBConnector):
         database_name (str, optional): Database name. Default parent class value.
         appname (str, optional): Application name. Default parent class value.
     """
+    # (database, collection) pairs known to exist in this process, so provisioning hits the server once
+    _known_collections = set()
+    _lock = threading.Lock()
+
     def __init__(self, uri=None, database_name=None, appname=None):
         super().__init__(uri, database_name, appname)
 
+    @classmethod
+    def is_known(cls, database_name: str, collection_name: str) -> bool:
+        """Whether the collection is known to exist in this process, without contacting the server."""
+        return (database_name, collection_name) in cls._known_collections
+
+    @classmethod
+    def forget(cls, database_name: str, collection_name: str):
+        """Drop a collection from the known collections, e.g. after a NamespaceNotFound error."""
+        with cls._lock:
+            cls._known_collections.discard((database_name, collection_name))
+
+    def _remember(self, collection_name: str):
+        """Record that the collection exists."""
+        with TimeSeriesCollectionCreator._lock:
+            TimeSeriesCollectionCreator._known_collections.add((self.database_name, collection_name))
+
     def create_timeseries_collection(self, collection_name: str, time_field: str, granularity: str = "minutes", expire_after_seconds=None) -> dict:
         """
         Create a time series collection if it doesn't exist.
 
+        Collections created or found here are remembered for the life of the process, so
+        later calls return without contacting the server. The collection is created directly
+        and an existing one is detected from the server error, so no catalog listing is needed.
+
         Args:
             collection_name (str): Collection name.
             time_field (str): Time field.
@@ -47,8 +75,7 @@ class TimeSeriesCollectionCreator(MongoDBConnector):
         codec_options = CodecOptions(
             datetime_conversion=DatetimeConversion.DATETIME_AUTO)
 
-        if collection_name in self.db.list_collection_names():
-            logger.info(f"The '{collection_name}' collection already exists.")
+        if self.is_known(self.database_name, collection_name):
             return {"status": "collection_exists", "collection_name": collection_name, "message": f"The '{collection_name}' collection already exists"}
 
         try:
@@ -62,18 +89,29 @@ class TimeSeriesCollectionCreator(MongoDBConnector):
             if expire_after_seconds is not None:
                 collection_options['expireAfterSeconds'] = expire_after_seconds
 
+            # check_exists=False skips pymongo's listCollections call before the create command
             self.db.create_collection(
                 collection_name,
+                check_exists=False,
                 **collection_options
             )
             self.db[collection_name].create_index(
                 [(time_field, ASCENDING)]
             )
+            self._remember(collection_name)
             logger.info(f"Time series collection '{collection_name}' and index created successfully.")
             return {"status": "collection_created", "collection_name": collection_name, "message": f"Time series collection '{collection_name}' and index created successfully"}
         except CollectionInvalid:
-            logger.error(f"Time series collection '{collection_name}' already exists.")
-            return {"status": "collection_exists", "collection_name": collection_name, "message": f"The '{collection_name}' collection already exists"} 
+            self._remember(collection_name)
+            logger.info(f"The '{collection_name}' collection already exists.")
+            return {"status": "collection_exists", "collection_name": collection_name, "message": f"The '{collection_name}' collection already exists"}
+        except OperationFailure as e:
+            if e.code != NAMESPACE_EXISTS:
+                logger.error(f"An error occurred while creating the time series collection: {e}")
+                return {"status": "error", "collection_name": collection_name, "message": f"An error occurred while creating the time series collection: {e}"}
+            self._remember(collection_name)
+            logger.info(f"The '{collection_name}' collection already exists.")
+            return {"status": "collection_exists", "collection_name": collection_name, "message": f"The '{collection_name}' collection already exists"}
         except Exception as e:
             logger.error(f"An error occurred while creating the time series collection: {e}")
             return {"status": "error", "collection_name": collection_name, "message": f"An error occurred while creating the time series collection: {e}"}
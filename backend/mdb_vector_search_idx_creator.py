@@ -1,5 +1,7 @@
 import os
+import time
 import logging
+import threading
 from dotenv import load_dotenv
 from pymongo.errors import OperationFailure
 
@@ -22,7 +24,14 @@ MDB_EMBEDDINGS_COLLECTION = config.get("MDB_EMBEDDINGS_COLLECTION")
 MDB_VS_INDEX = config.get("MDB_VS_INDEX")
 MDB_EMBEDDINGS_COLLECTION_VS_FIELD = config.get("MDB_EMBEDDINGS_COLLECTION_VS_FIELD")
 
+# Automatic quantization modes accepted by Atlas Vector Search for float vectors
+INDEX_QUANTIZATION_TYPES = ("none", "scalar", "binary")
+
 class VectorSearchIDXCreator(MongoDBConnector):
+    # (database, collection, index name) of the indexes known to be queryable in this process
+    _ready = set()
+    _lock = threading.Lock()
+
     def __init__(self, collection_name: str = MDB_EMBEDDINGS_COLLECTION, uri=None, database_name: str = None, appname: str = None):
         """ VectorSearchIDXCreator class to create a vector search index in MongoDB. """
         super().__init__(uri, database_name, appname)
@@ -30,7 +39,36 @@ class VectorSearchIDXCreator(MongoDBConnector):
         self.collection = self.get_collection(self.collection_name)
         logger.info("VectorSearchIDXCreator initialized")
 
-    def create_index(self, index_name: str = MDB_VS_INDEX, vector_field: str = MDB_EMBEDDINGS_COLLECTION_VS_FIELD, dimensions: int = 1024, similarity_metric: str = "cosine") -> dict:
+    @staticmethod
+    def _vector_field_definition(vector_field: str, dimensions: int, similarity_metric: str, quantization: str = None) -> dict:
+        """
+        Builds the vector field definition of the index for the configured EMBEDDINGS_STORAGE_TYPE.
+
+        Float vectors can be quantized by Atlas ("scalar" or "binary"). Vectors already stored as
+        int8 or packed bits are not quantized again, and packed bits only support euclidean similarity.
+        """
+        storage_type = config.get_str("EMBEDDINGS_STORAGE_TYPE", "float")
+        quantization = quantization or config.get_str("MDB_VS_INDEX_QUANTIZATION", "none")
+        if quantization not in INDEX_QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown index quantization '{quantization}'. Expected one of: {', '.join(INDEX_QUANTIZATION_TYPES)}.")
+
+        field = {
+            "path": vector_field,
+            "type": "vector",
+            "numDimensions": dimensions,
+            "similarity": similarity_metric
+        }
+        if storage_type == "binary" and similarity_metric != "euclidean":
+            logger.warning(f"Binary vectors only support euclidean similarity, using it instead of {similarity_metric}.")
+            field["similarity"] = "euclidean"
+        if quantization != "none":
+            if storage_type in ("int8", "binary"):
+                logger.warning(f"Vectors are stored as {storage_type}, ignoring index quantization '{quantization}'.")
+            else:
+                field["quantization"] = quantization
+        return field
+
+    def create_index(self, index_name: str = MDB_VS_INDEX, vector_field: str = MDB_EMBEDDINGS_COLLECTION_VS_FIELD, dimensions: int = 1024, similarity_metric: str = "cosine", quantization: str = None) -> dict:
         """
         Creates a vector search index on the MongoDB collection.
 
@@ -39,6 +77,7 @@ class VectorSearchIDXCreator(MongoDBConnector):
             vector_field (str, optional): Vector field name. Default is MDB_EMBEDDINGS_COLLECTION_VS_FIELD.
             dimensions (int, optional): Number of dimensions. Default is 1024.
             similarity_metric (str, optional): Similarity metric. Default is "cosine".
+            quantization (str, optional): "none", "scalar" or "binary". Default is MDB_VS_INDEX_QUANTIZATION.
 
         Returns:
             dict: Index creation result
@@ -48,19 +87,19 @@ class VectorSearchIDXCreator(MongoDBConnector):
         logger.info(f"Dimensions: {dimensions}")
         logger.info(f"Similarity Metric: {similarity_metric}")
 
+        try:
+            field = self._vector_field_definition(vector_field, dimensions, similarity_metric, quantization)
+        except ValueError as e:
+            logger.error(f"Error creating vector search index: {e}")
+            return {"status": "error", "message": f"Error creating vector search index: {e}"}
+        logger.info(f"Quantization: {field.get('quantization', 'none')}")
+
         # Define the vector search index configuration
         index_config = {
             "name": index_name,
             "type": "vectorSearch",
             "definition": {
-                "fields": [
-                    {
-                        "path": vector_field,
-                        "type": "vector",
-                        "numDimensions": dimensions,
-                        "similarity": similarity_metric
-                    }
-                ]
+                "fields": [field]
             }
         }
 
@@ -80,8 +119,60 @@ class VectorSearchIDXCreator(MongoDBConnector):
             logger.error(f"Error creating vector search index: {e}")
             return {"status": "error", "message": f"Error creating vector search index: {e}"}
 
+    def _get_search_index(self, index_name: str):
+        """Returns the search index definition with the given name, or None if it does not exist."""
+        return next(iter(self.collection.list_search_indexes(index_name)), None)
+
+    def ensure_index(self, index_name: str = MDB_VS_INDEX, vector_field: str = MDB_EMBEDDINGS_COLLECTION_VS_FIELD, dimensions: int = 1024, similarity_metric: str = "cosine", quantization: str = None, timeout: float = 300, poll_interval: float = 5) -> dict:
+        """
+        Makes sure the vector search index exists and is queryable. Meant to be called from
+        a startup or admin routine, not from the query path.
+
+        Lists the search indexes, creates the index if it is missing and waits until it is
+        queryable. Once it is, the result is cached for the life of the process and later
+        calls return without contacting MongoDB.
+
+        Args:
+            index_name (str, optional): Index name. Default is MDB_VS_INDEX.
+            vector_field (str, optional): Vector field name. Default is MDB_EMBEDDINGS_COLLECTION_VS_FIELD.
+            dimensions (int, optional): Number of dimensions. Default is 1024.
+            similarity_metric (str, optional): Similarity metric. Default is "cosine".
+            quantization (str, optional): "none", "scalar" or "binary", used if the index is created. Default is MDB_VS_INDEX_QUANTIZATION.
+            timeout (float, optional): Seconds to wait for the index to become queryable. Default is 300.
+            poll_interval (float, optional): Seconds between status checks. Default is 5.
+
+        Returns:
+            dict: Index status
+        """
+        key = (self.database_name, self.collection_name, index_name)
+        if key in VectorSearchIDXCreator._ready:
+            return {"status": "ready", "message": f"Vector search index '{index_name}' is queryable."}
+
+        try:
+            index = self._get_search_index(index_name)
+            if index is None:
+                result = self.create_index(index_name, vector_field, dimensions, similarity_metric, quantization)
+                if result["status"] == "error":
+                    return result
+
+            deadline = time.monotonic() + timeout
+            while index is None or not index.get("queryable"):
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Vector search index '{index_name}' is not queryable after {timeout} seconds.")
+                    return {"status": "pending", "message": f"Vector search index '{index_name}' is not queryable yet."}
+                time.sleep(poll_interval)
+                index = self._get_search_index(index_name)
+        except Exception as e:
+            logger.error(f"Error checking vector search index: {e}")
+            return {"status": "error", "message": f"Error checking vector search index: {e}"}
+
+        with VectorSearchIDXCreator._lock:
+            VectorSearchIDXCreator._ready.add(key)
+        logger.info(f"Vector search index '{index_name}' is queryable.")
+        return {"status": "ready", "message": f"Vector search index '{index_name}' is queryable."}
+
 # Example usage
 if __name__ == "__main__":
     vs_idx = VectorSearchIDXCreator()
-    r = vs_idx.create_index()
+    r = vs_idx.ensure_index()
     print(r)
\ No newline at end of file
@@ -0,0 +1,72 @@
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Tuple
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent async calls into a single execution.
+
+    The first call for a key (the leader) starts the work as a task. Calls with the same key
+    that arrive while it is in flight, or less than `window_seconds` after it started, attach
+    to that task and share its result or exception instead of starting their own. A failed call
+    is never shared with calls arriving after it failed.
+
+    The work runs as its own task, so a caller going away does not cancel it for the others.
+    Meant to be used from a single event loop.
+
+    Args:
+        window_seconds (float, optional): How long a started call can be joined once it completed. Default is 0 (in flight only).
+    """
+
+    def __init__(self, window_seconds: float = 0.0):
+        self.window_seconds = window_seconds
+        self._calls = {}
+
+    def _evict(self, now: float):
+        """Drop completed calls older than the coalescing window."""
+        expired = [
+            key for key, (task, started_at) in self._calls.items()
+            if task.done() and now - started_at >= self.window_seconds
+        ]
+        for key in expired:
+            del self._calls[key]
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        """Forget failed calls right away, so later identical calls retry the work."""
+        failed = task.cancelled() or task.exception() is not None
+        call = self._calls.get(key)
+        if call is not None and call[0] is task and (failed or self.window_seconds <= 0):
+            del self._calls[key]
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run func() once for all concurrent callers with the same key.
+
+        Args:
+            key (str): Coalescing key.
+            func (Callable): Zero-argument coroutine function doing the work.
+
+        Returns:
+            tuple: The result, and whether it was shared from another caller's run.
+        """
+        now = time.monotonic()
+        self._evict(now)
+        call = self._calls.get(key)
+        shared = call is not None
+        if shared:
+            task = call[0]
+            logger.info(f"Coalescing request with the in-flight run for key: {key[:12]}")
+        else:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = (task, now)
+            task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+        return await asyncio.shield(task), shared
@@ -0,0 +1,404 @@
+import hashlib
+import logging
+import datetime
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+from db.mdb import MongoDBConnector
+from mdb_cache import LRUCache
+from config.config_loader import ConfigLoader
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Load configuration
+config = ConfigLoader()
+
+# Key of the placeholder stored in a checkpoint instead of an externalized value
+BLOB_REF_KEY = "__checkpoint_blob__"
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Whether a stored value is a reference to an externalized blob."""
+    return isinstance(value, dict) and len(value) == 1 and BLOB_REF_KEY in value
+
+
+class CheckpointBlobStore(MongoDBConnector):
+    """
+    Content-addressed store for large checkpoint values.
+
+    Each value is serialized with the checkpointer serializer and stored once under the SHA-256
+    of its serialized bytes, so a value that does not change between checkpoints is written once
+    per run, or once overall if it is identical across runs.
+
+    Each blob lists the threads referencing it (thread_ids). release() removes threads from
+    that list, and deletes the blobs no thread references anymore.
+
+    Args:
+        collection_name (str): Blob collection name.
+        serde: Serializer of the wrapped checkpointer.
+        uri (str, optional): MongoDB URI. Default parent class value.
+        database_name (str, optional): Database name. Default parent class value.
+        appname (str, optional): Application name. Default parent class value.
+    """
+
+    # Serialized blobs by hash. Blobs never change, so they can be cached without invalidation.
+    _blobs = LRUCache(maxsize=256)
+    # (thread_id, hash) pairs already recorded by this process, so a blob is only written once per thread
+    _references = LRUCache(maxsize=10000)
+
+    def __init__(self, collection_name: str, serde, uri: str = None, database_name: str = None, appname: str = None):
+        super().__init__(uri, database_name, appname)
+        self.collection_name = collection_name
+        self.collection = self.get_collection(self.collection_name)
+        self.serde = serde
+
+    def _serialize(self, value: Any) -> Tuple[str, dict]:
+        """Serialize a value and return its hash and the blob document."""
+        type_, data = self.serde.dumps_typed(value)
+        blob_hash = hashlib.sha256(type_.encode("utf-8") + b"\x1f" + data).hexdigest()
+        return blob_hash, {"_id": blob_hash, "type": type_, "value": data}
+
+    def ensure_indexes(self):
+        """Create the index release() looks blobs up by thread with."""
+        self.collection.create_index([("thread_ids", ASCENDING)])
+
+    def _new_blobs(self, values: list, thread_id: str) -> Tuple[list, list]:
+        """Return the references to the values, and the blob documents not recorded for the thread by this process yet."""
+        refs, documents = [], {}
+        for value in values:
+            blob_hash, document = self._serialize(value)
+            refs.append({BLOB_REF_KEY: blob_hash})
+            if CheckpointBlobStore._references.get((thread_id, blob_hash)) is None:
+                documents[blob_hash] = document
+        return refs, list(documents.values())
+
+    @staticmethod
+    def _upsert(document: dict, thread_id: str) -> Tuple[dict, dict]:
+        """Filter and update inserting a new blob with its creation date, and adding the thread to its references."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return {"_id": document["_id"]}, {
+            "$setOnInsert": {"type": document["type"], "value": document["value"], "created_at": now},
+            "$addToSet": {"thread_ids": thread_id}
+        }
+
+    @staticmethod
+    def _remember(documents: list, thread_id: str = None):
+        for document in documents:
+            CheckpointBlobStore._blobs.set(document["_id"], (document["type"], document["value"]))
+            if thread_id is not None:
+                CheckpointBlobStore._references.set((thread_id, document["_id"]), True)
+
+    def put(self, values: list, thread_id: str) -> list:
+        """
+        Store values that are not stored yet, record the thread as referencing them, and return their references.
+
+        Args:
+            values (list): Values to externalize.
+            thread_id (str): Thread of the checkpoint the values belong to.
+
+        Returns:
+            list: One {BLOB_REF_KEY: hash} reference per value.
+        """
+        refs, documents = self._new_blobs(values, thread_id)
+        for document in documents:
+            query, update = self._upsert(document, thread_id)
+            try:
+                self.collection.update_one(query, update, upsert=True)
+            except DuplicateKeyError:
+                # A concurrent upsert inserted the blob first, so this one is a plain update
+                self.collection.update_one(query, update, upsert=True)
+        self._remember(documents, thread_id)
+        return refs
+
+    async def aput(self, values: list, thread_id: str) -> list:
+        """Async variant of put using the asyncio MongoDB client."""
+        refs, documents = self._new_blobs(values, thread_id)
+        collection = self.get_async_collection(self.collection_name)
+        for document in documents:
+            query, update = self._upsert(document, thread_id)
+            try:
+                await collection.update_one(query, update, upsert=True)
+            except DuplicateKeyError:
+                await collection.update_one(query, update, upsert=True)
+        self._remember(documents, thread_id)
+        return refs
+
+    def release(self, thread_ids: list, dry_run: bool = False) -> int:
+        """
+        Remove threads from the references of their blobs and delete the blobs left unreferenced.
+
+        Args:
+            thread_ids (list): Threads whose checkpoints were deleted.
+            dry_run (bool, optional): Count the blobs that would be deleted without changing anything. Default is False.
+
+        Returns:
+            int: Number of blobs deleted.
+        """
+        hashes = [doc["_id"] for doc in self.collection.find({"thread_ids": {"$in": thread_ids}}, {"_id": 1})]
+        if not hashes:
+            return 0
+        if dry_run:
+            return self.collection.count_documents({"_id": {"$in": hashes}, "thread_ids": {"$not": {"$elemMatch": {"$nin": thread_ids}}}})
+        self.collection.update_many({"_id": {"$in": hashes}}, {"$pullAll": {"thread_ids": thread_ids}})
+        return self.collection.delete_many({"_id": {"$in": hashes}, "thread_ids": {"$size": 0}}).deleted_count
+
+    def _cached(self, hashes: set) -> Tuple[dict, list]:
+        """Split hashes into the blobs cached in process and the hashes to fetch."""
+        found, missing = {}, []
+        for blob_hash in hashes:
+            blob = CheckpointBlobStore._blobs.get(blob_hash)
+            if blob is None:
+                missing.append(blob_hash)
+            else:
+                found[blob_hash] = blob
+        return found, missing
+
+    def _deserialize(self, blobs: dict) -> dict:
+        return {blob_hash: self.serde.loads_typed(blob) for blob_hash, blob in blobs.items()}
+
+    def get_many(self, hashes: set) -> dict:
+        """
+        Load blobs by hash.
+
+        Args:
+            hashes (set): Blob hashes.
+
+        Returns:
+            dict: Deserialized values by hash. Missing blobs are left out.
+        """
+        found, missing = self._cached(hashes)
+        if missing:
+            documents = list(self.collection.find({"_id": {"$in": missing}}, {"type": 1, "value": 1}))
+            self._remember(documents)
+            found.update({document["_id"]: (document["type"], document["value"]) for document in documents})
+        return self._deserialize(found)
+
+    async def aget_many(self, hashes: set) -> dict:
+        """Async variant of get_many using the asyncio MongoDB client."""
+        found, missing = self._cached(hashes)
+        if missing:
+            cursor = self.get_async_collection(self.collection_name).find({"_id": {"$in": missing}}, {"type": 1, "value": 1})
+            documents = await cursor.to_list(length=None)
+            self._remember(documents)
+            found.update({document["_id"]: (document["type"], document["value"]) for document in documents})
+        return self._deserialize(found)
+
+
+class SlimCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpoint saver applying a checkpoint policy on top of another saver.
+
+    - Fields in CHECKPOINT_EXCLUDE_FIELDS (e.g. embedding_vector) are not checkpointed at all.
+    - Fields in CHECKPOINT_EXTERNALIZE_FIELDS (e.g. timeseries_data) are stored once in a
+      content-addressed blob collection and the checkpoint keeps a reference to the blob.
+      References are resolved when checkpoints are read back.
+    - When CHECKPOINT_NODES is set, step checkpoints are only saved after those nodes ran.
+      The input checkpoint of a run is always saved. Writes of skipped checkpoints are dropped,
+      so a resumed run restarts from the last saved checkpoint. The next saved checkpoint gets
+      the last saved one as parent, and the channel versions of the skipped ones, so savers
+      storing values per channel version keep the values the skipped nodes wrote.
+
+    The policy applies to the checkpoint channel values, the pending writes and the node
+    outputs recorded in the checkpoint metadata.
+
+    Args:
+        saver (BaseCheckpointSaver): Saver the checkpoints are written to.
+        blob_store (CheckpointBlobStore): Store for externalized values.
+        exclude_fields (list, optional): State fields that are not checkpointed. Default is CHECKPOINT_EXCLUDE_FIELDS.
+        externalize_fields (list, optional): State fields stored as blobs. Default is CHECKPOINT_EXTERNALIZE_FIELDS.
+        checkpoint_nodes (list, optional): Nodes after which checkpoints are saved. Default is CHECKPOINT_NODES (all nodes).
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver, blob_store: CheckpointBlobStore, exclude_fields: list = None,
+                 externalize_fields: list = None, checkpoint_nodes: list = None):
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.blob_store = blob_store
+        self.exclude_fields = frozenset(exclude_fields if exclude_fields is not None else config.get_list("CHECKPOINT_EXCLUDE_FIELDS", []))
+        self.externalize_fields = frozenset(externalize_fields if externalize_fields is not None else config.get_list("CHECKPOINT_EXTERNALIZE_FIELDS", []))
+        checkpoint_nodes = checkpoint_nodes if checkpoint_nodes is not None else config.get_list("CHECKPOINT_NODES")
+        self.checkpoint_nodes = frozenset(checkpoint_nodes) if checkpoint_nodes else None
+        # Skipped checkpoint IDs -> (config of the last saved checkpoint, channel versions not saved yet),
+        # so their writes can be dropped and the next saved checkpoint can be chained to the last saved one
+        self._skipped = LRUCache(maxsize=10000)
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_next_version(self, current: Optional[Any], channel: Any) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+    # --- Policy ---
+
+    def _should_save(self, metadata: CheckpointMetadata) -> bool:
+        """Whether a checkpoint must be saved. Only step checkpoints of unselected nodes are skipped."""
+        if self.checkpoint_nodes is None or metadata.get("source") != "loop":
+            return True
+        writes = metadata.get("writes")
+        if not writes:
+            # Node information is not available (or nothing ran), keep the checkpoint
+            return True
+        return any(node in self.checkpoint_nodes for node in writes)
+
+    def _unskip(self, config: RunnableConfig, new_versions: dict) -> Tuple[RunnableConfig, dict]:
+        """
+        When the parent checkpoint was skipped, return the config of the last saved checkpoint instead,
+        and the new channel versions merged with those of the skipped checkpoints.
+        """
+        skipped = self._skipped.get(config["configurable"].get("checkpoint_id"))
+        if skipped is None:
+            return config, new_versions
+        parent_config, pending_versions = skipped
+        return parent_config, {**pending_versions, **new_versions}
+
+    def _skip(self, config: RunnableConfig, checkpoint: Checkpoint, new_versions: dict) -> RunnableConfig:
+        """Record a checkpoint as skipped and return the config the graph continues from."""
+        self._skipped.set(checkpoint["id"], self._unskip(config, new_versions))
+        configurable = config["configurable"]
+        return {
+            "configurable": {
+                "thread_id": configurable["thread_id"],
+                "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def _split(self, values: dict) -> Tuple[dict, list]:
+        """Drop excluded fields and return the kept values and the (field, value) pairs to externalize."""
+        kept, external = {}, []
+        for field, value in values.items():
+            if field in self.exclude_fields:
+                continue
+            if field in self.externalize_fields and value is not None and not is_blob_ref(value):
+                external.append((field, value))
+            else:
+                kept[field] = value
+        return kept, external
+
+    def _slim_metadata(self, metadata: CheckpointMetadata) -> CheckpointMetadata:
+        """Drop excluded and externalized fields from the node outputs recorded in the metadata."""
+        writes = metadata.get("writes")
+        if not isinstance(writes, dict):
+            return metadata
+        hidden = self.exclude_fields | self.externalize_fields
+        slim_writes = {
+            node: {k: v for k, v in output.items() if k not in hidden} if isinstance(output, dict) else output
+            for node, output in writes.items()
+        }
+        return {**metadata, "writes": slim_writes}
+
+    def _prepare_checkpoint(self, checkpoint: Checkpoint) -> Tuple[Checkpoint, list]:
+        channel_values, external = self._split(checkpoint.get("channel_values") or {})
+        return {**checkpoint, "channel_values": channel_values}, external
+
+    def _prepare_writes(self, writes: Sequence[Tuple[str, Any]]) -> Tuple[list, list]:
+        """Drop excluded writes and return the kept writes and the indexes of those to externalize."""
+        kept, external = [], []
+        for channel, value in writes:
+            if channel in self.exclude_fields:
+                continue
+            if channel in self.externalize_fields and value is not None and not is_blob_ref(value):
+                external.append(len(kept))
+            kept.append((channel, value))
+        return kept, external
+
+    @staticmethod
+    def _ref_hashes(checkpoint_tuple: CheckpointTuple) -> set:
+        hashes = {value[BLOB_REF_KEY] for value in checkpoint_tuple.checkpoint.get("channel_values", {}).values() if is_blob_ref(value)}
+        hashes.update(write[2][BLOB_REF_KEY] for write in checkpoint_tuple.pending_writes or [] if is_blob_ref(write[2]))
+        return hashes
+
+    @staticmethod
+    def _resolve(checkpoint_tuple: CheckpointTuple, blobs: dict) -> CheckpointTuple:
+        """Replace blob references by their values. Missing blobs are left as references."""
+        def resolve(value):
+            return blobs.get(value[BLOB_REF_KEY], value) if is_blob_ref(value) else value
+
+        checkpoint = {
+            **checkpoint_tuple.checkpoint,
+            "channel_values": {k: resolve(v) for k, v in checkpoint_tuple.checkpoint.get("channel_values", {}).items()}
+        }
+        pending_writes = [(task_id, channel, resolve(value)) for task_id, channel, value in checkpoint_tuple.pending_writes or []]
+        return checkpoint_tuple._replace(checkpoint=checkpoint, pending_writes=pending_writes)
+
+    # --- Sync API ---
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: dict) -> RunnableConfig:
+        if not self._should_save(metadata):
+            return self._skip(config, checkpoint, new_versions)
+        config, new_versions = self._unskip(config, new_versions)
+        checkpoint, external = self._prepare_checkpoint(checkpoint)
+        if external:
+            refs = self.blob_store.put([value for _, value in external], config["configurable"]["thread_id"])
+            checkpoint["channel_values"].update({field: ref for (field, _), ref in zip(external, refs)})
+        return self.saver.put(config, checkpoint, self._slim_metadata(metadata), new_versions)
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        if self._skipped.get(config["configurable"].get("checkpoint_id")) is not None:
+            return
+        writes, external = self._prepare_writes(writes)
+        if external:
+            refs = self.blob_store.put([writes[i][1] for i in external], config["configurable"]["thread_id"])
+            for i, ref in zip(external, refs):
+                writes[i] = (writes[i][0], ref)
+        if writes:
+            self.saver.put_writes(config, writes, task_id, task_path)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = self.saver.get_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        hashes = self._ref_hashes(checkpoint_tuple)
+        return self._resolve(checkpoint_tuple, self.blob_store.get_many(hashes)) if hashes else checkpoint_tuple
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[dict] = None, before: Optional[RunnableConfig] = None,
+             limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        for checkpoint_tuple in self.saver.list(config, filter=filter, before=before, limit=limit):
+            hashes = self._ref_hashes(checkpoint_tuple)
+            yield self._resolve(checkpoint_tuple, self.blob_store.get_many(hashes)) if hashes else checkpoint_tuple
+
+    # --- Async API ---
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: dict) -> RunnableConfig:
+        if not self._should_save(metadata):
+            return self._skip(config, checkpoint, new_versions)
+        config, new_versions = self._unskip(config, new_versions)
+        checkpoint, external = self._prepare_checkpoint(checkpoint)
+        if external:
+            refs = await self.blob_store.aput([value for _, value in external], config["configurable"]["thread_id"])
+            checkpoint["channel_values"].update({field: ref for (field, _), ref in zip(external, refs)})
+        return await self.saver.aput(config, checkpoint, self._slim_metadata(metadata), new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        if self._skipped.get(config["configurable"].get("checkpoint_id")) is not None:
+            return
+        writes, external = self._prepare_writes(writes)
+        if external:
+            refs = await self.blob_store.aput([writes[i][1] for i in external], config["configurable"]["thread_id"])
+            for i, ref in zip(external, refs):
+                writes[i] = (writes[i][0], ref)
+        if writes:
+            await self.saver.aput_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        checkpoint_tuple = await self.saver.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return None
+        hashes = self._ref_hashes(checkpoint_tuple)
+        return self._resolve(checkpoint_tuple, await self.blob_store.aget_many(hashes)) if hashes else checkpoint_tuple
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[dict] = None, before: Optional[RunnableConfig] = None,
+                    limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        async for checkpoint_tuple in self.saver.alist(config, filter=filter, before=before, limit=limit):
+            hashes = self._ref_hashes(checkpoint_tuple)
+            yield self._resolve(checkpoint_tuple, await self.blob_store.aget_many(hashes)) if hashes else checkpoint_tuple
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules import each other as top-level modules (e.g. "from db.mdb import ..."),
+# so the backend directory must be importable wherever pytest is started from.
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def mock_mongo(monkeypatch):
+    """
+    Route the shared MongoDB clients to an in-memory mongomock client, and return its URI.
+    Tests using it are skipped when mongomock is not installed.
+    """
+    mongomock = pytest.importorskip("mongomock")
+    from db import mdb
+
+    monkeypatch.setattr(mdb, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(mdb.MongoClientRegistry, "_clients", {})
+    return "mongodb://mongomock"
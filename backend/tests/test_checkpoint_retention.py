@@ -0,0 +1,95 @@
+import datetime
+import itertools
+
+import pytest
+from bson import ObjectId
+
+from checkpoint_retention import CheckpointRetention
+
+_seconds = itertools.count()
+
+
+def object_id(days_ago: float) -> ObjectId:
+    """ObjectId of a document written days_ago days ago. Each call is one second apart, so IDs are unique."""
+    written_at = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days_ago, seconds=next(_seconds))
+    return ObjectId.from_datetime(written_at)
+
+
+@pytest.fixture
+def retention(mock_mongo):
+    retention = CheckpointRetention("checkpoints", uri=mock_mongo)
+    retention.max_age_seconds = 7 * 24 * 3600
+    retention.batch_size = 2
+    retention.ensure_indexes()
+    return retention
+
+
+def add_thread(retention, thread_id, checkpoint_ages, writes=1, status=None, blobs=()):
+    """Add a thread's checkpoints (one per age, in days), writes, session and blob references."""
+    retention.checkpoints.insert_many([
+        {"_id": object_id(age), "thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": f"{i:04d}"}
+        for i, age in enumerate(checkpoint_ages)
+    ])
+    retention.writes.insert_many([{"thread_id": thread_id, "checkpoint_id": "0000", "idx": i} for i in range(writes)])
+    if status is not None:
+        retention.sessions.insert_one({"thread_id": thread_id, "status": status})
+    for blob_hash in blobs:
+        retention.blobs.collection.update_one({"_id": blob_hash}, {"$addToSet": {"thread_ids": thread_id}}, upsert=True)
+
+
+@pytest.fixture
+def threads(retention):
+    add_thread(retention, "completed", [10, 9, 8], writes=2, status="completed")
+    add_thread(retention, "failed", [10, 9], writes=3, status="failed", blobs=("own", "shared"))
+    add_thread(retention, "abandoned", [12], writes=1)
+    add_thread(retention, "active", [10, 0], writes=1, status="running", blobs=("shared",))
+    # Sessions without a thread are ignored
+    retention.sessions.insert_one({"status": "completed"})
+    return retention
+
+
+def counts(retention) -> tuple:
+    return (retention.checkpoints.count_documents({}), retention.writes.count_documents({}),
+            retention.blobs.collection.count_documents({}))
+
+
+def test_dry_run_counts_without_deleting(threads):
+    before = counts(threads)
+    result = threads.run(dry_run=True)
+    assert result == {
+        "compacted": {"threads": 1, "checkpoints": 2, "writes": 2},
+        "expired": {"threads": 2, "checkpoints": 3, "writes": 4, "blobs": 1},
+    }
+    assert counts(threads) == before
+    assert threads.sessions.count_documents({"checkpoints_compacted": True}) == 0
+    # A dry run does not move the scan window
+    assert threads._expired_until is None
+
+
+def test_run_deletes_what_the_dry_run_counted(threads):
+    dry_run = threads.run(dry_run=True)
+    assert threads.run() == dry_run
+    assert sorted(threads.checkpoints.distinct("thread_id")) == ["active", "completed"]
+    assert [doc["checkpoint_id"] for doc in threads.checkpoints.find({"thread_id": "completed"})] == ["0002"]
+    assert threads.writes.distinct("thread_id") == ["active"]
+    assert [doc["_id"] for doc in threads.blobs.collection.find()] == ["shared"]
+    assert threads.blobs.collection.find_one({"_id": "shared"})["thread_ids"] == ["active"]
+    assert threads.sessions.find_one({"thread_id": "completed"})["checkpoints_compacted"] is True
+
+
+def test_next_pass_only_scans_newly_stale_checkpoints(threads):
+    threads.run()
+    assert threads.run() == {
+        "compacted": {"threads": 0, "checkpoints": 0, "writes": 0},
+        "expired": {"threads": 0, "checkpoints": 0, "writes": 0, "blobs": 0},
+    }
+    # A checkpoint older than the previous cutoff is not scanned again
+    add_thread(threads, "backfilled", [30])
+    assert threads.expire_stale_threads()["threads"] == 0
+    # A full pass, as run from the command line, still finds it
+    assert CheckpointRetention("checkpoints", uri=threads.uri).expire_stale_threads(dry_run=True)["threads"] == 1
+
+
+def test_disabled_expiry(threads):
+    threads.max_age_seconds = 0
+    assert threads.expire_stale_threads() == {"threads": 0, "checkpoints": 0, "writes": 0, "blobs": 0}
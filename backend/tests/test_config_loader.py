@@ -0,0 +1,92 @@
+import os
+import json
+import itertools
+
+import pytest
+
+from config.config_loader import ConfigLoader
+
+
+# Increasing modification times, so every write is seen as a change whatever the filesystem resolution
+_mtimes = itertools.count(1_700_000_000)
+
+
+def write_file(path, text):
+    path.write_text(text)
+    mtime = next(_mtimes)
+    os.utime(path, (mtime, mtime))
+
+
+def write_config(path, **overrides):
+    """Write a minimal valid configuration file."""
+    data = {"MDB_DATABASE_NAME": "test_db", "AGENT_WORKFLOW_GRAPH": {"nodes": [], "edges": []}}
+    data.update(overrides)
+    write_file(path, json.dumps(data))
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    write_config(path, MDB_TIMESERIES_READ_FIELDS=["gdp", "vix"], MDB_CLIENT_OPTIONS={"maxPoolSize": 10})
+    # Check the file mtime on every access
+    monkeypatch.setattr(ConfigLoader, "RELOAD_INTERVAL", 0.0)
+    yield path
+    ConfigLoader._snapshots.pop(str(path), None)
+    ConfigLoader._checked_at.pop(str(path), None)
+
+
+def test_instances_share_one_snapshot(config_file):
+    first = ConfigLoader(str(config_file))
+    second = ConfigLoader(str(config_file))
+    assert first.snapshot is second.snapshot
+
+
+def test_snapshot_is_read_only(config_file):
+    loader = ConfigLoader(str(config_file))
+    with pytest.raises(TypeError):
+        loader.config_data["MDB_DATABASE_NAME"] = "other_db"
+    with pytest.raises(TypeError):
+        loader.config_data["MDB_CLIENT_OPTIONS"]["maxPoolSize"] = 1
+    assert loader.config_data["MDB_TIMESERIES_READ_FIELDS"] == ("gdp", "vix")
+
+
+def test_get_returns_mutable_copies(config_file):
+    loader = ConfigLoader(str(config_file))
+    fields = loader.get("MDB_TIMESERIES_READ_FIELDS")
+    fields.append("unemployment_rate")
+    assert loader.get("MDB_TIMESERIES_READ_FIELDS") == ["gdp", "vix"]
+    assert loader.get_list("MDB_TIMESERIES_READ_FIELDS") == ["gdp", "vix"]
+    assert loader.get_dict("MDB_CLIENT_OPTIONS") == {"maxPoolSize": 10}
+
+
+def test_reloads_when_file_changes(config_file):
+    loader = ConfigLoader(str(config_file))
+    before = loader.snapshot
+    write_config(config_file, MDB_DATABASE_NAME="reloaded_db")
+    assert loader.get("MDB_DATABASE_NAME") == "reloaded_db"
+    assert loader.snapshot is not before
+    # The previous snapshot is left untouched
+    assert before.data["MDB_DATABASE_NAME"] == "test_db"
+
+
+def test_keeps_previous_snapshot_on_invalid_file(config_file):
+    loader = ConfigLoader(str(config_file))
+    before = loader.snapshot
+    write_file(config_file, "{not json")
+    assert loader.get("MDB_DATABASE_NAME") == "test_db"
+    write_config(config_file, MDB_DATABASE_NAME=42)
+    assert loader.snapshot is before
+
+
+def test_invalid_file_fails_first_load(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"MDB_DATABASE_NAME": "test_db"}))
+    with pytest.raises(ValueError, match="AGENT_WORKFLOW_GRAPH"):
+        ConfigLoader(str(path))
+
+
+def test_typed_getters_check_types(config_file):
+    loader = ConfigLoader(str(config_file))
+    with pytest.raises(ValueError):
+        loader.get_int("MDB_DATABASE_NAME")
+    assert loader.get_int("MISSING_KEY", 5) == 5
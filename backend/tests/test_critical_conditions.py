@@ -0,0 +1,82 @@
+import pytest
+
+from config.config_loader import ConfigLoader
+from critical_conditions import CriticalConditionsEvaluator
+from loader import load_typed_records
+
+
+def baseline_evaluate(conditions_config: dict, timeseries_data: list) -> list:
+    """The row-by-row evaluation the evaluator replaced, kept as the reference for comparison conditions."""
+    critical_conditions = []
+    for record in timeseries_data:
+        for key, condition in conditions_config.items():
+            value = float(record.get(key, 0))
+            threshold = condition["threshold"]
+            if (condition["condition"] == ">" and value > threshold) or (condition["condition"] == "<" and value < threshold):
+                critical_conditions.append(condition["message"].format(value=value))
+    return critical_conditions
+
+
+@pytest.fixture(scope="module")
+def config():
+    return ConfigLoader()
+
+
+@pytest.fixture(scope="module")
+def conditions_config(config):
+    return config.get("CRITICAL_CONDITIONS")
+
+
+@pytest.fixture(scope="module")
+def csv_records(config):
+    return load_typed_records(config.get("CSV_DATA"))
+
+
+def test_matches_baseline_on_csv_data(conditions_config, csv_records):
+    evaluator = CriticalConditionsEvaluator(conditions_config)
+    expected = baseline_evaluate(conditions_config, csv_records)
+    assert expected
+    # Same alerts in the same order, each reported once
+    assert evaluator.evaluate(csv_records) == list(dict.fromkeys(expected))
+
+
+def test_matches_baseline_on_default_timeseries_data(config, conditions_config):
+    records = config.get("DEFAULT_TIMESERIES_DATA")
+    evaluator = CriticalConditionsEvaluator(conditions_config)
+    assert evaluator.evaluate(records) == list(dict.fromkeys(baseline_evaluate(conditions_config, records)))
+
+
+def test_string_and_numeric_values_give_the_same_alerts(conditions_config, csv_records):
+    evaluator = CriticalConditionsEvaluator(conditions_config)
+    typed = [{key: float(value) for key, value in record.items() if key != "timestamp"} for record in csv_records]
+    assert evaluator.evaluate(typed) == evaluator.evaluate(csv_records)
+
+
+def test_missing_and_invalid_values_do_not_alert():
+    evaluator = CriticalConditionsEvaluator({"gdp": {"threshold": 2.5, "condition": "<", "message": "GDP {value}"}})
+    assert evaluator.evaluate([{"vix": 10}, {"gdp": "n/a"}, {"gdp": 2.0}]) == ["GDP 2.0"]
+
+
+def test_range_and_rate_of_change():
+    evaluator = CriticalConditionsEvaluator({
+        "vix": [
+            {"min": 20, "max": 30, "condition": "range", "message": "VIX elevated: {value}"},
+            {"threshold": 5, "condition": "rate_of_change", "direction": "up", "message": "VIX jumped {change} to {value}"},
+        ]
+    })
+    assert evaluator.evaluate([{"vix": 15}, {"vix": 22}, {"vix": 12}, {"vix": 31}]) == [
+        "VIX elevated: 22.0", "VIX jumped 7.0 to 22.0", "VIX jumped 19.0 to 31.0"
+    ]
+
+
+def test_invalid_conditions_are_skipped():
+    evaluator = CriticalConditionsEvaluator({
+        "gdp": {"threshold": 2.5, "condition": "between", "message": "unknown operator"},
+        "vix": {"condition": ">", "message": "missing threshold"},
+        "interest_rate": {"threshold": 2.0, "condition": ">", "message": "Rates {value}"},
+    })
+    assert [condition.metric for condition in evaluator.plan] == ["interest_rate"]
+
+
+def test_from_config_reuses_compiled_evaluators(conditions_config):
+    assert CriticalConditionsEvaluator.from_config(conditions_config) is CriticalConditionsEvaluator.from_config(dict(conditions_config))
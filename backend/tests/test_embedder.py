@@ -0,0 +1,30 @@
+import embedder
+from embedder import Embedder
+
+
+class FakeCohereEmbeddings:
+    """Stands in for BedrockCohereEnglishEmbeddings and records the requested embedding types."""
+
+    requests = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def predict_batch_types(self, texts, input_type="search_document", embedding_types=None):
+        FakeCohereEmbeddings.requests.append(list(embedding_types))
+        return {embedding_type: [[len(embedding_type)] * 4 for _ in texts] for embedding_type in embedding_types}
+
+
+def test_float_and_quantized_embeddings_come_from_one_request(monkeypatch):
+    monkeypatch.setattr(embedder, "BedrockCohereEnglishEmbeddings", FakeCohereEmbeddings)
+    FakeCohereEmbeddings.requests = []
+    embeddings = Embedder.get_embedding_types("rates are rising", ["float", "int8"], use_cache=False)
+    assert FakeCohereEmbeddings.requests == [["float", "int8"]]
+    assert embeddings == {"float": [5] * 4, "int8": [4] * 4}
+    assert Embedder.get_embedding("rates are rising", use_cache=False, embedding_type="ubinary") == [7] * 4
+
+
+def test_invalid_text_returns_none(monkeypatch):
+    monkeypatch.setattr(embedder, "BedrockCohereEnglishEmbeddings", FakeCohereEmbeddings)
+    assert Embedder.get_embedding_types("", ["float"], use_cache=False) is None
+    assert Embedder.get_embedding(None, use_cache=False) is None
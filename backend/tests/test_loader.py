@@ -0,0 +1,34 @@
+import os
+import datetime
+
+from loader import load_typed_records
+from utils import format_timeseries_records
+
+
+def write_csv(path, rows, mtime):
+    path.write_text("timestamp,gdp,note\n" + "".join(f"{row}\n" for row in rows))
+    os.utime(path, (mtime, mtime))
+
+
+def test_records_are_typed_once_per_file_version(tmp_path):
+    path = tmp_path / "data.csv"
+    write_csv(path, ["2025-03-21T13:15:00Z,2.4,steady"], mtime=1_700_000_000)
+
+    records = load_typed_records(str(path))
+    assert records == [{"timestamp": datetime.datetime(2025, 3, 21, 13, 15), "gdp": 2.4, "note": "steady"}]
+    # Same file version: the cached records are returned
+    assert load_typed_records(str(path))[0] is records[0]
+
+    write_csv(path, ["2025-03-21T13:30:00Z,2.1,slowing"], mtime=1_700_000_100)
+    assert load_typed_records(str(path))[0]["gdp"] == 2.1
+
+
+def test_format_timeseries_records_restores_csv_timestamps(tmp_path):
+    path = tmp_path / "data.csv"
+    write_csv(path, ["2025-03-21T13:15:00Z,2.4,steady"], mtime=1_700_000_000)
+    records = load_typed_records(str(path))
+
+    formatted = format_timeseries_records(records + [{"timestamp": "2025-03-21T13:45:00Z", "gdp": 2.0}])
+    assert [record["timestamp"] for record in formatted] == ["2025-03-21T13:15:00Z", "2025-03-21T13:45:00Z"]
+    # The cached records are left typed
+    assert isinstance(records[0]["timestamp"], datetime.datetime)
@@ -0,0 +1,157 @@
+import datetime
+
+import numpy as np
+import pytest
+from bson import ObjectId
+
+from local_vector_search import LocalVectorSearchIndex
+from vector_quantization import encode_vector
+
+
+@pytest.fixture
+def index(mock_mongo):
+    index = LocalVectorSearchIndex("queries", "query_embedding", uri=mock_mongo)
+    index.mmap_path = None
+    return index
+
+
+def add(index, vector, **fields):
+    """Insert a document with an embedding and return its _id."""
+    return index.collection.insert_one({"query_embedding": vector, **fields}).inserted_id
+
+
+def test_search_returns_closest_documents(index):
+    add(index, [1.0, 0.0], query="east")
+    add(index, [0.0, 1.0], query="north")
+    add(index, [0.7, 0.7], query="north-east")
+    results = index.search([0.1, 1.0], limit=2)
+    assert [result["query"] for result in results] == ["north", "north-east"]
+    assert all("query_embedding" not in result for result in results)
+
+
+def test_search_decodes_float32_and_int8_vectors(index):
+    add(index, encode_vector([1.0, 0.0], "float32"), query="float32")
+    add(index, encode_vector([-128, 127], "int8"), query="int8")
+    assert index.search([-1.0, 1.0], limit=1)[0]["query"] == "int8"
+    assert index.search([1.0, 0.0], limit=1)[0]["query"] == "float32"
+
+
+def test_search_decodes_binary_vectors(index):
+    add(index, encode_vector([0b11110000], "binary"), query="first half")
+    add(index, encode_vector([0b00001111], "binary"), query="second half")
+    assert index.search([1, 1, 1, 1, -1, -1, -1, -1], limit=1)[0]["query"] == "first half"
+
+
+def test_incremental_refresh_loads_new_documents(index):
+    add(index, [1.0, 0.0], query="first")
+    index.refresh()
+    add(index, [0.0, 1.0], query="second")
+    index.refresh()
+    assert index._size == 2
+    assert index.search([0.0, 1.0], limit=1)[0]["query"] == "second"
+
+
+def test_refresh_loads_documents_embedded_after_newer_ones(index):
+    # Documents are inserted first and embedded later, so the first embedded one has the highest _id
+    ids = [index.collection.insert_one({"query": f"q{i}"}).inserted_id for i in range(3)]
+    index.collection.update_one({"_id": ids[2]}, {"$set": {"query_embedding": [1.0, 0.0]}})
+    index.refresh()
+    assert index._size == 1
+    index.collection.update_one({"_id": ids[0]}, {"$set": {"query_embedding": [0.0, 1.0]}})
+    index.collection.update_one({"_id": ids[1]}, {"$set": {"query_embedding": [0.7, 0.7]}})
+    index.refresh()
+    assert index._size == 3
+    assert index.search([0.0, 1.0], limit=1)[0]["query"] == "q0"
+
+
+def test_refresh_loads_documents_with_older_object_ids(index):
+    add(index, [1.0, 0.0], query="recent")
+    index.refresh()
+    # A writer with a clock behind the others
+    add(index, [0.0, 1.0], query="late", _id=ObjectId.from_datetime(ObjectId().generation_time.replace(year=2020)))
+    index.refresh()
+    assert index._size == 2
+    assert index.search([0.0, 1.0], limit=1)[0]["query"] == "late"
+
+
+def test_refresh_reloads_after_deletions(index):
+    first = add(index, [1.0, 0.0], query="removed")
+    add(index, [0.0, 1.0], query="kept")
+    index.refresh()
+    index.collection.delete_one({"_id": first})
+    index.refresh()
+    assert index._size == 1
+    assert [result["query"] for result in index.search([1.0, 0.0], limit=2)] == ["kept"]
+
+
+def test_stale_index_refreshes_in_background(index):
+    add(index, [1.0, 0.0], query="first")
+    index.search([1.0, 0.0])
+    add(index, [0.0, 1.0], query="second")
+    index.refresh_seconds = 0.0
+    # The stale index answers right away and refreshes in a background thread
+    assert [result["query"] for result in index.search([0.0, 1.0], limit=2)] == ["first"]
+    index._refresh_thread.join(timeout=5)
+    assert index.search([0.0, 1.0], limit=1)[0]["query"] == "second"
+
+
+def test_approximate_index_is_rebuilt_as_the_index_grows(index):
+    rng = np.random.default_rng(1)
+    index.ann_min_size = 16
+    for vector in rng.normal(size=(16, 4)).tolist():
+        add(index, vector)
+    index.refresh()
+    assert len(index._lists) == 4
+    for vector in rng.normal(size=(16, 4)).tolist():
+        add(index, vector)
+    index.refresh()
+    # Doubled since the last build: the clusters were recomputed for the larger index
+    assert index._ann_size == 32
+    assert len(index._lists) == int(np.sqrt(32))
+    assert sorted(row for rows in index._lists for row in rows) == list(range(32))
+
+
+def test_query_with_wrong_dimensions_is_rejected(index):
+    add(index, [1.0, 0.0])
+    with pytest.raises(ValueError):
+        index.search([1.0, 0.0, 0.0])
+
+
+def test_refresh_ignores_empty_vectors(index):
+    add(index, [1.0, 0.0], query="embedded")
+    add(index, None, query="pending")
+    add(index, [], query="failed")
+    index.refresh()
+    reloaded_at = index._reloaded_at
+    index.refresh()
+    # The count matches the loaded vectors, so the second refresh is not a full reload
+    assert index._reloaded_at == reloaded_at
+    assert index._size == 1
+
+
+def test_refresh_reloads_documents_re_embedded_in_place(index):
+    stamp = datetime.datetime(2025, 1, 1)
+    first = add(index, [1.0, 0.0], query="first", query_embedding_updated_at=stamp)
+    add(index, [0.0, 1.0], query="second", query_embedding_updated_at=stamp)
+    index.refresh()
+    index.collection.update_one(
+        {"_id": first},
+        {"$set": {"query_embedding": [0.0, 1.0], "query_embedding_updated_at": stamp + datetime.timedelta(minutes=1)}}
+    )
+    index.refresh()
+    assert index._size == 2
+    assert index._matrix[0].tolist() == [0.0, 1.0]
+
+
+def test_periodic_full_reload(index):
+    first = add(index, [1.0, 0.0], query="first")
+    add(index, [0.0, 1.0], query="second")
+    index.refresh()
+    # Rewritten without a stamp: only the periodic full reload picks it up
+    index.collection.update_one({"_id": first}, {"$set": {"query_embedding": [0.0, 1.0]}})
+    index.full_reload_seconds = 3600
+    index.refresh()
+    assert index.search([1.0, 0.0], limit=1)[0]["query"] == "first"
+    index.full_reload_seconds = 1e-9
+    index.refresh()
+    assert index._matrix[0].tolist() == [0.0, 1.0]
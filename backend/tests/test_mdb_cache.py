@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+import agent_tools
+from agent_tools import AgentTools
+from mdb_cache import MongoDBCache, LLMResponseCache
+
+
+class AsyncCollection:
+    """Minimal asyncio collection over a mongomock collection, standing in for Motor."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        return self.collection.find_one(*args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+
+class FakeChatCompletions:
+    calls = 0
+
+    def __init__(self, model_id=None):
+        self.request_params = {"max_tokens": 10}
+
+    async def apredict(self, prompt):
+        FakeChatCompletions.calls += 1
+        return f"answer to {prompt}"
+
+
+def fail_sync(*args, **kwargs):
+    raise AssertionError("the async path must not use the synchronous client")
+
+
+@pytest.fixture
+def async_cache(mock_mongo, monkeypatch):
+    """Route MongoDBCache's asyncio collections to mongomock, and forbid its synchronous reads and writes."""
+    monkeypatch.setattr(MongoDBCache, "_lrus", {})
+    monkeypatch.setattr(
+        MongoDBCache, "get_async_collection", lambda self, name: AsyncCollection(self.get_collection(name))
+    )
+    monkeypatch.setattr(MongoDBCache, "get", fail_sync)
+    monkeypatch.setattr(MongoDBCache, "set", fail_sync)
+    return mock_mongo
+
+
+def test_indexes_are_created_only_by_ensure_indexes(mock_mongo, monkeypatch):
+    monkeypatch.setattr(MongoDBCache, "_lrus", {})
+    cache = MongoDBCache("cache_test", ttl_seconds=60, uri=mock_mongo, database_name="test")
+    assert "created_at_1" not in cache.collection.index_information()
+
+    cache.ensure_indexes()
+    assert cache.collection.index_information()["created_at_1"]["expireAfterSeconds"] == 60
+
+
+def test_aset_and_aget_use_the_async_collection(async_cache):
+    cache = MongoDBCache("cache_test", uri=async_cache, database_name="test")
+    asyncio.run(cache.aset("key", "value", model_id="model"))
+    assert cache.collection.find_one({"_id": "key"})["model_id"] == "model"
+
+    # A new process (empty LRU) reads the entry back from MongoDB
+    cache.lru.clear()
+    assert asyncio.run(cache.aget("key")) == "value"
+    assert asyncio.run(cache.aget("missing")) is None
+
+
+def test_apredict_serves_repeated_prompts_from_the_async_cache(async_cache, monkeypatch):
+    monkeypatch.setattr(agent_tools, "BedrockAnthropicChatCompletions", FakeChatCompletions)
+    monkeypatch.setattr(FakeChatCompletions, "calls", 0)
+    tools = AgentTools(uri=async_cache, database_name="test")
+    node_config = {"metadata": {"llm_cache": True}}
+
+    assert asyncio.run(tools._apredict("prompt", node_config)) == "answer to prompt"
+    LLMResponseCache(uri=async_cache, database_name="test").lru.clear()
+    assert asyncio.run(tools._apredict("prompt", node_config)) == "answer to prompt"
+    assert FakeChatCompletions.calls == 1
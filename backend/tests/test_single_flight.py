@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+import single_flight
+from single_flight import SingleFlight
+
+
+class Work:
+    """Coroutine function counting its executions, finishing when released."""
+
+    def __init__(self, result="done", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_concurrent_calls_share_one_run():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work()
+        callers = [asyncio.ensure_future(flight.run("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        work.release.set()
+        return work, await asyncio.gather(*callers)
+
+    work, results = asyncio.run(scenario())
+    assert work.calls == 1
+    assert [result for result, _ in results] == ["done"] * 3
+    assert [shared for _, shared in results] == [False, True, True]
+
+
+def test_different_keys_run_separately():
+    async def scenario():
+        flight = SingleFlight()
+        first, second = Work("first"), Work("second")
+        callers = [asyncio.ensure_future(flight.run("a", first)), asyncio.ensure_future(flight.run("b", second))]
+        await asyncio.sleep(0)
+        first.release.set()
+        second.release.set()
+        return first, second, await asyncio.gather(*callers)
+
+    first, second, results = asyncio.run(scenario())
+    assert (first.calls, second.calls) == (1, 1)
+    assert results == [("first", False), ("second", False)]
+
+
+def test_completed_call_is_evicted_without_window():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work()
+        work.release.set()
+        first = await flight.run("key", work)
+        second = await flight.run("key", work)
+        return work, first, second, flight
+
+    work, first, second, flight = asyncio.run(scenario())
+    assert work.calls == 2
+    assert (first, second) == (("done", False), ("done", False))
+    assert not flight._calls
+
+
+def test_completed_call_is_shared_within_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(single_flight.time, "monotonic", lambda: now[0])
+
+    async def scenario():
+        flight = SingleFlight(window_seconds=5.0)
+        work = Work()
+        work.release.set()
+        results = [await flight.run("key", work)]
+        now[0] += 4.0
+        results.append(await flight.run("key", work))
+        now[0] += 1.0
+        # The window is over: the call is evicted and the work runs again
+        results.append(await flight.run("key", work))
+        return work, results
+
+    work, results = asyncio.run(scenario())
+    assert work.calls == 2
+    assert results == [("done", False), ("done", True), ("done", False)]
+
+
+def test_failure_is_shared_with_waiters_but_not_retained():
+    async def scenario():
+        flight = SingleFlight(window_seconds=60.0)
+        work = Work(error=RuntimeError("boom"))
+        callers = [asyncio.ensure_future(flight.run("key", work)) for _ in range(2)]
+        await asyncio.sleep(0)
+        work.release.set()
+        outcomes = await asyncio.gather(*callers, return_exceptions=True)
+        retry = Work("recovered")
+        retry.release.set()
+        return work, outcomes, await flight.run("key", retry)
+
+    work, outcomes, retried = asyncio.run(scenario())
+    assert work.calls == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert retried == ("recovered", False)
+
+
+def test_cancelled_caller_does_not_cancel_the_run():
+    async def scenario():
+        flight = SingleFlight()
+        work = Work()
+        leader = asyncio.ensure_future(flight.run("key", work))
+        follower = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        work.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return work, await follower
+
+    work, result = asyncio.run(scenario())
+    assert work.calls == 1
+    assert result == ("done", True)
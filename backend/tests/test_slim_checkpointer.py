@@ -0,0 +1,181 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+from typing_extensions import TypedDict
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.memory import InMemorySaver
+
+from slim_checkpointer import BLOB_REF_KEY, CheckpointBlobStore, SlimCheckpointSaver, is_blob_ref
+
+
+class State(TypedDict):
+    query: str
+    embedding: Optional[List[float]]
+    data: Optional[List[dict]]
+    answer: Optional[str]
+
+
+DATA = [{"timestamp": "2025-02-19T13:00:00Z", "gdp": "2.5"}, {"timestamp": "2025-02-19T13:05:00Z", "gdp": "2.7"}]
+
+
+class Nodes:
+    """Graph nodes recording their runs. The answer node fails until `fail_answer` is cleared."""
+
+    def __init__(self):
+        self.runs = []
+        self.fail_answer = False
+
+    def fetch(self, state: State) -> dict:
+        self.runs.append("fetch_node")
+        return {"data": DATA}
+
+    def embed(self, state: State) -> dict:
+        self.runs.append("embed_node")
+        return {"embedding": [0.1, 0.2]}
+
+    def answer(self, state: State) -> dict:
+        self.runs.append("answer_node")
+        if self.fail_answer:
+            raise RuntimeError("LLM unavailable")
+        return {"answer": f"{len(state['data'])} points, embedding {state.get('embedding')}"}
+
+
+def build_graph(nodes: Nodes, saver):
+    graph = StateGraph(State)
+    graph.add_node("fetch_node", nodes.fetch)
+    graph.add_node("embed_node", nodes.embed)
+    graph.add_node("answer_node", nodes.answer)
+    graph.add_edge(START, "fetch_node")
+    graph.add_edge("fetch_node", "embed_node")
+    graph.add_edge("embed_node", "answer_node")
+    graph.add_edge("answer_node", END)
+    return graph.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def inner_saver():
+    return InMemorySaver()
+
+
+@pytest.fixture
+def blob_store(mock_mongo, inner_saver):
+    CheckpointBlobStore._blobs.clear()
+    CheckpointBlobStore._references.clear()
+    return CheckpointBlobStore("checkpoints_blobs", serde=inner_saver.serde, uri=mock_mongo)
+
+
+def slim_saver(inner_saver, blob_store, **policy):
+    policy = {"exclude_fields": [], "externalize_fields": [], "checkpoint_nodes": [], **policy}
+    return SlimCheckpointSaver(inner_saver, blob_store, **policy)
+
+
+def stored_channel_values(inner_saver, config) -> dict:
+    """Channel values of the latest checkpoint as stored, before blob references are resolved."""
+    return inner_saver.get_tuple(config).checkpoint["channel_values"]
+
+
+def test_excluded_fields_are_not_checkpointed(inner_saver, blob_store):
+    saver = slim_saver(inner_saver, blob_store, exclude_fields=["embedding"])
+    config = {"configurable": {"thread_id": "exclude"}}
+    result = build_graph(Nodes(), saver).invoke({"query": "q"}, config)
+    # The run itself still sees the field
+    assert result["answer"] == "2 points, embedding [0.1, 0.2]"
+    assert "embedding" not in stored_channel_values(inner_saver, config)
+    assert all("embedding" not in (metadata_writes or {}).get("embed_node", {})
+               for metadata_writes in (t.metadata.get("writes") for t in inner_saver.list(config)))
+
+
+def test_externalized_fields_are_stored_once_and_resolved(inner_saver, blob_store):
+    saver = slim_saver(inner_saver, blob_store, externalize_fields=["data"])
+    graph = build_graph(Nodes(), saver)
+    for thread_id in ("externalize-1", "externalize-2"):
+        graph.invoke({"query": "q"}, {"configurable": {"thread_id": thread_id}})
+
+    config = {"configurable": {"thread_id": "externalize-1"}}
+    stored = stored_channel_values(inner_saver, config)["data"]
+    assert is_blob_ref(stored)
+    # One blob for identical values, referenced by both threads
+    blob = blob_store.collection.find_one({"_id": stored[BLOB_REF_KEY]})
+    assert blob_store.collection.count_documents({}) == 1
+    assert sorted(blob["thread_ids"]) == ["externalize-1", "externalize-2"]
+    # Reads resolve the reference, also when the blob is not cached in process
+    CheckpointBlobStore._blobs.clear()
+    assert saver.get_tuple(config).checkpoint["channel_values"]["data"] == DATA
+    assert graph.get_state(config).values["data"] == DATA
+
+
+def test_checkpoints_are_only_saved_after_selected_nodes(inner_saver, blob_store):
+    saver = slim_saver(inner_saver, blob_store, checkpoint_nodes=["embed_node"])
+    config = {"configurable": {"thread_id": "skip"}}
+    build_graph(Nodes(), saver).invoke({"query": "q"}, config)
+    written_by = [set((t.metadata.get("writes") or {}).keys()) for t in inner_saver.list(config) if t.metadata.get("source") == "loop"]
+    assert {"embed_node"} in written_by
+    assert not any({"fetch_node"} == nodes or {"answer_node"} == nodes for nodes in written_by)
+    # Saved checkpoints are chained to each other, never to a skipped one
+    saved = list(inner_saver.list(config))
+    saved_ids = {t.config["configurable"]["checkpoint_id"] for t in saved}
+    assert all(t.parent_config is None or t.parent_config["configurable"]["checkpoint_id"] in saved_ids for t in saved)
+
+
+def test_resume_runs_only_the_nodes_after_the_last_saved_checkpoint(inner_saver, blob_store):
+    saver = slim_saver(inner_saver, blob_store, exclude_fields=["embedding"], externalize_fields=["data"],
+                       checkpoint_nodes=["embed_node"])
+    config = {"configurable": {"thread_id": "resume"}}
+    nodes = Nodes()
+    nodes.fail_answer = True
+    with pytest.raises(RuntimeError):
+        build_graph(nodes, saver).invoke({"query": "q"}, config)
+    assert nodes.runs == ["fetch_node", "embed_node", "answer_node"]
+
+    # A new process: nothing cached, a new graph on the same stored checkpoints
+    CheckpointBlobStore._blobs.clear()
+    nodes = Nodes()
+    graph = build_graph(nodes, slim_saver(inner_saver, blob_store, exclude_fields=["embedding"],
+                                          externalize_fields=["data"], checkpoint_nodes=["embed_node"]))
+    assert graph.get_state(config).next == ("answer_node",)
+    result = graph.invoke(None, config)
+    assert nodes.runs == ["answer_node"]
+    # The externalized data is restored, the excluded embedding is not
+    assert result["data"] == DATA
+    assert result["answer"] == "2 points, embedding None"
+
+
+def test_async_resume(inner_saver, blob_store, monkeypatch):
+    saver = slim_saver(inner_saver, blob_store, externalize_fields=["data"], checkpoint_nodes=["embed_node"])
+    # The async blob store path uses Motor, which mongomock does not provide: use the sync collection
+    async def aput(values, thread_id):
+        return blob_store.put(values, thread_id)
+
+    async def aget_many(hashes):
+        return blob_store.get_many(hashes)
+
+    monkeypatch.setattr(blob_store, "aput", aput)
+    monkeypatch.setattr(blob_store, "aget_many", aget_many)
+    config = {"configurable": {"thread_id": "async-resume"}}
+
+    async def scenario():
+        nodes = Nodes()
+        nodes.fail_answer = True
+        graph = build_graph(nodes, saver)
+        with pytest.raises(RuntimeError):
+            await graph.ainvoke({"query": "q"}, config)
+        nodes.fail_answer = False
+        nodes.runs = []
+        return nodes, await graph.ainvoke(None, config)
+
+    nodes, result = asyncio.run(scenario())
+    assert nodes.runs == ["answer_node"]
+    assert result["answer"] == "2 points, embedding [0.1, 0.2]"
+
+
+def test_release_deletes_unreferenced_blobs(blob_store):
+    shared, own = blob_store.put([[1, 2], [3]], "thread-1")
+    blob_store.put([[1, 2]], "thread-2")
+    assert blob_store.release(["thread-1"], dry_run=True) == 1
+    assert blob_store.collection.count_documents({}) == 2
+    assert blob_store.release(["thread-1"]) == 1
+    assert blob_store.collection.find_one({"_id": own[BLOB_REF_KEY]}) is None
+    assert blob_store.collection.find_one({"_id": shared[BLOB_REF_KEY]})["thread_ids"] == ["thread-2"]
+    assert blob_store.release(["thread-2"]) == 1
+    assert blob_store.collection.count_documents({}) == 0
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from bson.binary import Binary, BinaryVectorDtype
+
+from vector_quantization import decode_vector, encode_vector, get_cohere_embedding_type, rescore
+
+
+def test_float_vectors_are_stored_as_arrays():
+    vector = [0.25, -0.5, 1.0]
+    assert encode_vector(vector, "float") is vector
+    np.testing.assert_array_equal(decode_vector(vector), np.asarray(vector, dtype=np.float32))
+
+
+def test_float32_round_trip():
+    vector = [0.1, -0.2, 0.3333]
+    stored = encode_vector(vector, "float32")
+    assert isinstance(stored, Binary) and stored.as_vector().dtype == BinaryVectorDtype.FLOAT32
+    np.testing.assert_allclose(decode_vector(stored), vector, rtol=1e-6)
+
+
+def test_int8_round_trip():
+    vector = [-128, -1, 0, 1, 127]
+    stored = encode_vector(vector, "int8")
+    assert stored.as_vector().dtype == BinaryVectorDtype.INT8
+    np.testing.assert_array_equal(decode_vector(stored), vector)
+
+
+def test_binary_round_trip_unpacks_to_signs():
+    stored = encode_vector([0b10100000, 0b00000001], "binary")
+    assert stored.as_vector().dtype == BinaryVectorDtype.PACKED_BIT
+    expected = [1, -1, 1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, -1, 1]
+    np.testing.assert_array_equal(decode_vector(stored), expected)
+
+
+def test_binary_sign_vectors_keep_the_float_ranking():
+    rng = np.random.default_rng(0)
+    query = rng.normal(size=64)
+    close, far = query + rng.normal(scale=0.1, size=64), -query
+    packed = [encode_vector(np.packbits(vector > 0).tolist(), "binary") for vector in (close, far)]
+    scores = [float(decode_vector(stored) @ query) for stored in packed]
+    assert scores[0] > scores[1]
+
+
+def test_unknown_storage_type_is_rejected():
+    with pytest.raises(ValueError):
+        encode_vector([1.0], "float16")
+    with pytest.raises(ValueError):
+        get_cohere_embedding_type("float16")
+
+
+def test_cohere_embedding_types():
+    assert [get_cohere_embedding_type(t) for t in ("float", "float32", "int8", "binary")] == ["float", "float", "int8", "ubinary"]
+
+
+def test_rescore_reranks_with_full_precision_vectors():
+    results = [
+        {"query": "a", "full": encode_vector([0.0, 1.0], "float32")},
+        {"query": "b"},
+        {"query": "c", "full": [1.0, 0.0]},
+    ]
+    assert [result["query"] for result in rescore(results, [1.0, 0.1], "full", limit=3)] == ["c", "a", "b"]
+    assert [result["query"] for result in rescore(results, [1.0, 0.1], "full", limit=1)] == ["c"]
@@ -1,4 +1,5 @@
 from bson import ObjectId
+from datetime import datetime
 from typing import Any
 
 def convert_objectids(item: Any) -> Any:
@@ -50,4 +51,25 @@ def format_document(item: Any, max_array_length: int = 10) -> Any:
         # Convert binary data to a hex string
         return item.hex()
     else:
-        return item
\ No newline at end of file
+        return item
+def format_timeseries_records(records: list, time_field: str = "timestamp") -> list:
+    """
+    Format the time field of time-series records as "%Y-%m-%dT%H:%M:%SZ" strings, as found in the CSV data.
+
+    Records are kept typed in the agent state; this is meant for the LLM prompt and the API payload.
+    Records whose time field is already a string are returned unchanged.
+
+    Args:
+        records (list): Time-series records
+        time_field (str): Name of the time field. Defaults to "timestamp".
+
+    Returns:
+        list: Copies of the records with the time field formatted
+    """
+    formatted = []
+    for record in records:
+        value = record.get(time_field)
+        if isinstance(value, datetime):
+            record = {**record, time_field: value.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        formatted.append(record)
+    return formatted
@@ -0,0 +1,115 @@
+import logging
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Supported EMBEDDINGS_STORAGE_TYPE values and the Cohere embedding type each one is built from:
+#   "float":   BSON array of doubles (8 bytes per dimension)
+#   "float32": BSON binData vector of float32 (4 bytes per dimension)
+#   "int8":    BSON binData vector of int8 (1 byte per dimension)
+#   "binary":  BSON binData vector of packed bits (1 bit per dimension)
+COHERE_EMBEDDING_TYPES = {
+    "float": "float",
+    "float32": "float",
+    "int8": "int8",
+    "binary": "ubinary",
+}
+
+BINARY_VECTOR_DTYPES = {
+    "float32": BinaryVectorDtype.FLOAT32,
+    "int8": BinaryVectorDtype.INT8,
+    "binary": BinaryVectorDtype.PACKED_BIT,
+}
+
+
+def get_cohere_embedding_type(storage_type: str) -> str:
+    """Return the Cohere embedding type to request for a storage type."""
+    if storage_type not in COHERE_EMBEDDING_TYPES:
+        raise ValueError(f"Unknown embedding storage type '{storage_type}'. Expected one of: {', '.join(COHERE_EMBEDDING_TYPES)}.")
+    return COHERE_EMBEDDING_TYPES[storage_type]
+
+
+def encode_vector(vector: list, storage_type: str = "float"):
+    """
+    Encode an embedding, as returned by Cohere for the matching embedding type, for storage in MongoDB.
+
+    Args:
+        vector (list): Float, int8 or packed unsigned binary (uint8) embedding.
+        storage_type (str, optional): One of COHERE_EMBEDDING_TYPES. Default is "float".
+
+    Returns:
+        list | Binary: The vector unchanged for "float", otherwise a BSON binData vector.
+    """
+    get_cohere_embedding_type(storage_type)
+    if storage_type == "float":
+        return vector
+    return Binary.from_vector(list(vector), BINARY_VECTOR_DTYPES[storage_type])
+
+
+def decode_vector(value) -> np.ndarray:
+    """
+    Decode a stored embedding into a float32 array.
+
+    Packed-bit vectors are unpacked to +1/-1 per dimension, so their cosine similarity with a
+    float query approximates the one of the original float embedding.
+
+    Args:
+        value (list | Binary): A BSON array of numbers or a binData vector.
+
+    Returns:
+        np.ndarray: One float32 value per dimension.
+    """
+    if isinstance(value, Binary) and value.subtype == 9:
+        vector = value.as_vector()
+        if vector.dtype == BinaryVectorDtype.PACKED_BIT:
+            bits = np.unpackbits(np.asarray(vector.data, dtype=np.uint8))
+            if vector.padding:
+                bits = bits[:-vector.padding]
+            return bits.astype(np.float32) * 2 - 1
+        return np.asarray(vector.data, dtype=np.float32)
+    return np.asarray(value, dtype=np.float32)
+
+
+def rescore(results: list, query_vector: list, field: str, limit: int) -> list:
+    """
+    Re-rank vector search results by exact cosine similarity with the full-precision query.
+
+    Results without the rescoring field keep their original order, after the rescored ones.
+
+    Args:
+        results (list): Documents returned by the quantized search, best match first.
+        query_vector (list): Full-precision query embedding.
+        field (str): Field holding the full-precision document embedding.
+        limit (int): Number of documents returned.
+
+    Returns:
+        list: The best `limit` documents.
+    """
+    scored = [result for result in results if result.get(field) is not None]
+    if not scored:
+        return results[:limit]
+    query = np.asarray(query_vector, dtype=np.float32)
+    matrix = np.stack([decode_vector(result[field]) for result in scored])
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = 1.0
+    scores = (matrix @ query) / norms
+    ranked = [scored[i] for i in np.argsort(-scores, kind="stable").tolist()]
+    unscored = [result for result in results if result.get(field) is None]
+    return (ranked + unscored)[:limit]
+
+
+# ==================
+# Example usage
+# ==================
+
+if __name__ == "__main__":
+    stored = encode_vector([0b10100000, 0b00000001], "binary")
+    print(decode_vector(stored))
+    print(rescore([{"q": "a", "v": [0.0, 1.0]}, {"q": "b", "v": [1.0, 0.0]}], [1.0, 0.1], "v", 1))